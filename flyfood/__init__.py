@@ -0,0 +1,45 @@
+"""Rotinas compartilhadas pelos solucionadores TSP do FlyFood.
+
+    import flyfood
+    rota, custo = flyfood.solve('tsp/berlin52.tsp', 'formigas', semente=0, max_iter=50)
+
+Os submódulos (e o NumPy) só são importados quando usados; a linha de comando fica em
+`python -m flyfood`.
+"""
+import importlib
+import os
+
+__all__ = ['ALGORITMOS', 'Instancia', 'OraculoDistancias', 'carregar_instancia', 'solve']
+
+# Nome exportado -> módulo que o define, importado no primeiro acesso
+_PREGUICOSOS = {
+    'ALGORITMOS': '.solucionadores',
+    'Instancia': '.instancia',
+    'OraculoDistancias': '.distancias',
+    'carregar_instancia': '.instancia',
+}
+
+
+def __getattr__(nome):
+    if nome in _PREGUICOSOS:
+        valor = getattr(importlib.import_module(_PREGUICOSOS[nome], __name__), nome)
+        globals()[nome] = valor
+        return valor
+    raise AttributeError(f'module {__name__!r} has no attribute {nome!r}')
+
+
+def solve(instancia, algoritmo='vizinho', tipo_distancia='EUC_2D', **parametros):
+    """Resolve uma instância; retorna a rota fechada (índices) e o custo.
+
+    `instancia` é uma Instancia, o caminho de um arquivo TSPLIB ou as coordenadas (n, 2), com
+    distâncias do `tipo_distancia`. `algoritmo` é uma chave de ALGORITMOS e `parametros` segue
+    flyfood.solucionadores.resolver (semente, gap_alvo, tempo_limite...) e o próprio algoritmo.
+    """
+    from .instancia import Instancia, carregar_instancia, instancia_de_coordenadas
+    from .solucionadores import resolver
+
+    if isinstance(instancia, (str, os.PathLike)):
+        instancia = carregar_instancia(os.fspath(instancia))
+    elif not isinstance(instancia, Instancia):
+        instancia = instancia_de_coordenadas(instancia, tipo_distancia)
+    return resolver(instancia, algoritmo, **parametros)
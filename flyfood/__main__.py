@@ -0,0 +1,57 @@
+"""Linha de comando não interativa: resolve instâncias TSPLIB e imprime um resultado JSON por linha.
+
+Exemplo:
+    python -m flyfood tsp/berlin52.tsp tsp/st70.tsp -a formigas -s 0 -p '{"max_iter": 50}'
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from . import solve
+
+
+def main(argv=None):
+    from .solucionadores import ALGORITMOS
+
+    parser = argparse.ArgumentParser(prog='python -m flyfood', description='Resolve instâncias TSP sem interação.')
+    parser.add_argument('instancias', nargs='+', help='arquivos .tsp (ou .tsp.gz)')
+    parser.add_argument('-a', '--algoritmo', default='vizinho', choices=list(ALGORITMOS))
+    parser.add_argument('-p', '--parametros', default='{}', help='JSON com os parâmetros do algoritmo')
+    parser.add_argument('-s', '--semente', type=int, help='semente (padrão: sorteada e impressa no resultado)')
+    parser.add_argument('-t', '--tempo-limite', type=float, help='segundos por instância')
+    parser.add_argument('-g', '--gap-alvo', type=float, help='para ao ficar até este %% acima do limite inferior')
+    parser.add_argument('-o', '--saida', metavar='DIR', help='grava a rota de cada instância em DIR/<nome>.tour')
+    args = parser.parse_args(argv)
+
+    from .controle import Controle
+    from .inicial import gravar_rota
+    from .instancia import carregar_instancia
+
+    parametros = json.loads(args.parametros)
+    codigo = 0
+    for caminho in args.instancias:
+        resultado = {'arquivo': caminho, 'algoritmo': args.algoritmo}
+        try:
+            instancia = carregar_instancia(caminho)
+            controle = Controle(tempo_limite=args.tempo_limite)
+            inicio = time.perf_counter()
+            rota, custo = solve(instancia, args.algoritmo, semente=args.semente, gap_alvo=args.gap_alvo,
+                                controle=controle, **parametros)
+            resultado.update(nome=instancia.nome, custo=custo, semente=controle.semente, motivo=controle.motivo,
+                             tempo_ms=round((time.perf_counter() - inicio) * 1000, 3),
+                             rota=[instancia.nos[i] for i in rota])
+            if args.saida:
+                os.makedirs(args.saida, exist_ok=True)
+                resultado['tour'] = os.path.join(args.saida, f'{instancia.nome}.tour')
+                gravar_rota(resultado['tour'], rota, instancia.nos, instancia.nome, custo)
+        except Exception as e:  # Uma instância com erro não impede as demais
+            resultado['erro'] = f'{type(e).__name__}: {e}'
+            codigo = 1
+        print(json.dumps(resultado), flush=True)
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Núcleos opcionais compilados com Numba para os laços mais quentes.
+
+Sem o Numba (ou com FLYFOOD_NUMBA=0) os módulos usam o caminho em NumPy/Python. Os núcleos fazem
+as mesmas operações, na mesma ordem e com os mesmos números aleatórios, então o resultado para uma
+semente é idêntico nos dois caminhos. A compilação fica em cache em disco (NUMBA_CACHE_DIR, por
+padrão dentro do cache do FlyFood), então só a primeira execução paga o custo do JIT. O Numba só
+é importado na primeira chamada de usar(), para não pesar na importação do pacote.
+"""
+import os
+
+import numpy as np
+
+# None até a primeira chamada de usar(); depois, se o Numba está disponível
+DISPONIVEL = None
+
+
+def _vizinho(matriz, inicio, candidatos):
+    n = matriz.shape[0]
+    visitado = np.zeros(n, dtype=np.bool_)
+    rota = np.empty(n + 1, dtype=np.int64)
+    visitado[inicio] = True
+    rota[0] = inicio
+    total = 0
+    atual = inicio
+    for passo in range(1, n):
+        proximo = -1
+        if candidatos is not None:
+            for c in candidatos[atual]:
+                if not visitado[c]:
+                    proximo = c
+                    break
+        if proximo < 0:
+            # Primeiro índice de menor distância entre os não visitados, como o np.argmin
+            menor = np.inf
+            for j in range(n):
+                if not visitado[j] and matriz[atual, j] < menor:
+                    menor = matriz[atual, j]
+                    proximo = j
+        total += matriz[atual, proximo]
+        visitado[proximo] = True
+        rota[passo] = proximo
+        atual = proximo
+    total += matriz[atual, inicio]
+    rota[n] = inicio
+    return rota, total
+
+
+def _roleta_linha(atratividade, linha, livres, u):
+    """Roleta sobre a linha completa; sem peso disponível, sorteio uniforme entre os livres."""
+    n = atratividade.shape[1]
+    total = 0.0
+    for j in range(n):
+        total += atratividade[linha, j] * livres[j]
+    uniforme = total <= 0
+    if uniforme:
+        total = 0.0
+        for j in range(n):
+            total += 1.0 * livres[j]
+    r = min(u * total, np.nextafter(total, 0.0))  # Como formigas._limiar
+    acumulado = 0.0
+    for j in range(n):
+        acumulado += (1.0 if uniforme else atratividade[linha, j]) * livres[j]
+        if acumulado > r:
+            return j
+    return 0
+
+
+def _construir_rotas(atratividade, candidatos, inicio, sorteios):
+    num_formigas = inicio.shape[0]
+    n = atratividade.shape[0]
+    rotas = np.empty((num_formigas, n), dtype=np.int32)
+    livres = np.ones((num_formigas, n), dtype=np.bool_)
+    for f in range(num_formigas):
+        rotas[f, 0] = inicio[f]
+        livres[f, inicio[f]] = False
+        atual = inicio[f]
+        for passo in range(1, n):
+            proximo = -1
+            if candidatos is not None:
+                k = candidatos.shape[1]
+                total = 0.0
+                for c in range(k):
+                    total += atratividade[atual, candidatos[atual, c]] * livres[f, candidatos[atual, c]]
+                if total > 0:
+                    r = min(sorteios[passo - 1, 0, f] * total, np.nextafter(total, 0.0))
+                    acumulado = 0.0
+                    proximo = candidatos[atual, 0]  # Mesmo resultado do np.argmax sem nenhum acerto
+                    for c in range(k):
+                        acumulado += atratividade[atual, candidatos[atual, c]] * livres[f, candidatos[atual, c]]
+                        if acumulado > r:
+                            proximo = candidatos[atual, c]
+                            break
+                else:
+                    proximo = _roleta_linha(atratividade, atual, livres[f], sorteios[passo - 1, 1, f])
+            else:
+                proximo = _roleta_linha(atratividade, atual, livres[f], sorteios[passo - 1, 0, f])
+            rotas[f, passo] = proximo
+            livres[f, proximo] = False
+            atual = proximo
+    return rotas
+
+
+def _custo_rotas(matriz, rotas, custos):
+    num_rotas, n = rotas.shape
+    for k in range(num_rotas):
+        total = custos[k] * 0
+        for i in range(n):
+            total += matriz[rotas[k, i], rotas[k, (i + 1) % n]]
+        custos[k] = total
+    return custos
+
+
+vizinho = construir_rotas = custo_rotas = None
+
+
+def _carregar():
+    global DISPONIVEL, _roleta_linha, vizinho, construir_rotas, custo_rotas
+    DISPONIVEL = False
+    if os.environ.get('FLYFOOD_NUMBA', '1') == '0':
+        return
+    os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(
+        os.environ.get('FLYFOOD_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'flyfood')), 'numba'))
+    try:
+        import numba
+    except ImportError:
+        return
+    compilar = numba.njit(cache=True, nogil=True)
+    _roleta_linha = compilar(_roleta_linha)
+    vizinho = compilar(_vizinho)
+    construir_rotas = compilar(_construir_rotas)
+    custo_rotas = compilar(_custo_rotas)
+    DISPONIVEL = True
+
+
+def usar(*matrizes):
+    """Verdadeiro quando o backend compilado pode ser usado com essas matrizes (np.ndarray, não oráculos)."""
+    if DISPONIVEL is None:
+        _carregar()
+    return DISPONIVEL and all(isinstance(m, np.ndarray) for m in matrizes)
@@ -0,0 +1,22 @@
+"""Geradores reproduzíveis: uma semente raiz por execução e fluxos independentes derivados dela.
+
+Todo sorteio dos solucionadores sai de um np.random.Generator. Ensaios, ilhas e lotes de formigas
+recebem filhos da semente raiz (SeedSequence.spawn), então execuções paralelas não compartilham
+estado e a mesma semente repete exatamente a mesma execução.
+"""
+import numpy as np
+
+
+def nova_semente():
+    """Semente raiz tirada da entropia do sistema; registre-a para repetir a execução."""
+    return np.random.SeedSequence().entropy
+
+
+def gerador(semente=None):
+    """Generator a partir de uma semente (int ou SeedSequence); um Generator é devolvido como está."""
+    return np.random.default_rng(semente)
+
+
+def fluxos(semente, num):
+    """`num` geradores independentes derivados da semente; o i-ésimo é o mesmo para qualquer `num`."""
+    return gerador(semente).spawn(num)
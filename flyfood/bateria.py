@@ -0,0 +1,165 @@
+"""Bateria de testes não interativa: instâncias × algoritmos × parâmetros × sementes em paralelo.
+
+Exemplo:
+    python -m flyfood.bateria tsp/*.tsp -a vizinho formigas -s 0 1 2 -o resultados.jsonl \\
+        -p '{"formigas": [{"max_iter": 50}, {"max_iter": 100, "busca_local": true}]}'
+
+Com --perfil DIR cada ensaio grava em DIR o rastro JSON de flyfood.perfil (tempo por fase).
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import perfil as instrumentacao
+from .instancia import carregar_instancia
+from .limites import gap
+from .solucionadores import ALGORITMOS, resolver
+
+# Custos ótimos conhecidos (TSPLIB) das instâncias distribuídas em tsp/
+OTIMOS = {
+    'berlin52': 7542,
+    'brazil58': 25395,
+    'kroA100': 21282,
+    'pr107': 44303,
+    'st70': 675,
+}
+
+# Algoritmos de uma bateria sem -a; 'ilhas', 'exato' (até 20 nós) e 'decomposicao' (só coordenadas) são opcionais
+ALGORITMOS_PADRAO = ['vizinho', 'genetico', 'formigas']
+
+CAMPOS = ['instancia', 'algoritmo', 'parametros', 'semente', 'custo', 'otimo', 'gap', 'limite', 'gap_limite', 'tempo_ms',
+          'cpu_ms', 'perfil', 'erro']
+
+# Instâncias já carregadas por este processo (cada worker mantém as suas)
+_instancias = {}
+
+
+def _instancia(caminho):
+    if caminho not in _instancias:
+        instancia = carregar_instancia(caminho)
+        instancia.candidatos()  # Prepara a lista de candidatos (e importa a k-d tree) fora da medição
+        _instancias[caminho] = instancia
+    return _instancias[caminho]
+
+
+def executar_ensaio(caminho, algoritmo, parametros, semente, incluir_rota=False, limite=False, perfil=None):
+    """Executa um ensaio e devolve um dicionário com custo, gap para o ótimo e tempos.
+
+    Com `limite` inclui o limite inferior de Held-Karp e o gap até ele (calculados fora da medição).
+    Com `perfil` (diretório) grava o rastro por fase do ensaio e inclui o caminho em 'perfil'.
+    """
+    resultado = {
+        'instancia': os.path.splitext(os.path.basename(caminho))[0],
+        'algoritmo': algoritmo,
+        'parametros': parametros,
+        'semente': semente,
+    }
+    try:
+        instancia = _instancia(caminho)
+        with instrumentacao.execucao(f"{resultado['instancia']}-{algoritmo}-s{semente}", diretorio=perfil,
+                                     **resultado) as rastro:
+            inicio, inicio_cpu = time.perf_counter(), time.process_time()
+            rota, custo = resolver(instancia, algoritmo, semente, **parametros)
+            resultado['tempo_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+            resultado['cpu_ms'] = round((time.process_time() - inicio_cpu) * 1000, 3)
+        if rastro is not None:
+            resultado['perfil'] = rastro.get('arquivo')
+    except Exception as e:  # Um ensaio com erro não derruba a bateria
+        resultado['erro'] = f'{type(e).__name__}: {e}'
+        return resultado
+    otimo = OTIMOS.get(instancia.nome)
+    resultado['custo'] = custo
+    resultado['otimo'] = otimo
+    resultado['gap'] = round(100 * (custo - otimo) / otimo, 4) if otimo else None
+    if limite:
+        resultado['limite'] = instancia.limite_inferior()
+        resultado['gap_limite'] = round(gap(custo, resultado['limite']), 4)
+    if incluir_rota:
+        resultado['rota'] = [instancia.nos[i] for i in rota]
+    return resultado
+
+
+def gerar_ensaios(instancias, algoritmos, parametros=None, sementes=(0,)):
+    """Produto cartesiano dos ensaios; `parametros` mapeia algoritmo -> lista de dicionários."""
+    parametros = parametros or {}
+    for caminho, algoritmo, semente in itertools.product(instancias, algoritmos, sementes):
+        for conjunto in parametros.get(algoritmo, [{}]):
+            yield caminho, algoritmo, conjunto, semente
+
+
+def executar_bateria(instancias, algoritmos, parametros=None, sementes=(0,), saida=None, processos=None,
+                     incluir_rota=False, limite=False, perfil=None):
+    """Distribui os ensaios num ProcessPoolExecutor e gera cada resultado assim que termina.
+
+    Com `saida` (.csv ou .jsonl) cada resultado também é gravado imediatamente no arquivo.
+    """
+    for algoritmo in algoritmos:
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f'Algoritmo {algoritmo} não suportado')
+    ensaios = list(gerar_ensaios(instancias, algoritmos, parametros, sementes))
+    arquivo = open(saida, 'w', newline='') if saida else None
+    escritor = None
+    if arquivo and saida.endswith('.csv'):
+        escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS, extrasaction='ignore')
+        escritor.writeheader()
+    try:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(executar_ensaio, *ensaio, incluir_rota, limite, perfil) for ensaio in ensaios]
+            for futuro in as_completed(futuros):
+                resultado = futuro.result()
+                if escritor:
+                    escritor.writerow(dict(resultado, parametros=json.dumps(resultado['parametros'])))
+                elif arquivo:
+                    arquivo.write(json.dumps(resultado) + '\n')
+                if arquivo:
+                    arquivo.flush()
+                yield resultado
+    finally:
+        if arquivo:
+            arquivo.close()
+
+
+def _ler_parametros(texto):
+    if texto is None:
+        return None
+    if os.path.exists(texto):
+        with open(texto) as f:
+            return json.load(f)
+    return json.loads(texto)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Executa uma bateria de testes TSP em paralelo.')
+    parser.add_argument('instancias', nargs='+', help='arquivos .tsp')
+    parser.add_argument('-a', '--algoritmos', nargs='+', default=ALGORITMOS_PADRAO,
+                        choices=list(ALGORITMOS))
+    parser.add_argument('-p', '--parametros', help='JSON (ou arquivo JSON) {algoritmo: [{parâmetros}, ...]}')
+    parser.add_argument('-s', '--sementes', nargs='+', type=int, default=[0])
+    parser.add_argument('-o', '--saida', help='arquivo de resultados (.csv ou .jsonl)')
+    parser.add_argument('-j', '--processos', type=int, help='número de processos (padrão: todos os núcleos)')
+    parser.add_argument('--rotas', action='store_true', help='inclui a rota em cada resultado')
+    parser.add_argument('--limite', action='store_true', help='inclui o limite inferior de Held-Karp e o gap até ele')
+    parser.add_argument('--perfil', metavar='DIR', help='grava em DIR o rastro JSON de tempo por fase de cada ensaio')
+    args = parser.parse_args(argv)
+
+    resultados = executar_bateria(args.instancias, args.algoritmos, _ler_parametros(args.parametros),
+                                  args.sementes, args.saida, args.processos, args.rotas, args.limite,
+                                  args.perfil)
+    for r in resultados:
+        if 'erro' in r:
+            print(f"{r['instancia']:<10} {r['algoritmo']:<9} semente={r['semente']:<4} ERRO {r['erro']}",
+                  file=sys.stderr)
+        else:
+            gap_otimo = f"{r['gap']:.2f}%" if r['gap'] is not None else '-'
+            extra = f" gap_limite={r['gap_limite']:.2f}%" if 'gap_limite' in r else ''
+            print(f"{r['instancia']:<10} {r['algoritmo']:<9} semente={r['semente']:<4} custo={r['custo']:<12.2f} "
+                  f"gap={gap_otimo:<8} tempo={r['tempo_ms']:.1f} ms{extra}")
+
+
+if __name__ == '__main__':
+    main()
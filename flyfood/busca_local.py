@@ -0,0 +1,219 @@
+from collections import deque
+
+import numpy as np
+
+from . import perfil
+from .candidatos import lista_candidatos
+from .distancias import OraculoDistancias, como_matriz
+
+# Até este tamanho a matriz é convertida para listas, cujo acesso por elemento é bem mais rápido
+LIMITE_LISTA = 3000
+
+# Tolerância para aceitar uma melhora (evita ciclos por erro de arredondamento)
+EPS = 1e-9
+
+
+def _inverter(rota, pos, i, j):
+    """Inverte o trecho cíclico rota[i..j], escolhendo o lado mais curto."""
+    n = len(rota)
+    tamanho = (j - i) % n + 1
+    if 2 * tamanho > n:
+        # Inverter o complemento produz o mesmo ciclo (TSP simétrico)
+        i, j = (j + 1) % n, (i - 1) % n
+        tamanho = n - tamanho
+    for _ in range(tamanho // 2):
+        a, b = rota[i], rota[j]
+        rota[i], rota[j] = b, a
+        pos[b], pos[a] = i, j
+        i = (i + 1) % n
+        j = (j - 1) % n
+
+
+def _ativar(nos, ativos, fila, outros):
+    """Reativa as pontas de um movimento nesta vizinhança e na outra (se houver)."""
+    for x in nos:
+        if not ativos[x]:
+            ativos[x] = True
+            fila.append(x)
+        if outros is not None:
+            outros[x] = True
+
+
+def dois_opt(rota, pos, d, candidatos, ativos, outros=None):
+    """2-opt com listas de vizinhos e bits de "não olhar"; retorna a variação total do custo.
+
+    Só os nós com o bit em `ativos` são examinados; as pontas de cada movimento aplicado voltam a
+    ficar ativas aqui e em `outros` (os bits da outra vizinhança).
+    """
+    n = len(rota)
+    fila = deque(c for c in range(n) if ativos[c])
+    variacao = 0
+    while fila:
+        a = fila.popleft()
+        ativos[a] = False
+        melhorou = False
+        for sucessor in (True, False):
+            i = pos[a]
+            b = rota[(i + 1) % n] if sucessor else rota[i - 1]
+            d_ab = d[a][b]
+            for c in candidatos[a]:
+                d_ac = d[a][c]
+                if d_ac >= d_ab:
+                    break  # Nenhum candidato mais distante pode melhorar
+                j = pos[c]
+                e = rota[(j + 1) % n] if sucessor else rota[j - 1]
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d[b][e] - d_ab - d[c][e]
+                if delta < -EPS:
+                    # Troca as arestas (a,b),(c,e) por (a,c),(b,e)
+                    if sucessor:
+                        _inverter(rota, pos, (i + 1) % n, j)
+                    else:
+                        _inverter(rota, pos, i, (j - 1) % n)
+                    variacao += delta
+                    _ativar((a, b, c, e), ativos, fila, outros)
+                    melhorou = True
+                    break
+            if melhorou:
+                break
+    return variacao
+
+
+def _mover_segmento(rota, pos, i, tamanho, c, invertido):
+    """Remove o segmento que começa em rota[i] e o reinsere logo após o nó c.
+
+    Só o trecho entre o segmento e c é deslocado, pelo lado mais curto do ciclo.
+    """
+    n = len(rota)
+    segmento = [rota[(i + t) % n] for t in range(tamanho)]
+    if invertido:
+        segmento.reverse()
+    k = (pos[c] - i - tamanho) % n + 1  # Nós do segmento até c, inclusive
+    if k <= n - tamanho - k:
+        # Os k nós seguintes recuam e o segmento vai para depois deles
+        for t in range(k):
+            x = rota[(i + tamanho + t) % n]
+            rota[(i + t) % n] = x
+            pos[x] = (i + t) % n
+        inicio = (i + k) % n
+    else:
+        # Os nós entre o sucessor de c e o segmento avançam, e o segmento fica antes deles
+        for t in range(n - tamanho - k - 1, -1, -1):
+            x = rota[(i + tamanho + k + t) % n]
+            rota[(i + 2 * tamanho + k + t) % n] = x
+            pos[x] = (i + 2 * tamanho + k + t) % n
+        inicio = (i + tamanho + k) % n
+    for t, x in enumerate(segmento):
+        rota[(inicio + t) % n] = x
+        pos[x] = (inicio + t) % n
+
+
+def or_opt(rota, pos, d, candidatos, ativos, max_segmento=3, outros=None):
+    """Or-opt: move segmentos de 1 a `max_segmento` nós para junto de um vizinho próximo.
+
+    Bits de "não olhar" como em dois_opt.
+    """
+    n = len(rota)
+    fila = deque(c for c in range(n) if ativos[c])
+    variacao = 0
+    while fila:
+        s1 = fila.popleft()
+        ativos[s1] = False
+        for tamanho in range(1, max_segmento + 1):
+            if tamanho >= n - 2:
+                break
+            i = pos[s1]
+            s2 = rota[(i + tamanho - 1) % n]
+            p = rota[i - 1]
+            nx = rota[(i + tamanho) % n]
+            ganho_remocao = d[p][s1] + d[s2][nx] - d[p][nx]
+            if ganho_remocao <= EPS:
+                continue
+            no_segmento = {rota[(i + t) % n] for t in range(tamanho)}
+            movimento = None
+            # Cada extremidade do segmento tenta ficar adjacente a um de seus candidatos
+            for ponta, outra in ((s1, s2), (s2, s1)):
+                for c in candidatos[ponta]:
+                    d_pc = d[ponta][c]
+                    if d_pc >= ganho_remocao:
+                        break
+                    if c in no_segmento:
+                        continue
+                    j = pos[c]
+                    for depois_de_c in (True, False):
+                        # Inserção entre (x, y) com a ponta encostada em c
+                        x, y = (c, rota[(j + 1) % n]) if depois_de_c else (rota[j - 1], c)
+                        if y in no_segmento or x in no_segmento:
+                            continue
+                        delta = d_pc + d[outra][y if depois_de_c else x] - d[x][y] - ganho_remocao
+                        if delta < -EPS:
+                            # Orientação final: x, ..., y com a ponta ao lado de c
+                            invertido = (ponta == s1) != depois_de_c
+                            movimento = (delta, x, invertido)
+                            break
+                    if movimento:
+                        break
+                if movimento:
+                    break
+            if movimento:
+                delta, x, invertido = movimento
+                _mover_segmento(rota, pos, i, tamanho, x, invertido)
+                variacao += delta
+                _ativar((p, nx, s1, s2, x, rota[(pos[x] + tamanho + 1) % n]), ativos, fila, outros)
+                break
+    return variacao
+
+
+def custo_rota(rota, d):
+    """Custo do ciclo descrito por `rota` (sem repetir o nó inicial)."""
+    return sum(d[rota[i - 1]][rota[i]] for i in range(len(rota)))
+
+
+def busca_local(rota, matriz, candidatos=None, k=10, usar_or_opt=True):
+    """Aplica 2-opt e Or-opt até um ótimo local, avaliando cada movimento por delta em O(1).
+
+    Aceita a rota aberta ou fechada (repetindo o nó inicial no fim) e devolve no mesmo formato,
+    junto com o custo final.
+    """
+    rota = list(rota)
+    fechada = len(rota) > 1 and rota[0] == rota[-1]
+    if fechada:
+        rota.pop()
+    n = len(rota)
+    matriz = como_matriz(matriz)
+    if isinstance(matriz, OraculoDistancias):
+        d = matriz.escalar  # Calcula só as distâncias avaliadas, sem materializar linhas
+    else:
+        d = matriz.tolist() if n <= LIMITE_LISTA else matriz
+    if n < 4:
+        custo = custo_rota(rota, d)
+        return (rota + rota[:1] if fechada else rota), custo
+
+    if candidatos is None:
+        candidatos = lista_candidatos(matriz, k)
+    candidatos = np.asarray(candidatos).tolist()
+    pos = [0] * n
+    for p, c in enumerate(rota):
+        pos[c] = p
+
+    custo = custo_rota(rota, d)
+    # Bits de "não olhar" de cada vizinhança: um movimento de uma reativa as pontas nas duas, e
+    # cada rodada examina só os nós ativos da sua
+    ativos_2opt = [True] * n
+    ativos_or = [True] * n if usar_or_opt else None
+    with perfil.fase('busca_local'):
+        while True:
+            custo += dois_opt(rota, pos, d, candidatos, ativos_2opt, ativos_or)
+            perfil.contar('rodadas_2opt')
+            if not usar_or_opt:
+                break
+            variacao = or_opt(rota, pos, d, candidatos, ativos_or, outros=ativos_2opt)
+            perfil.contar('rodadas_or_opt')
+            custo += variacao
+            if not any(ativos_2opt):
+                break
+
+    if fechada:
+        rota.append(rota[0])
+    return rota, custo
@@ -0,0 +1,63 @@
+import numpy as np
+
+from .distancias import TIPOS_EUCLIDIANOS, OraculoDistancias
+
+# Linhas processadas por bloco no argpartition, para limitar a memória temporária
+TAMANHO_BLOCO = 1024
+
+# Limite de elementos (linhas × n) de cada bloco, para instâncias grandes
+ELEMENTOS_BLOCO = 2**22
+
+# Até este tamanho, com a matriz disponível, o argpartition é rápido e evita importar o scipy
+LIMITE_KDTREE = 2000
+
+
+def _candidatos_kdtree(coordenadas, k):
+    from scipy.spatial import cKDTree
+
+    n = len(coordenadas)
+    distancias, indices = cKDTree(coordenadas).query(coordenadas, k=k + 1)
+    # Remove o próprio nó de cada linha; com pontos repetidos ele pode não estar na primeira posição
+    manter = indices != np.arange(n)[:, None]
+    sem_proprio = manter.all(axis=1)
+    manter[sem_proprio, -1] = False
+    return _ordenar(indices[manter].reshape(n, k), distancias[manter].reshape(n, k))
+
+
+def _ordenar(indices, distancias):
+    # Ordena cada linha pela distância e, em caso de empate, pelo índice do nó
+    ordem = np.lexsort((indices, distancias), axis=1)
+    return np.take_along_axis(indices, ordem, axis=1).astype(np.int32)
+
+
+def _candidatos_matriz(matriz, k):
+    n = len(matriz)
+    candidatos = np.empty((n, k), dtype=np.int32)
+    bloco = max(1, min(TAMANHO_BLOCO, ELEMENTOS_BLOCO // n))
+    for inicio in range(0, n, bloco):
+        linhas = np.arange(inicio, min(inicio + bloco, n))
+        d = np.array(matriz[linhas], dtype=np.float64)
+        d[np.arange(len(linhas)), linhas] = np.inf
+        parte = np.argpartition(d, k - 1, axis=1)[:, :k]
+        candidatos[linhas] = _ordenar(parte, np.take_along_axis(d, parte, axis=1))
+    return candidatos
+
+
+def lista_candidatos(matriz=None, k=10, coordenadas=None):
+    """Lista dos k vizinhos mais próximos de cada nó, ordenados pela distância.
+
+    Com coordenadas euclidianas usa uma k-d tree (scipy); caso contrário, ou com a matriz de uma
+    instância de até LIMITE_KDTREE nós, argpartition sobre a matriz. Um OraculoDistancias de tipo
+    euclidiano fornece as próprias coordenadas.
+    """
+    if coordenadas is None and isinstance(matriz, OraculoDistancias) and matriz.tipo in TIPOS_EUCLIDIANOS:
+        coordenadas = matriz.coordenadas
+    n = len(coordenadas) if coordenadas is not None else len(matriz)
+    k = max(1, min(k, n - 1))
+    if coordenadas is not None and (matriz is None or n > LIMITE_KDTREE):
+        try:
+            return _candidatos_kdtree(np.asarray(coordenadas), k)
+        except ImportError:
+            if matriz is None:
+                raise
+    return _candidatos_matriz(matriz, k)
@@ -0,0 +1,127 @@
+"""Controle de execução comum aos solucionadores: critérios de parada e melhor rota a qualquer momento."""
+import math
+import queue
+import threading
+import time
+from collections import namedtuple
+
+# Nova melhor rota encontrada: custo, rota fechada (índices), iteração e segundos desde o início
+Melhoria = namedtuple('Melhoria', ['custo', 'rota', 'iteracao', 'tempo'])
+
+
+class Controle:
+    """Acompanha a melhor rota de uma execução e decide quando parar.
+
+    Critérios opcionais, além do orçamento de iterações de cada algoritmo: `tempo_limite` (segundos
+    desde a criação do controle), `custo_alvo`, `sem_melhora` (iterações seguidas sem melhorar) e
+    `gap_alvo` (% acima de `limite_inferior`). `ao_melhorar(melhoria)` é chamado a cada nova melhor
+    rota. A melhor rota até o momento fica em `melhor_rota`/`melhor_custo`, e a semente raiz da
+    execução (preenchida por flyfood.solucionadores.resolver) em `semente`.
+    """
+
+    def __init__(self, tempo_limite=None, custo_alvo=None, sem_melhora=None, gap_alvo=None, limite_inferior=None,
+                 ao_melhorar=None):
+        self.tempo_limite = tempo_limite
+        self.custo_alvo = custo_alvo
+        self.sem_melhora = sem_melhora
+        self.gap_alvo = gap_alvo
+        self.limite_inferior = limite_inferior
+        self.ao_melhorar = ao_melhorar
+        self.inicio = time.monotonic()
+        self.prazo = self.inicio + tempo_limite if tempo_limite is not None else None
+        self.iteracao = 0
+        self.ultima_melhora = 0
+        self.melhor_custo = math.inf
+        self.melhor_rota = None
+        self.motivo = None
+        self.semente = None
+        self._cancelado = False
+
+    @property
+    def decorrido(self):
+        return time.monotonic() - self.inicio
+
+    def alvo(self):
+        """Menor custo que encerra a execução (custo alvo ou gap alvo), ou None."""
+        alvos = []
+        if self.custo_alvo is not None:
+            alvos.append(self.custo_alvo)
+        if self.gap_alvo is not None and self.limite_inferior is not None:
+            alvos.append(self.limite_inferior * (1 + self.gap_alvo / 100))
+        return max(alvos) if alvos else None
+
+    def registrar(self, custo, rota):
+        """Registra o melhor resultado de uma iteração; retorna a Melhoria se for uma nova melhor rota.
+
+        `rota` é aberta (sem repetir o nó inicial); a cópia fechada só é feita quando há melhora.
+        """
+        self.iteracao += 1
+        custo = float(custo)
+        if custo >= self.melhor_custo:
+            return None
+        rota = [int(c) for c in rota]
+        rota.append(rota[0])
+        self.melhor_custo = custo
+        self.melhor_rota = rota
+        self.ultima_melhora = self.iteracao
+        melhoria = Melhoria(custo, rota, self.iteracao, self.decorrido)
+        if self.ao_melhorar is not None:
+            self.ao_melhorar(melhoria)
+        return melhoria
+
+    def cancelar(self):
+        self._cancelado = True
+
+    def parar(self):
+        """Verdadeiro quando algum critério foi atingido; o motivo fica em `motivo`."""
+        if self.motivo is None:
+            alvo = self.alvo()
+            if self._cancelado:
+                self.motivo = 'cancelado'
+            elif alvo is not None and self.melhor_custo <= alvo:
+                self.motivo = 'alvo'
+            elif self.sem_melhora is not None and self.iteracao - self.ultima_melhora >= self.sem_melhora:
+                self.motivo = 'estagnacao'
+            elif self.prazo is not None and time.monotonic() >= self.prazo:
+                self.motivo = 'tempo'
+        return self.motivo is not None
+
+
+_FIM = object()
+
+
+def acompanhar(executar, controle):
+    """Executa `executar()` numa thread e gera cada Melhoria registrada em `controle` assim que aparece.
+
+    O valor devolvido por `executar` fica em `controle.resultado`. Interromper a iteração cancela a
+    execução, que termina na próxima verificação de parada.
+    """
+    fila = queue.Queue()
+    anterior = controle.ao_melhorar
+    erros = []
+
+    def ao_melhorar(melhoria):
+        if anterior is not None:
+            anterior(melhoria)
+        fila.put(melhoria)
+
+    def alvo():
+        try:
+            controle.resultado = executar()
+        except BaseException as e:  # Repassado ao consumidor do gerador
+            erros.append(e)
+        finally:
+            fila.put(_FIM)
+
+    controle.ao_melhorar = ao_melhorar
+    thread = threading.Thread(target=alvo, daemon=True)
+    thread.start()
+    try:
+        while (melhoria := fila.get()) is not _FIM:
+            yield melhoria
+        if erros:
+            raise erros[0]
+    finally:
+        controle.cancelar()
+        thread.join()
+        controle.ao_melhorar = anterior
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def _cortes(m, n, rng):
+    """Sorteia um segmento [a, b) não vazio por par de pais."""
+    a = rng.integers(0, n, size=m)
+    b = rng.integers(0, n, size=m)
+    a, b = np.minimum(a, b), np.maximum(a, b) + 1
+    return a, b
+
+
+def _ox(doadores, receptores, a, b):
+    """Order crossover em lote: segmento [a, b) do doador e o resto na ordem do receptor, a partir de b."""
+    m, n = doadores.shape
+    colunas = np.arange(n)
+    no_segmento = (colunas >= a[:, None]) & (colunas < b[:, None])
+    # Marca, por cidade, se ela já veio do segmento do doador
+    usada = np.zeros((m, n), dtype=bool)
+    np.put_along_axis(usada, doadores, no_segmento, axis=1)
+
+    # Trabalha com as rotas "giradas" para começar na posição b
+    giro = (colunas + b[:, None]) % n
+    ordem = np.take_along_axis(receptores, giro, axis=1)
+    manter = ~np.take_along_axis(usada, ordem, axis=1)
+    restantes = np.take_along_axis(ordem, np.argsort(~manter, axis=1, kind='stable'), axis=1)
+    doador_girado = np.take_along_axis(doadores, giro, axis=1)
+    filhos_girados = np.where(colunas < (n - (b - a))[:, None], restantes, doador_girado)
+    return np.take_along_axis(filhos_girados, (colunas - b[:, None]) % n, axis=1)
+
+
+def cruzamento_ox(pais_1, pais_2, rng):
+    """Order crossover (OX), vetorizado para todos os pares."""
+    a, b = _cortes(*pais_1.shape, rng)
+    return np.concatenate([_ox(pais_1, pais_2, a, b), _ox(pais_2, pais_1, a, b)])
+
+
+def _pmx(doador, receptor, a, b):
+    filho = list(receptor)
+    pos = [0] * len(filho)
+    for i, c in enumerate(filho):
+        pos[c] = i
+    # Trazer cada gene do segmento por troca mantém a permutação válida e reproduz o mapeamento do PMX
+    for k in range(a, b):
+        gene = doador[k]
+        j = pos[gene]
+        if j != k:
+            outro = filho[k]
+            filho[k], filho[j] = gene, outro
+            pos[gene], pos[outro] = k, j
+    return filho
+
+
+def cruzamento_pmx(pais_1, pais_2, rng):
+    """Partially mapped crossover (PMX), O(n) por filho."""
+    m, n = pais_1.shape
+    a, b = _cortes(m, n, rng)
+    filhos = np.empty((2 * m, n), dtype=pais_1.dtype)
+    for r, (p1, p2) in enumerate(zip(pais_1.tolist(), pais_2.tolist())):
+        filhos[r] = _pmx(p1, p2, a[r], b[r])
+        filhos[m + r] = _pmx(p2, p1, a[r], b[r])
+    return filhos
+
+
+def _tabela_arestas(pais_1, pais_2):
+    """Vizinhos de cada cidade nos dois pais: array (m, n, 4)."""
+    m, n = pais_1.shape
+    linhas = np.arange(m)[:, None]
+    tabela = np.empty((m, n, 4), dtype=pais_1.dtype)
+    for c, pai in enumerate((pais_1, pais_2)):
+        tabela[linhas, pai, 2 * c] = np.roll(pai, 1, axis=1)
+        tabela[linhas, pai, 2 * c + 1] = np.roll(pai, -1, axis=1)
+    return tabela
+
+
+def _erx(vizinhos, inicio, ordem_reserva):
+    n = len(vizinhos)
+    vizinhos = [set(v) - {c} for c, v in enumerate(vizinhos)]  # Com n = 1 a cidade é vizinha de si mesma
+    visitado = [False] * n
+    filho = []
+    atual = inicio
+    reserva = 0
+    while True:
+        filho.append(atual)
+        visitado[atual] = True
+        for v in vizinhos[atual]:
+            vizinhos[v].discard(atual)
+        if len(filho) == n:
+            return filho
+        opcoes = vizinhos[atual]
+        if opcoes:
+            # Prefere o vizinho com menos arestas restantes (menor chance de ficar isolado)
+            atual = min(opcoes, key=lambda v: (len(vizinhos[v]), v))
+        else:
+            while visitado[ordem_reserva[reserva]]:
+                reserva += 1
+            atual = ordem_reserva[reserva]
+
+
+def cruzamento_erx(pais_1, pais_2, rng):
+    """Edge recombination (ERX): o filho herda quase só arestas presentes em algum dos pais."""
+    m, n = pais_1.shape
+    tabela = _tabela_arestas(pais_1, pais_2).tolist()
+    reservas = np.argsort(rng.random((2 * m, n)), axis=1).tolist()
+    filhos = np.empty((2 * m, n), dtype=pais_1.dtype)
+    for r in range(m):
+        filhos[r] = _erx(tabela[r], int(pais_1[r, 0]), reservas[r])
+        filhos[m + r] = _erx(tabela[r], int(pais_2[r, 0]), reservas[m + r])
+    return filhos
+
+
+def cruzamento_um_ponto(pais_1, pais_2, rng):
+    """Crossover de um ponto com reparo das repetições em O(n) por filho."""
+    m, n = pais_1.shape
+    ponto_corte = int(rng.integers(1, n)) if n > 1 else 0
+    filhos = np.empty((2 * m, n), dtype=pais_1.dtype)
+    for r in range(m):
+        for k, (pai, outro) in enumerate(((pais_1[r], pais_2[r]), (pais_2[r], pais_1[r]))):
+            filho = np.concatenate([pai[:ponto_corte], outro[ponto_corte:]])
+            no_inicio = np.zeros(n, dtype=bool)
+            no_inicio[pai[:ponto_corte]] = True
+            # Repetições só aparecem depois do corte; as faltantes seguem a ordem do pai, do fim para o início
+            repetidos = ponto_corte + np.flatnonzero(no_inicio[outro[ponto_corte:]])
+            presentes = np.zeros(n, dtype=bool)
+            presentes[filho] = True
+            filho[repetidos] = pai[~presentes[pai]][::-1]
+            filhos[k * m + r] = filho
+    return filhos
+
+
+CRUZAMENTOS = {
+    'ox': cruzamento_ox,
+    'pmx': cruzamento_pmx,
+    'erx': cruzamento_erx,
+    'um_ponto': cruzamento_um_ponto,
+}
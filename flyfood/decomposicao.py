@@ -0,0 +1,220 @@
+"""Decomposição para instâncias muito grandes: particiona, resolve cada grupo e costura as sub-rotas.
+
+As coordenadas são divididas em grupos espacialmente compactos (k-means iniciado por fatias de uma
+curva de Hilbert, ou só as fatias). Cada grupo vira uma instância pequena com matriz densa,
+resolvida por qualquer algoritmo de flyfood.solucionadores em processos separados. Os grupos são
+visitados na ordem de uma rota sobre os centróides; cada sub-rota é aberta na aresta que melhor a
+liga ao grupo anterior e ao próximo, e um reparo opcional otimiza uma janela em torno de cada costura.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import perfil
+from .busca_local import busca_local
+from .candidatos import ELEMENTOS_BLOCO, lista_candidatos
+from .distancias import como_matriz, matriz_distancias
+from .instancia import instancia_de_coordenadas
+from .rotas import custo_rotas
+from .vizinho import vizinho_mais_proximo
+
+METODOS = ('kmeans', 'hilbert')
+
+# Bits por eixo da curva de Hilbert
+ORDEM_HILBERT = 16
+
+# Peso que prende as pontas de uma janela do reparo uma à outra (a aresta nunca é removida)
+_PRESA = -1e12
+
+
+def indice_hilbert(coordenadas, ordem=ORDEM_HILBERT):
+    """Posição de cada ponto ao longo de uma curva de Hilbert sobre a caixa das coordenadas."""
+    pontos = np.asarray(coordenadas, dtype=np.float64)
+    pontos = pontos - pontos.min(axis=0)
+    lado = 1 << ordem
+    escala = (lado - 1) / max(pontos.max(), 1e-12)
+    x = (pontos[:, 0] * escala).astype(np.int64)
+    y = (pontos[:, 1] * escala).astype(np.int64)
+    d = np.zeros(len(pontos), dtype=np.int64)
+    s = lado >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Gira o quadrante para que a curva continue do mesmo jeito no próximo nível
+        espelhar = ~ry & rx
+        x = np.where(espelhar, lado - 1 - x, x)
+        y = np.where(espelhar, lado - 1 - y, y)
+        x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+        s >>= 1
+    return d
+
+
+def _fatias(ordem, tamanho_grupo):
+    num = max(1, -(-len(ordem) // tamanho_grupo))
+    return np.array_split(ordem, num)
+
+
+def _atribuir(pontos, centros):
+    # Centro mais próximo de cada ponto, em blocos para limitar a memória
+    grupo = np.empty(len(pontos), dtype=np.int64)
+    bloco = max(1, ELEMENTOS_BLOCO // max(len(centros), 1))
+    for i in range(0, len(pontos), bloco):
+        p = pontos[i:i + bloco]
+        d = (p[:, None, 0] - centros[None, :, 0]) ** 2 + (p[:, None, 1] - centros[None, :, 1]) ** 2
+        grupo[i:i + bloco] = d.argmin(axis=1)
+    return grupo
+
+
+def particionar(coordenadas, tamanho_grupo=200, metodo='kmeans', iteracoes=10):
+    """Divide os nós em grupos de cerca de `tamanho_grupo` nós próximos; lista de vetores de índices.
+
+    'hilbert': fatias consecutivas da curva de Hilbert (grupos do mesmo tamanho). 'kmeans': parte
+    dessas fatias e faz `iteracoes` rodadas de Lloyd; grupos com mais que o dobro do tamanho pedido
+    são refatiados pela curva.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f'Método de partição {metodo} não suportado')
+    pontos = np.asarray(coordenadas, dtype=np.float64)
+    ordem = np.argsort(indice_hilbert(pontos), kind='stable')
+    grupos = _fatias(ordem, tamanho_grupo)
+    if metodo == 'hilbert' or len(grupos) == 1:
+        return grupos
+
+    centros = np.array([pontos[g].mean(axis=0) for g in grupos])
+    for _ in range(iteracoes):
+        rotulo = _atribuir(pontos, centros)
+        contagem = np.bincount(rotulo, minlength=len(centros))
+        novos = np.stack([np.bincount(rotulo, pontos[:, e], len(centros)) for e in range(2)], axis=1)
+        ocupados = contagem > 0
+        novos[ocupados] /= contagem[ocupados, None]
+        novos[~ocupados] = centros[~ocupados]
+        if np.array_equal(novos, centros):
+            break
+        centros = novos
+    rotulo = _atribuir(pontos, centros)
+
+    # Índices de cada grupo, mantendo a ordem da curva dentro do grupo
+    rotulo_ordenado = rotulo[ordem]
+    por_grupo = np.argsort(rotulo_ordenado, kind='stable')
+    limites = np.cumsum(np.bincount(rotulo, minlength=len(centros)))[:-1]
+    particao = []
+    for g in np.split(ordem[por_grupo], limites):
+        if len(g) > 2 * tamanho_grupo:
+            particao.extend(_fatias(g, tamanho_grupo))
+        elif len(g):
+            particao.append(g)
+    return particao
+
+
+def _resolver_grupo(tarefa):
+    from .solucionadores import resolver
+
+    coordenadas, tipo, algoritmo, rng, parametros = tarefa
+    n = len(coordenadas)
+    if n < 4:
+        return np.arange(n)
+    rota, _ = resolver(instancia_de_coordenadas(coordenadas, tipo, 'grupo'), algoritmo, semente=rng, **parametros)
+    return np.asarray(rota[:-1], dtype=np.int64)
+
+
+def _ordem_grupos(centros):
+    # Rota sobre os centróides (vizinho mais próximo + busca local)
+    if len(centros) < 4:
+        return np.arange(len(centros))
+    matriz = matriz_distancias(centros, 'EUC_2D')
+    rota, _ = vizinho_mais_proximo(matriz)
+    rota, _ = busca_local(rota[:-1], matriz)
+    return np.asarray(rota)
+
+
+def _abrir(ciclo, pontos, anterior, seguinte):
+    """Caminho do ciclo que entra perto de `anterior` e sai perto de `seguinte` (pontos do plano)."""
+    if len(ciclo) < 2:
+        return ciclo
+    a = pontos[ciclo]
+    b = np.roll(a, -1, axis=0)
+    aresta = np.hypot(*(a - b).T)
+    # Remover a aresta (c_j, c_j+1): entra por c_j+1 e sai por c_j, ou o inverso
+    direto = np.hypot(*(b - anterior).T) + np.hypot(*(a - seguinte).T) - aresta
+    inverso = np.hypot(*(a - anterior).T) + np.hypot(*(b - seguinte).T) - aresta
+    j = int(np.argmin(np.minimum(direto, inverso)))
+    if direto[j] <= inverso[j]:
+        return np.roll(ciclo, -(j + 1))
+    return np.roll(ciclo, -(j + 1))[::-1]
+
+
+def costurar(pontos, grupos, sub_rotas, ordem):
+    """Concatena as sub-rotas (índices globais) na ordem dos grupos, abrindo cada uma na melhor aresta."""
+    centros = np.array([pontos[g].mean(axis=0) for g in grupos])
+    m = len(ordem)
+    partes = []
+    saida = centros[ordem[-1]]
+    for i, g in enumerate(ordem):
+        caminho = _abrir(grupos[g][sub_rotas[g]], pontos, saida, centros[ordem[(i + 1) % m]])
+        partes.append(caminho)
+        saida = pontos[caminho[-1]]
+    return np.concatenate(partes), np.cumsum([len(p) for p in partes])[:-1]
+
+
+def reparar_costuras(rota, matriz, costuras, janela=50, k=8):
+    """Otimiza com 2-opt/Or-opt a janela de até 2·`janela` nós em torno de cada costura.
+
+    As pontas de cada janela ficam presas (a aresta entre elas nunca sai), então a janela continua
+    sendo um caminho entre os mesmos nós e o resto da rota não muda. Altera `rota` no lugar.
+    """
+    n = len(rota)
+    for p in costuras:
+        posicoes = np.arange(p - janela, p + janela) % n
+        if len(np.unique(posicoes)) < len(posicoes) or len(posicoes) < 5:
+            continue
+        nos = rota[posicoes]
+        sub = np.array(matriz[nos[:, None], nos[None, :]], dtype=np.float64)
+        sub[0, -1] = sub[-1, 0] = _PRESA
+        caminho, _ = busca_local(list(range(len(nos))), sub, lista_candidatos(sub, k))
+        # Abre o ciclo na aresta presa, da primeira ponta para a última
+        inicio = caminho.index(0)
+        caminho = caminho[inicio:] + caminho[:inicio]
+        if caminho[1] == len(nos) - 1:
+            caminho = caminho[:1] + caminho[1:][::-1]
+        rota[posicoes] = nos[caminho]
+    return rota
+
+
+def decompor(instancia, subalgoritmo='vizinho', tamanho_grupo=200, metodo='kmeans', processos=None, reparo=True,
+             janela=50, rng=None, **parametros):
+    """Resolve uma instância grande por partição e costura; retorna a rota fechada (índices) e o custo.
+
+    Cada grupo de cerca de `tamanho_grupo` nós é resolvido por `subalgoritmo` (um dos algoritmos de
+    flyfood.solucionadores, com `parametros`) em `processos` processos (padrão: todos os núcleos),
+    cada um com seu fluxo aleatório derivado de `rng`. Com `reparo` as janelas em torno das costuras
+    passam por busca local. Exige coordenadas.
+    """
+    if instancia.coordenadas is None:
+        raise ValueError('A decomposição precisa das coordenadas dos nós')
+    pontos = np.asarray(instancia.coordenadas, dtype=np.float64)
+    matriz = como_matriz(instancia.matriz)
+    rng = np.random.default_rng(rng)
+
+    with perfil.fase('particao'):
+        grupos = particionar(pontos, tamanho_grupo, metodo)
+    tarefas = [(pontos[g], instancia.tipo_distancia, subalgoritmo, r, parametros)
+               for g, r in zip(grupos, rng.spawn(len(grupos)))]
+    processos = min(processos or os.cpu_count() or 1, len(tarefas))
+    with perfil.fase('subproblemas'):
+        if processos > 1:
+            with ProcessPoolExecutor(processos) as executor:
+                sub_rotas = list(executor.map(_resolver_grupo, tarefas, chunksize=max(1, len(tarefas) // (4 * processos))))
+        else:
+            sub_rotas = [_resolver_grupo(t) for t in tarefas]
+    perfil.contar('grupos', len(grupos))
+
+    with perfil.fase('costura'):
+        ordem = _ordem_grupos(np.array([pontos[g].mean(axis=0) for g in grupos]))
+        rota, costuras = costurar(pontos, grupos, sub_rotas, ordem)
+    if reparo and len(grupos) > 1:
+        with perfil.fase('reparo'):
+            reparar_costuras(rota, matriz, costuras, janela)
+    custo = custo_rotas(matriz, rota).item()
+    return rota.tolist() + [int(rota[0])], custo
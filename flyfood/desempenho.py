@@ -0,0 +1,261 @@
+"""Suíte de desempenho: tempo, memória e qualidade de cada algoritmo comparados a uma referência gravada.
+
+Os casos cobrem as instâncias de tsp/ e instâncias aleatórias de 1k, 10k e 100k nós. Cada caso roda
+num processo novo, com a instância carregada fora da medição, e registra o tempo (mediana de
+`repeticoes` execuções), o pico de RSS acima do processo já preparado, o pico do tracemalloc (numa
+execução à parte, pois o rastreamento deixa o código mais lento), o custo e o gap para o ótimo
+conhecido. Todos os casos têm semente fixa, então o custo só muda quando o algoritmo muda.
+
+Exemplos:
+    python -m flyfood.desempenho --gravar                # grava/atualiza a referência
+    python -m flyfood.desempenho -c 'berlin52|st70'      # compara; código 1 se algo regrediu
+
+A referência (desempenho.json na raiz do projeto) fica no controle de versão; tempos e memória
+dependem da máquina, então grave-a de novo ao trocar de máquina.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+# Versão do formato da referência; incrementar exige gravar a referência de novo
+VERSAO_REFERENCIA = 1
+
+DIR_TSP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tsp')
+REFERENCIA = os.path.join(os.path.dirname(DIR_TSP), 'desempenho.json')
+
+# Variação relativa aceita antes de acusar regressão, mais uma folga absoluta para casos muito curtos
+TOLERANCIAS = {
+    'tempo': 0.30,
+    'memoria': 0.25,
+    'custo': 0.0,
+    'folga_tempo_s': 0.05,
+    'folga_memoria_mb': 4.0,
+}
+
+INSTANCIAS_TSP = ('berlin52', 'brazil58', 'st70', 'kroA100', 'pr107')
+TAMANHOS_ALEATORIOS = (1000, 10000, 100000)
+
+
+def _casos():
+    casos = []
+    for nome in INSTANCIAS_TSP:
+        casos += [
+            (nome, 'vizinho', {'busca_local': True}),
+            (nome, 'genetico', {'semear': 0.2}),
+            (nome, 'formigas', {'max_iter': 50}),
+        ]
+    casos += [
+        ('aleatoria-1000', 'vizinho', {'busca_local': True}),
+        ('aleatoria-1000', 'formigas', {'max_iter': 10, 'busca_local': True}),
+        ('aleatoria-1000', 'decomposicao', {'busca_local': True}),
+        ('aleatoria-10000', 'vizinho', {'busca_local': True}),
+        ('aleatoria-10000', 'decomposicao', {'busca_local': True}),
+        ('aleatoria-100000', 'vizinho', {}),
+        ('aleatoria-100000', 'decomposicao', {'busca_local': True}),
+    ]
+    return {f'{instancia}/{algoritmo}': {'instancia': instancia, 'algoritmo': algoritmo, 'parametros': parametros}
+            for instancia, algoritmo, parametros in casos}
+
+
+# Casos da suíte: nome -> instância, algoritmo e parâmetros (o GA fica só nas instâncias pequenas)
+CASOS = _casos()
+
+
+def carregar(nome):
+    """Instância da suíte: arquivo de tsp/ ou 'aleatoria-<n>' (coordenadas uniformes, semente n)."""
+    if nome.startswith('aleatoria-'):
+        import numpy as np
+
+        from .instancia import instancia_de_coordenadas
+
+        n = int(nome.split('-', 1)[1])
+        coordenadas = np.random.default_rng(n).integers(0, 10**6, (n, 2)).astype(np.float64)
+        return instancia_de_coordenadas(coordenadas, 'EUC_2D', nome)
+    from .instancia import carregar_instancia
+
+    return carregar_instancia(os.path.join(DIR_TSP, f'{nome}.tsp'))
+
+
+def _rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB no Linux
+
+
+def medir_caso(nome, repeticoes=1, rastrear_memoria=True, semente=0):
+    """Executa um caso e devolve tempo_s, rss_mb, tracemalloc_mb, custo e gap (None sem ótimo conhecido)."""
+    from .bateria import OTIMOS
+    from .solucionadores import resolver
+
+    caso = CASOS[nome]
+    instancia = carregar(caso['instancia'])
+    instancia.candidatos()  # Prepara a lista de candidatos (e os imports) fora da medição
+
+    def executar():
+        return resolver(instancia, caso['algoritmo'], semente, **caso['parametros'])
+
+    rss_inicial = _rss_mb()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _, custo = executar()
+        tempos.append(time.perf_counter() - inicio)
+    resultado = {
+        'tempo_s': round(statistics.median(tempos), 4),
+        'rss_mb': round(max(_rss_mb() - rss_inicial, 0.0), 2),
+        'tracemalloc_mb': None,
+        'custo': custo,
+        'gap': None,
+    }
+    if rastrear_memoria:
+        tracemalloc.start()
+        try:
+            executar()
+            resultado['tracemalloc_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        finally:
+            tracemalloc.stop()
+    otimo = OTIMOS.get(caso['instancia'])
+    if otimo:
+        resultado['gap'] = round(100 * (custo - otimo) / otimo, 4)
+    return resultado
+
+
+def executar_suite(nomes, repeticoes=1, rastrear_memoria=True):
+    """Mede os casos em ordem, cada um num processo novo; gera (nome, resultado)."""
+    for nome in nomes:
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+            try:
+                resultado = executor.submit(medir_caso, nome, repeticoes, rastrear_memoria).result()
+            except Exception as e:  # Um caso com erro vira uma regressão, sem parar a suíte
+                resultado = {'erro': f'{type(e).__name__}: {e}'}
+        yield nome, resultado
+
+
+def _limite(base, tolerancia, folga):
+    return base * (1 + tolerancia) + folga
+
+
+def comparar(resultado, base, tolerancias):
+    """Lista das regressões do resultado em relação à referência do caso (vazia se está tudo dentro)."""
+    if 'erro' in resultado:
+        return [resultado['erro']]
+    regressoes = []
+    checagens = [
+        ('tempo_s', tolerancias['tempo'], tolerancias['folga_tempo_s']),
+        ('rss_mb', tolerancias['memoria'], tolerancias['folga_memoria_mb']),
+        ('tracemalloc_mb', tolerancias['memoria'], tolerancias['folga_memoria_mb']),
+        ('custo', tolerancias['custo'], 0.0),
+    ]
+    for campo, tolerancia, folga in checagens:
+        atual, anterior = resultado.get(campo), base.get(campo)
+        if atual is None or anterior is None:
+            continue
+        if atual > _limite(anterior, tolerancia, folga):
+            regressoes.append(f'{campo} {anterior} -> {atual} ({100 * (atual - anterior) / max(anterior, 1e-12):+.1f}%)')
+    return regressoes
+
+
+def ler_referencia(caminho):
+    with open(caminho) as f:
+        referencia = json.load(f)
+    if referencia.get('versao') != VERSAO_REFERENCIA:
+        raise ValueError(f'Referência {caminho} na versão {referencia.get("versao")}, esperada {VERSAO_REFERENCIA}; '
+                         'grave-a de novo com --gravar')
+    return referencia
+
+
+def _ambiente():
+    import numpy as np
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(DIR_TSP),
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'maquina': platform.machine(),
+        'processador': platform.processor() or None,
+        'nucleos': os.cpu_count(),
+    }
+
+
+def gravar_referencia(caminho, resultados, tolerancias, anterior=None):
+    """Grava os resultados como referência, mantendo os casos da referência anterior que não rodaram."""
+    casos = dict(anterior['casos']) if anterior else {}
+    casos.update({nome: r for nome, r in resultados.items() if 'erro' not in r})
+    referencia = {
+        'versao': VERSAO_REFERENCIA,
+        'ambiente': _ambiente(),
+        'tolerancias': tolerancias,
+        'casos': dict(sorted(casos.items())),
+    }
+    temporario = caminho + f'.{os.getpid()}.tmp'
+    with open(temporario, 'w') as f:
+        json.dump(referencia, f, indent=1)
+        f.write('\n')
+    os.replace(temporario, caminho)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mede tempo, memória e qualidade e compara com a referência.')
+    parser.add_argument('-c', '--casos', help='expressão regular sobre os nomes dos casos (instancia/algoritmo)')
+    parser.add_argument('-r', '--referencia', default=REFERENCIA, help='arquivo JSON da referência')
+    parser.add_argument('--gravar', action='store_true', help='grava os resultados como nova referência')
+    parser.add_argument('-n', '--repeticoes', type=int, default=1, help='execuções por caso (vale a mediana)')
+    parser.add_argument('--sem-tracemalloc', action='store_true', help='não mede o pico do tracemalloc')
+    parser.add_argument('--listar', action='store_true', help='lista os casos e sai')
+    for chave, valor in TOLERANCIAS.items():
+        parser.add_argument(f"--tolerancia-{chave.replace('_', '-')}", type=float, dest=chave,
+                            help=f'padrão: o da referência ou {valor}')
+    args = parser.parse_args(argv)
+
+    nomes = [nome for nome in CASOS if args.casos is None or re.search(args.casos, nome)]
+    if args.listar:
+        print('\n'.join(nomes))
+        return 0
+    referencia = ler_referencia(args.referencia) if os.path.exists(args.referencia) else None
+    tolerancias = dict(TOLERANCIAS, **(referencia or {}).get('tolerancias', {}))
+    tolerancias.update({chave: getattr(args, chave) for chave in TOLERANCIAS if getattr(args, chave) is not None})
+    if referencia is None and not args.gravar:
+        print(f'Sem referência em {args.referencia}; rode com --gravar para criá-la', file=sys.stderr)
+        return 2
+
+    resultados = {}
+    regrediu = False
+    for nome, r in executar_suite(nomes, args.repeticoes, not args.sem_tracemalloc):
+        resultados[nome] = r
+        base = (referencia or {}).get('casos', {}).get(nome)
+        regressoes = comparar(r, base, tolerancias) if base is not None and not args.gravar else []
+        if 'erro' in r and args.gravar:
+            regressoes = [r['erro']]
+        regrediu |= bool(regressoes)
+        if 'erro' in r:
+            linha = 'ERRO'
+        else:
+            gap_otimo = f"{r['gap']:.2f}%" if r['gap'] is not None else '-'
+            memoria = f"{r['tracemalloc_mb']} MB" if r['tracemalloc_mb'] is not None else '-'
+            linha = (f"tempo={r['tempo_s']:<9.3f} rss=+{r['rss_mb']:<8} MB tracemalloc={memoria:<12} "
+                     f"custo={r['custo']:<12.1f} gap={gap_otimo}")
+        situacao = 'REGRESSÃO ' + '; '.join(regressoes) if regressoes else ('novo' if base is None else 'ok')
+        print(f'{nome:<32} {linha} [{situacao}]', flush=True)
+
+    if args.gravar:
+        gravar_referencia(args.referencia, resultados, tolerancias, referencia)
+        print(f'Referência gravada em {args.referencia}')
+    return 1 if regrediu else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""Distâncias TSPLIB calculadas sob demanda a partir das coordenadas, sem matriz n×n."""
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Raio da Terra e valor de π usados pela TSPLIB nas instâncias GEO
+RAIO_TERRA = 6378.388
+PI_TSPLIB = 3.141592
+
+# Tipos em que a ordem de vizinhança segue a distância euclidiana entre as coordenadas
+TIPOS_EUCLIDIANOS = ('EUC_2D', 'CEIL_2D', 'ATT')
+
+# Memória (bytes) reservada por padrão ao cache de linhas de cada oráculo
+MEMORIA_CACHE = 64 * 2**20
+
+# Acima deste número de pares a média das distâncias é estimada por amostragem
+AMOSTRAS_MEDIA = 2**20
+
+
+def _geo_radianos(coordenadas):
+    # Coordenadas GEO são graus.minutos (DDD.MM), convertidas para radianos como na TSPLIB
+    graus = np.trunc(coordenadas)
+    return PI_TSPLIB * (graus + 5.0 * (coordenadas - graus) / 3.0) / 180.0
+
+
+def _euc_2d(xa, ya, xb, yb):
+    return np.floor(np.hypot(xa - xb, ya - yb) + 0.5)
+
+
+def _ceil_2d(xa, ya, xb, yb):
+    return np.ceil(np.hypot(xa - xb, ya - yb))
+
+
+def _geo(lat_a, lon_a, lat_b, lon_b):
+    q1 = np.cos(lon_a - lon_b)
+    q2 = np.cos(lat_a - lat_b)
+    q3 = np.cos(lat_a + lat_b)
+    arco = np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0))
+    return np.floor(RAIO_TERRA * arco + 1.0)
+
+
+def _att(xa, ya, xb, yb):
+    r = np.sqrt(((xa - xb) ** 2 + (ya - yb) ** 2) / 10.0)
+    t = np.floor(r + 0.5)
+    return t + (t < r)
+
+
+def _euc_2d_escalar(xa, ya, xb, yb):
+    return float(math.floor(math.hypot(xa - xb, ya - yb) + 0.5))
+
+
+def _ceil_2d_escalar(xa, ya, xb, yb):
+    return float(math.ceil(math.hypot(xa - xb, ya - yb)))
+
+
+def _geo_escalar(lat_a, lon_a, lat_b, lon_b):
+    q1 = math.cos(lon_a - lon_b)
+    q2 = math.cos(lat_a - lat_b)
+    q3 = math.cos(lat_a + lat_b)
+    arco = math.acos(min(1.0, max(-1.0, 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3))))
+    return float(math.floor(RAIO_TERRA * arco + 1.0))
+
+
+def _att_escalar(xa, ya, xb, yb):
+    r = math.sqrt(((xa - xb) ** 2 + (ya - yb) ** 2) / 10.0)
+    t = float(math.floor(r + 0.5))
+    return t + 1.0 if t < r else t
+
+
+# tipo -> (preparo das coordenadas, distância vetorizada, distância escalar), com o arredondamento da TSPLIB
+TIPOS = {
+    'EUC_2D': (None, _euc_2d, _euc_2d_escalar),
+    'CEIL_2D': (None, _ceil_2d, _ceil_2d_escalar),
+    'GEO': (_geo_radianos, _geo, _geo_escalar),
+    'ATT': (None, _att, _att_escalar),
+}
+
+
+class _LinhaEscalar:
+    __slots__ = ('_oraculo', '_a')
+
+    def __init__(self, oraculo, a):
+        self._oraculo = oraculo
+        self._a = a
+
+    def __getitem__(self, b):
+        return self._oraculo.distancia(self._a, b)
+
+
+class _AcessoEscalar:
+    """`acesso[a][b]` calcula só a distância pedida, como o acesso por listas da busca local."""
+    __slots__ = ('_oraculo',)
+
+    def __init__(self, oraculo):
+        self._oraculo = oraculo
+
+    def __getitem__(self, a):
+        return _LinhaEscalar(self._oraculo, a)
+
+
+class OraculoDistancias:
+    """Matriz de distâncias virtual (n, n): cada distância é calculada das coordenadas quando pedida.
+
+    Aceita a indexação usada pelos solucionadores: `o[i]` (linha), `o[linhas]` (bloco de linhas),
+    `o[i, j]` e `o[a, b]` com vetores (pares elemento a elemento). As linhas avulsas ficam num
+    cache LRU de `tamanho_cache` linhas, então a memória é O(n + cache).
+    """
+
+    ndim = 2
+    dtype = np.dtype(np.float64)
+
+    def __init__(self, coordenadas, tipo='EUC_2D', tamanho_cache=None):
+        if tipo not in TIPOS:
+            raise ValueError(f'Tipo de distância {tipo} não suportado')
+        self.coordenadas = np.asarray(coordenadas, dtype=np.float64)
+        self.tipo = tipo
+        n = len(self.coordenadas)
+        self.shape = (n, n)
+        preparo, self._vetorizada, self._escalar = TIPOS[tipo]
+        pontos = preparo(self.coordenadas) if preparo else self.coordenadas
+        self._x = np.ascontiguousarray(pontos[:, 0])
+        self._y = np.ascontiguousarray(pontos[:, 1])
+        self._x_lista = self._x.tolist()
+        self._y_lista = self._y.tolist()
+        if tamanho_cache is None:
+            tamanho_cache = max(1, min(n, MEMORIA_CACHE // (8 * max(n, 1))))
+        self.tamanho_cache = tamanho_cache
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f'OraculoDistancias({self.tipo}, n={len(self)}, cache={self.tamanho_cache})'
+
+    def __getstate__(self):
+        # O cache não viaja para outros processos
+        estado = self.__dict__.copy()
+        estado['_cache'] = OrderedDict()
+        return estado
+
+    def distancia(self, a, b):
+        """Distância entre dois nós como float do Python."""
+        if a == b:
+            return 0.0
+        x, y = self._x_lista, self._y_lista
+        return self._escalar(x[a], y[a], x[b], y[b])
+
+    @property
+    def escalar(self):
+        return _AcessoEscalar(self)
+
+    def linha(self, i):
+        """Linha i (somente leitura), servida pelo cache LRU."""
+        linha = self._cache.get(i)
+        if linha is not None:
+            self._cache.move_to_end(i)
+            return linha
+        linha = self._linhas(np.array([i]))[0]
+        linha.flags.writeable = False
+        self._cache[i] = linha
+        if len(self._cache) > self.tamanho_cache:
+            self._cache.popitem(last=False)
+        return linha
+
+    def _linhas(self, linhas):
+        d = self._vetorizada(self._x[linhas, None], self._y[linhas, None], self._x, self._y)
+        d[np.arange(len(linhas)), linhas] = 0.0
+        return d
+
+    def _pares(self, a, b):
+        a, b = np.broadcast_arrays(a, b)
+        d = self._vetorizada(self._x[a], self._y[a], self._x[b], self._y[b])
+        return np.where(a == b, 0.0, d)
+
+    def __getitem__(self, chave):
+        if isinstance(chave, tuple):
+            if len(chave) != 2:
+                raise IndexError('O oráculo de distâncias tem duas dimensões')
+            i, j = chave
+            if isinstance(j, slice):
+                return self[i][..., j]
+            if isinstance(i, slice):
+                return self[j, i].T  # Matriz simétrica
+            if np.ndim(i) == 0 and np.ndim(j) == 0:
+                return np.float64(self.distancia(int(i), int(j)))
+            return self._pares(np.asarray(i), np.asarray(j))
+        if isinstance(chave, slice):
+            return self._linhas(np.arange(len(self))[chave])
+        if np.ndim(chave) == 0:
+            return self.linha(int(chave))
+        chave = np.asarray(chave)
+        return self._linhas(chave.ravel()).reshape(chave.shape + (len(self),))
+
+    def densa(self):
+        """Materializa a matriz completa (só para instâncias pequenas)."""
+        return self._linhas(np.arange(len(self)))
+
+    def __array__(self, dtype=None, copy=None):
+        matriz = self.densa()
+        return matriz if dtype is None else matriz.astype(dtype)
+
+    def media(self, amostras=AMOSTRAS_MEDIA):
+        """Média de todas as n² distâncias; exata para instâncias pequenas, senão por amostragem fixa."""
+        n = len(self)
+        if n * n <= amostras:
+            return self.densa().mean().item()
+        rng = np.random.default_rng(0)
+        return self._pares(rng.integers(0, n, amostras), rng.integers(0, n, amostras)).mean().item()
+
+
+def matriz_distancias(coordenadas, tipo='EUC_2D'):
+    """Matriz densa (n, n) float64 para o tipo de distância TSPLIB."""
+    return OraculoDistancias(coordenadas, tipo, tamanho_cache=1).densa()
+
+
+def como_matriz(matriz):
+    """Mantém um oráculo como está; qualquer outra matriz vira np.ndarray."""
+    if isinstance(matriz, OraculoDistancias):
+        return matriz
+    return np.asarray(matriz)
+
+
+def distancia_media(matriz):
+    if isinstance(matriz, OraculoDistancias):
+        return matriz.media()
+    return np.asarray(matriz).mean().item()
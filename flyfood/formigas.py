@@ -0,0 +1,316 @@
+import numpy as np
+
+from . import acelerado, perfil
+from .aleatorio import gerador
+from .busca_local import busca_local as aplicar_busca_local
+from .distancias import OraculoDistancias, como_matriz, distancia_media
+from .rotas import custo_rotas
+
+# Abaixo desta escala os valores são renormalizados, para não estourar o float64
+ESCALA_MINIMA = 1e-100
+
+
+def _heuristica(d, beta, d_min):
+    # Pontos repetidos (distância 0) recebem a menor distância positiva para não dividir por zero
+    d = np.where(d > 0, d, d_min)
+    return (1.0 / d) ** beta
+
+
+def _menor_distancia(d):
+    positivas = d[d > 0]
+    return positivas.min().item() if positivas.size else 1.0
+
+
+def calcular_heuristica(matriz, beta):
+    """Calcula η^β = (1/d)^β uma única vez por instância."""
+    d = np.asarray(matriz, dtype=np.float64)
+    eta = _heuristica(d, beta, _menor_distancia(d))
+    np.fill_diagonal(eta, 0.0)
+    return eta
+
+
+def calcular_atratividade(matriz_fero, heuristica, alfa, out=None):
+    """Calcula τ^α·η^β para todas as arestas (uma vez por iteração)."""
+    if alfa == 1:
+        return np.multiply(matriz_fero, heuristica, out=out)
+    return np.multiply(np.power(matriz_fero, alfa, out=out), heuristica, out=out)
+
+
+class Feromonios:
+    """Feromônios com evaporação preguiçosa: τ = escala · valores.
+
+    Evaporar só multiplica a escala; os valores são renormalizados quando ela fica pequena demais.
+    No modo esparso só as arestas da lista de candidatos (n, k) guardam feromônio; as demais ficam
+    com o τ0 inicial evaporado, sem receber depósitos.
+    """
+
+    def __init__(self, n, tau0, candidatos=None, esparso=False):
+        if esparso and candidatos is None:
+            raise ValueError('O modo esparso exige a lista de candidatos')
+        self.n = n
+        self.candidatos = candidatos if esparso else None
+        forma = self.candidatos.shape if esparso else (n, n)
+        self.valores = np.full(forma, float(tau0))
+        self.tau0 = float(tau0)  # Valor das arestas fora da lista, em unidades de `valores`
+        self.escala = 1.0
+
+    @property
+    def esparso(self):
+        return self.candidatos is not None
+
+    def evaporar(self, rho):
+        self.escala *= (1 - rho)
+        if self.escala < ESCALA_MINIMA:
+            self.valores *= self.escala
+            self.tau0 *= self.escala
+            self.escala = 1.0
+
+    def depositar(self, rotas, quantidades):
+        """Deposita `quantidades[k]` em todas as arestas (nos dois sentidos) da rota k, em lote."""
+        rotas = np.atleast_2d(rotas)
+        origem = rotas.ravel()
+        destino = np.roll(rotas, -1, axis=1).ravel()
+        q = np.repeat(np.atleast_1d(quantidades) / self.escala, rotas.shape[1])
+        for a, b in ((origem, destino), (destino, origem)):
+            if self.esparso:
+                # Só as arestas presentes na lista de candidatos de `a` guardam o depósito
+                iguais = self.candidatos[a] == b[:, None]
+                dentro = iguais.any(axis=1)
+                np.add.at(self.valores, (a[dentro], np.argmax(iguais[dentro], axis=1)), q[dentro])
+            else:
+                np.add.at(self.valores, (a, b), q)
+
+    def limitar(self, tau_min, tau_max):
+        np.clip(self.valores, tau_min / self.escala, tau_max / self.escala, out=self.valores)
+
+    def matriz(self):
+        """Feromônios reais (densos, ou (n, k) no modo esparso)."""
+        return self.valores * self.escala
+
+    def atratividade(self, heuristica, alfa, out=None):
+        """τ^α·η^β, com τ = escala · valores calculado in place em `out`.
+
+        A escala entra antes da potência: elevar `valores` e `escala` separadamente estoura o float64
+        (inf · 0) quando α é grande.
+        """
+        tau = np.multiply(self.valores, self.escala, out=out)
+        return calcular_atratividade(tau, heuristica, alfa, out=tau)
+
+
+class AtratividadeEsparsa:
+    """Atratividade guardada só nas arestas candidatas; linhas completas são calculadas sob demanda.
+
+    Indexar com nós (`atratividade[linhas]`) devolve as linhas completas, usadas pelas formigas
+    cujos candidatos já foram todos visitados.
+    """
+
+    def __init__(self, matriz_dist, candidatos, beta):
+        self.matriz_dist = matriz_dist
+        self.candidatos = candidatos
+        self.beta = beta
+        self.shape = (len(candidatos), len(candidatos))
+        d = np.asarray(matriz_dist[np.arange(len(candidatos))[:, None], candidatos], dtype=np.float64)
+        self.d_min = _menor_distancia(d)
+        self.heuristica = _heuristica(d, beta, self.d_min)
+        self.valores = None
+        self.fora = 0.0
+
+    def atualizar(self, feromonios, alfa):
+        self.valores = feromonios.atratividade(self.heuristica, alfa)
+        self.fora = (feromonios.tau0 * feromonios.escala) ** alfa
+
+    def __getitem__(self, linhas):
+        linhas = np.atleast_1d(linhas)
+        d = np.asarray(self.matriz_dist[linhas], dtype=np.float64)
+        resultado = self.fora * _heuristica(d, self.beta, self.d_min)
+        indices = np.arange(len(linhas))
+        resultado[indices[:, None], self.candidatos[linhas]] = self.valores[linhas]
+        resultado[indices, linhas] = 0.0
+        return resultado
+
+
+def _limiar(sorteio, total):
+    # sorteio·total pode arredondar para o próprio total quando ele é subnormal; o limiar fica abaixo
+    # dele para que sempre haja um nó com peso positivo acima
+    return np.minimum(sorteio * total, np.nextafter(total, 0))
+
+
+def _roleta(pesos, livres, sorteio):
+    """Sorteia uma coluna por linha proporcionalmente aos pesos (soma acumulada mascarada).
+
+    `sorteio` traz um número uniforme em [0, 1) por linha.
+    """
+    pesos = pesos * livres
+    sem_peso = pesos.sum(axis=1) <= 0
+    if sem_peso.any():
+        # Sem atratividade disponível: escolha uniforme entre os nós livres
+        pesos[sem_peso] = livres[sem_peso]
+    acumulado = np.cumsum(pesos, axis=1)
+    r = _limiar(sorteio, acumulado[:, -1])
+    return np.argmax(acumulado > r[:, None], axis=1)
+
+
+def construir_rotas(atratividade, num_formigas, rng, candidatos=None, atr_candidatos=None):
+    """Constrói as rotas de todas as formigas em lote, com roleta por soma acumulada mascarada.
+
+    Com `candidatos` (k vizinhos por nó) a roleta considera só a lista de candidatos do nó atual;
+    a varredura completa fica para as formigas cujos candidatos já foram todos visitados.
+    `atr_candidatos` (n, k) dá a atratividade das arestas candidatas sem consultar `atratividade`.
+    Cada passo consome dois sorteios por formiga (roleta e varredura completa); com o Numba
+    instalado a construção roda no núcleo compilado de flyfood.acelerado, com os mesmos sorteios.
+    """
+    n = atratividade.shape[0]
+    atual = rng.integers(0, n, size=num_formigas)
+    if atr_candidatos is None and acelerado.usar(atratividade):
+        if candidatos is not None:
+            candidatos = np.asarray(candidatos)
+        sorteios = rng.random((n - 1, 2, num_formigas))
+        return acelerado.construir_rotas(np.asarray(atratividade), candidatos, atual, sorteios)
+
+    formigas = np.arange(num_formigas)
+    rotas = np.empty((num_formigas, n), dtype=np.int32)
+    livres = np.ones((num_formigas, n), dtype=bool)
+    rotas[:, 0] = atual
+    livres[formigas, atual] = False
+
+    for passo in range(1, n):
+        sorteio = rng.random((2, num_formigas))
+        if candidatos is None:
+            atual = _roleta(atratividade[atual], livres, sorteio[0])
+        else:
+            cand = candidatos[atual]
+            if atr_candidatos is None:
+                pesos = atratividade[atual[:, None], cand]
+            else:
+                pesos = atr_candidatos[atual]
+            pesos = pesos * livres[formigas[:, None], cand]
+            acumulado = np.cumsum(pesos, axis=1)
+            total = acumulado[:, -1]
+            r = _limiar(sorteio[0], total)
+            atual = cand[formigas, np.argmax(acumulado > r[:, None], axis=1)]
+            esgotadas = total <= 0
+            if esgotadas.any():
+                # Todos os candidatos já visitados: varredura completa só para essas formigas
+                linhas = rotas[esgotadas, passo - 1]
+                atual[esgotadas] = _roleta(atratividade[linhas], livres[esgotadas], sorteio[1, esgotadas])
+        rotas[:, passo] = atual
+        livres[formigas, atual] = False
+    return rotas
+
+
+def atualizar_feromonios(feromonios, rotas, custos, rho, Q, variante='as', melhor_rota=None, melhor_custo=None,
+                         peso_elite=1.0):
+    """Atualiza os feromônios usando evaporação e depósito.
+
+    Variantes: 'as' (Ant System, todas as formigas depositam), 'elitista' (AS mais um depósito extra
+    de `peso_elite` vezes na melhor rota global) e 'mmas' (MAX-MIN: só a melhor rota global
+    deposita e os feromônios ficam limitados a [τmin, τmax]).
+    """
+    feromonios.evaporar(rho)
+    if variante == 'mmas':
+        feromonios.depositar(melhor_rota, Q / melhor_custo)
+        tau_max = Q / (rho * melhor_custo)
+        feromonios.limitar(tau_max / (2 * feromonios.n), tau_max)
+        return
+    feromonios.depositar(rotas, Q / np.asarray(custos, dtype=np.float64))
+    if variante == 'elitista' and melhor_rota is not None:
+        feromonios.depositar(melhor_rota, peso_elite * Q / melhor_custo)
+
+
+VARIANTES = ('as', 'elitista', 'mmas')
+
+
+def colonia_de_formigas(matriz_dist, num_formigas=20, max_iter=100, alfa=1, beta=2, rho=0.5, Q=100, rng=None, candidatos=None,
+                        busca_local=False, variante='as', peso_elite=1.0, processos=None, esparso=None, custo_alvo=None,
+                        controle=None, rota_inicial=None):
+    """Colônia de formigas com construção vetorizada das rotas.
+
+    `candidatos` é uma lista de vizinhos (n, k) que restringe a roleta de cada passo.
+    Com `busca_local` a melhor formiga de cada iteração é refinada por 2-opt/Or-opt antes do depósito.
+    `variante` escolhe a regra de atualização dos feromônios (ver atualizar_feromonios).
+    Com `processos` > 1 as formigas são construídas em processos que leem a matriz de atratividade
+    em memória compartilhada (flyfood.formigas_paralelo).
+    Com `esparso` feromônios e atratividade ficam só nas arestas candidatas, O(n·k) em memória;
+    é o padrão quando `matriz_dist` é um OraculoDistancias.
+    Com `custo_alvo` as iterações terminam assim que uma rota com esse custo é encontrada;
+    `controle` (flyfood.controle.Controle) acrescenta tempo, estagnação e gap e avisa cada melhora.
+    `rng` é um np.random.Generator ou uma semente; a mesma semente repete a execução.
+    Com `rota_inicial` (partida a quente) as arestas dessa rota começam com Q/(ρ·L), o feromônio
+    acumulado por uma rota que depositasse em todas as iterações, e ela é a melhor rota inicial.
+    Retorna a melhor rota (índices, fechando no nó inicial) e o seu custo.
+    """
+    if variante not in VARIANTES:
+        raise ValueError(f'Variante {variante} não suportada')
+    matriz_dist = como_matriz(matriz_dist)
+    if esparso is None:
+        esparso = isinstance(matriz_dist, OraculoDistancias)
+    if esparso and processos is not None and processos > 1:
+        raise ValueError('O modo esparso não suporta construção em vários processos')
+    rng = gerador(rng)
+    n = matriz_dist.shape[0]
+
+    tau0 = 1 / (n * distancia_media(matriz_dist))
+    feromonios = Feromonios(n, tau0, candidatos, esparso)
+    if esparso:
+        atratividade = AtratividadeEsparsa(matriz_dist, candidatos, beta)
+    else:
+        heuristica = calcular_heuristica(matriz_dist, beta)
+    melhor_rota = None
+    melhor_custo = float('inf')
+    if rota_inicial is not None:
+        melhor_rota = np.asarray(rota_inicial, dtype=np.int32)[:n].copy()  # Aceita a rota fechada
+        melhor_custo = custo_rotas(matriz_dist, melhor_rota).item()
+        feromonios.depositar(melhor_rota, Q / (rho * melhor_custo))
+        if controle is not None:
+            controle.registrar(melhor_custo, melhor_rota)
+
+    construcao = None
+    if processos is not None and processos > 1:
+        from .formigas_paralelo import ConstrucaoParalela
+        construcao = ConstrucaoParalela(n, candidatos, processos)
+    try:
+        for _ in range(max_iter):
+            with perfil.fase('atratividade'):
+                if esparso:
+                    atratividade.atualizar(feromonios, alfa)
+                elif construcao is None:
+                    atratividade = feromonios.atratividade(heuristica, alfa)
+                else:
+                    # Escreve τ^α·η^β direto na memória compartilhada lida pelos processos
+                    feromonios.atratividade(heuristica, alfa, out=construcao.atratividade)
+            with perfil.fase('construcao'):
+                if esparso:
+                    rotas = construir_rotas(atratividade, num_formigas, rng, candidatos, atratividade.valores)
+                elif construcao is None:
+                    rotas = construir_rotas(atratividade, num_formigas, rng, candidatos)
+                else:
+                    rotas = construcao.construir(num_formigas, rng)
+            with perfil.fase('avaliacao'):
+                custos = custo_rotas(matriz_dist, rotas)
+            perfil.contar('iteracoes')
+            perfil.contar('avaliacoes', num_formigas)
+
+            k = int(np.argmin(custos))
+            if busca_local:
+                rota, custo = aplicar_busca_local(rotas[k], matriz_dist, candidatos)
+                rotas[k] = rota
+                custos[k] = custo
+            if custos[k] < melhor_custo:
+                melhor_custo = custos[k].item()
+                melhor_rota = rotas[k].copy()
+
+            if controle is not None:
+                controle.registrar(custos[k], rotas[k])
+                if controle.parar():
+                    break
+            if custo_alvo is not None and melhor_custo <= custo_alvo:
+                break
+            with perfil.fase('feromonio'):
+                atualizar_feromonios(feromonios, rotas, custos, rho, Q, variante, melhor_rota, melhor_custo, peso_elite)
+    finally:
+        if construcao is not None:
+            construcao.fechar()
+
+    melhor_rota = melhor_rota.tolist()
+    melhor_rota.append(melhor_rota[0])
+    return melhor_rota, melhor_custo
@@ -0,0 +1,57 @@
+"""Construção paralela das formigas sobre uma matriz de atratividade em memória compartilhada."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .formigas import construir_rotas
+
+# Estado de cada processo trabalhador, preenchido pelo inicializador
+_compartilhado = {}
+
+
+def _inicializar(nome, n, candidatos):
+    memoria = shared_memory.SharedMemory(name=nome)
+    _compartilhado['memoria'] = memoria
+    _compartilhado['atratividade'] = np.ndarray((n, n), dtype=np.float64, buffer=memoria.buf)
+    _compartilhado['candidatos'] = candidatos
+
+
+def _construir_lote(num_formigas, rng):
+    return construir_rotas(_compartilhado['atratividade'], num_formigas, rng, _compartilhado['candidatos'])
+
+
+class ConstrucaoParalela:
+    """Processos que constroem lotes de formigas lendo a atratividade (n, n) em memória compartilhada.
+
+    O processo principal escreve em `atratividade` entre as iterações; os trabalhadores só leem,
+    então nenhuma matriz n×n é copiada a cada iteração.
+    """
+
+    def __init__(self, n, candidatos=None, processos=None):
+        self.processos = processos or os.cpu_count()
+        self._memoria = shared_memory.SharedMemory(create=True, size=n * n * 8)
+        self.atratividade = np.ndarray((n, n), dtype=np.float64, buffer=self._memoria.buf)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processos,
+            initializer=_inicializar,
+            initargs=(self._memoria.name, n, candidatos),
+        )
+
+    def construir(self, num_formigas, rng):
+        """Divide as formigas em lotes, um por processo, cada um com um gerador filho de `rng`."""
+        tamanhos = [len(lote) for lote in np.array_split(np.arange(num_formigas), self.processos) if len(lote)]
+        return np.concatenate(list(self._executor.map(_construir_lote, tamanhos, rng.spawn(len(tamanhos)))))
+
+    def fechar(self):
+        self._executor.shutdown()
+        self.atratividade = None
+        self._memoria.close()
+        self._memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
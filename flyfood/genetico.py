@@ -0,0 +1,199 @@
+import numpy as np
+
+from . import perfil
+from .aleatorio import gerador
+from .cruzamento import CRUZAMENTOS
+from .distancias import como_matriz
+from .inicial import rotas_iniciais as rotas_heuristicas
+from .rotas import custo_rotas
+
+
+class Populacao:
+    """População compacta: matriz (P, n) int32 de rotas e vetor de custos."""
+
+    def __init__(self, rotas, custos):
+        self.rotas = rotas
+        self.custos = custos
+
+    @classmethod
+    def aleatoria(cls, matriz, tamanho, rng, iniciais=None):
+        """Gera `tamanho` permutações aleatórias de uma vez e as avalia em lote.
+
+        Com `iniciais` (rotas abertas (m, n)) as primeiras linhas da população são essas rotas
+        (partida a quente, ver flyfood.inicial) e só as demais são aleatórias.
+        """
+        n = matriz.shape[0]
+        with perfil.fase('construcao'):
+            rotas = np.argsort(rng.random((tamanho, n)), axis=1).astype(np.int32)
+            if iniciais is not None and len(iniciais):
+                iniciais = np.asarray(iniciais, dtype=np.int32)[:tamanho]
+                rotas[:len(iniciais)] = iniciais
+        with perfil.fase('avaliacao'):
+            custos = custo_rotas(matriz, rotas).astype(np.float64)
+        perfil.contar('avaliacoes', tamanho)
+        return cls(rotas, custos)
+
+    def __len__(self):
+        return len(self.custos)
+
+    def melhor(self):
+        """Retorna (custo, rota) do melhor indivíduo."""
+        k = int(np.argmin(self.custos))
+        return self.custos[k].item(), self.rotas[k].tolist()
+
+    def adicionar(self, rotas, custos):
+        self.rotas = np.concatenate([self.rotas, rotas])
+        self.custos = np.concatenate([self.custos, custos])
+
+    def truncar(self, tamanho):
+        """Mantém os `tamanho` melhores indivíduos (argpartition, sem ordenar tudo)."""
+        if len(self) > tamanho:
+            manter = np.argpartition(self.custos, tamanho - 1)[:tamanho]
+            self.rotas = self.rotas[manter]
+            self.custos = self.custos[manter]
+
+    def melhores(self, quantidade):
+        """Cópia das `quantidade` melhores rotas e seus custos (para migração)."""
+        quantidade = min(quantidade, len(self))
+        k = np.argpartition(self.custos, quantidade - 1)[:quantidade]
+        return self.rotas[k].copy(), self.custos[k].copy()
+
+    def substituir_piores(self, rotas, custos):
+        """Troca os piores indivíduos pelas rotas recebidas."""
+        quantidade = min(len(custos), len(self))
+        if quantidade:
+            k = np.argpartition(self.custos, len(self) - quantidade)[len(self) - quantidade:]
+            self.rotas[k] = rotas[:quantidade]
+            self.custos[k] = custos[:quantidade]
+
+    def ordenada(self):
+        """Lista [[custo, rota], ...] ordenada pelo custo."""
+        ordem = np.argsort(self.custos, kind='stable')
+        return [[self.custos[k].item(), self.rotas[k].tolist()] for k in ordem]
+
+
+def selecao_roleta(custos, num, rng):
+    """Roleta vetorizada: probabilidade proporcional a 1/custo."""
+    aptidao = 1.0 / np.maximum(custos, np.finfo(np.float64).tiny)
+    acumulado = np.cumsum(aptidao)
+    sorteio = rng.random(num) * acumulado[-1]
+    return np.minimum(np.searchsorted(acumulado, sorteio, side='right'), len(custos) - 1)
+
+
+def selecao_torneio(custos, num, rng, tamanho_torneio=3):
+    """Torneio vetorizado: o menor custo entre `tamanho_torneio` sorteados vence."""
+    competidores = rng.integers(0, len(custos), size=(num, tamanho_torneio))
+    vencedor = np.argmin(custos[competidores], axis=1)
+    return competidores[np.arange(num), vencedor]
+
+
+SELECOES = {
+    'roleta': selecao_roleta,
+    'torneio': selecao_torneio,
+}
+
+
+def mutacao(matriz, rotas, custos, tx_de_mutacao, rng):
+    """Mutação por troca de duas cidades em lote, com os custos atualizados por delta em O(1).
+
+    Só as arestas que saem das posições i-1, i, j-1 e j mudam; elas são somadas antes e depois da troca.
+    """
+    m, n = rotas.shape
+    linhas = np.flatnonzero(rng.random(m) < tx_de_mutacao)
+    if n < 3 or not linhas.size:
+        return
+    # Duas posições distintas por linha, com i < j
+    i = rng.integers(0, n, size=linhas.size)
+    j = rng.integers(0, n - 1, size=linhas.size)
+    j += j >= i
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    arestas = np.stack([(i - 1) % n, i, j - 1, j], axis=1)
+    # Posições vizinhas compartilham arestas; cada aresta deve ser contada uma vez
+    peso = np.ones(arestas.shape)
+    peso[:, 2] = j - 1 != i
+    peso[:, 0] = (i - 1) % n != j
+
+    def custo_arestas():
+        origem = rotas[linhas[:, None], arestas]
+        destino = rotas[linhas[:, None], (arestas + 1) % n]
+        return (matriz[origem, destino] * peso).sum(axis=1)
+
+    antes = custo_arestas()
+    a = rotas[linhas, i]
+    rotas[linhas, i] = rotas[linhas, j]
+    rotas[linhas, j] = a
+    custos[linhas] += custo_arestas() - antes
+
+
+def evoluir(matriz, populacao, geracoes, rng, tx_de_reproducao=60, prob_de_mutacao=0.5, selecao='roleta',
+            cruzamento='ox', custo_alvo=None, controle=None):
+    """Avança a população por `geracoes` gerações (seleção, cruzamento, mutação e substituição).
+
+    Para antes se o melhor custo chegar a `custo_alvo` ou se `controle` (flyfood.controle.Controle),
+    que recebe o melhor indivíduo de cada geração, mandar parar.
+    """
+    selecionar = SELECOES[selecao]
+    cruzar = CRUZAMENTOS[cruzamento]
+    tamanho_populacao = len(populacao)
+    num_pares = max(1, int(tamanho_populacao * ((tx_de_reproducao / 2) / 100)))
+
+    for geracao in range(geracoes):
+        # Seleção de pais
+        with perfil.fase('selecao'):
+            pais = selecionar(populacao.custos, 2 * num_pares, rng).reshape(num_pares, 2)
+        # Crossover, avaliação em lote e mutação com custo incremental
+        with perfil.fase('cruzamento'):
+            filhos = cruzar(populacao.rotas[pais[:, 0]], populacao.rotas[pais[:, 1]], rng)
+        with perfil.fase('avaliacao'):
+            custos_filhos = custo_rotas(matriz, filhos).astype(np.float64)
+        with perfil.fase('mutacao'):
+            mutacao(matriz, filhos, custos_filhos, prob_de_mutacao, rng)
+        # Nova população
+        with perfil.fase('substituicao'):
+            populacao.adicionar(filhos, custos_filhos)
+            populacao.truncar(tamanho_populacao)
+        perfil.contar('geracoes')
+        perfil.contar('avaliacoes', len(filhos))
+        if controle is not None:
+            k = int(np.argmin(populacao.custos))
+            controle.registrar(populacao.custos[k], populacao.rotas[k])
+            if controle.parar():
+                break
+        if custo_alvo is not None and populacao.custos.min() <= custo_alvo:
+            break
+    return populacao
+
+
+def populacao_inicial(matriz, tamanho, rng, rotas_iniciais=None, semear=0.0, metodo_semeadura='vizinho',
+                      candidatos=None):
+    """População inicial: `rotas_iniciais`, depois uma fração `semear` de rotas heurísticas
+    diversificadas (flyfood.inicial.rotas_iniciais com `metodo_semeadura`) e o restante aleatório.
+    """
+    iniciais = [] if rotas_iniciais is None else [np.asarray(rotas_iniciais, dtype=np.int32)]
+    quantidade = min(int(round(semear * tamanho)), tamanho - sum(len(r) for r in iniciais))
+    if quantidade > 0:
+        with perfil.fase('construcao'):
+            iniciais.append(rotas_heuristicas(matriz, quantidade, rng, candidatos, metodo_semeadura))
+    return Populacao.aleatoria(matriz, tamanho, rng, np.concatenate(iniciais) if iniciais else None)
+
+
+def alg_genetico(matriz, tamanho_populacao=10, tx_de_reproducao=60, prob_de_mutacao=0.5, criterio_de_parada=80,
+                 rng=None, selecao='roleta', cruzamento='ox', custo_alvo=None, controle=None, rotas_iniciais=None,
+                 semear=0.0, metodo_semeadura='vizinho', candidatos=None):
+    """Algoritmo genético sobre índices de cidades e a matriz de distâncias pré-calculada.
+
+    `selecao` escolhe entre 'roleta' e 'torneio' e `cruzamento` entre os operadores de
+    flyfood.cruzamento ('ox', 'pmx', 'erx', 'um_ponto'). A substituição mantém os `tamanho_populacao`
+    melhores entre pais e filhos. Com `custo_alvo` a evolução termina assim que ele é atingido;
+    `controle` acrescenta os critérios de flyfood.controle (tempo, estagnação, gap) e avisa cada melhora.
+    `rng` é um np.random.Generator ou uma semente; a mesma semente repete a execução.
+    Partida a quente (ver populacao_inicial): `rotas_iniciais` (rotas abertas (m, n)) e uma fração
+    `semear` de rotas do vizinho mais próximo aleatorizado ou gulosas entram no lugar de rotas aleatórias.
+    Retorna a população final ordenada, como [[custo, rota], ...].
+    """
+    rng = gerador(rng)
+    matriz = como_matriz(matriz)
+    populacao = populacao_inicial(matriz, tamanho_populacao, rng, rotas_iniciais, semear, metodo_semeadura, candidatos)
+    evoluir(matriz, populacao, criterio_de_parada, rng, tx_de_reproducao, prob_de_mutacao, selecao, cruzamento,
+            custo_alvo, controle)
+    return populacao.ordenada()
@@ -0,0 +1,178 @@
+"""Algoritmo genético em modelo de ilhas: uma população por processo, com migração periódica."""
+import multiprocessing as mp
+import os
+import queue
+import time
+
+import numpy as np
+
+from . import perfil
+from .aleatorio import gerador
+from .distancias import como_matriz
+from .cruzamento import CRUZAMENTOS
+from .genetico import SELECOES, evoluir, populacao_inicial
+
+# Parâmetros de flyfood.genetico.evoluir repassados a cada ilha
+PARAMETROS_EVOLUCAO = ('tx_de_reproducao', 'prob_de_mutacao', 'selecao', 'cruzamento')
+
+
+def vizinhos_topologia(topologia, num_ilhas):
+    """Destinos dos migrantes de cada ilha: 'anel' (i -> i+1) ou 'completa' (i -> todas as outras)."""
+    if topologia == 'anel':
+        return [[(i + 1) % num_ilhas] if num_ilhas > 1 else [] for i in range(num_ilhas)]
+    if topologia == 'completa':
+        return [[j for j in range(num_ilhas) if j != i] for i in range(num_ilhas)]
+    raise ValueError(f'Topologia {topologia} não suportada')
+
+
+def _ilha(indice, matriz, rng, caixas, destinos, num_origens, resultados, tamanho_populacao, intervalo_migracao,
+          num_migrantes, max_geracoes, prazo, custo_alvo, parar, relatar, sincrono, perfilar, partida, parametros):
+    """Laço de uma ilha: evolui por épocas, envia migrantes e incorpora os que chegaram.
+
+    Com `sincrono` a ilha espera os migrantes da mesma época de cada uma das `num_origens` ilhas e
+    os incorpora na ordem das origens; senão incorpora só os que já chegaram.
+    `partida` traz os argumentos de partida a quente de flyfood.genetico.populacao_inicial.
+    Com `relatar` o melhor indivíduo de cada época também é enviado ao processo principal, e com
+    `perfilar` as fases medidas na ilha são enviadas a ele no fim.
+    """
+    perfil.ativar(perfilar)
+    perfil.reiniciar()
+    for caixa in caixas:
+        # Migrantes não lidos no fim da execução não devem travar o encerramento do processo
+        caixa.cancel_join_thread()
+    populacao = populacao_inicial(matriz, tamanho_populacao, rng, **partida)
+    geracoes = 0
+    adiantados = {}  # Migrantes de épocas futuras, de vizinhas mais rápidas (modo síncrono)
+    while geracoes < max_geracoes and not parar.is_set():
+        if prazo is not None and time.monotonic() >= prazo:
+            parar.set()  # Libera as ilhas que esperam migrantes desta
+            break
+        epoca = min(intervalo_migracao, max_geracoes - geracoes)
+        evoluir(matriz, populacao, epoca, rng, custo_alvo=custo_alvo, **parametros)
+        geracoes += epoca
+        if custo_alvo is not None and populacao.custos.min() <= custo_alvo:
+            parar.set()  # Avisa as outras ilhas que o alvo foi atingido
+        if relatar:
+            resultados.put(('epoca', indice, *populacao.melhor(), geracoes))
+        if not num_migrantes:
+            continue
+
+        with perfil.fase('migracao'):
+            if destinos:
+                migrantes = populacao.melhores(num_migrantes)
+                for destino in destinos:
+                    caixas[destino].put((geracoes, indice, *migrantes))
+            chegaram = adiantados.pop(geracoes, [])
+            if sincrono:
+                while len(chegaram) < num_origens and not parar.is_set():
+                    try:
+                        pacote = caixas[indice].get(timeout=0.05)
+                    except queue.Empty:
+                        continue
+                    (chegaram if pacote[0] == geracoes else adiantados.setdefault(pacote[0], [])).append(pacote)
+            else:
+                while True:
+                    try:
+                        chegaram.append(caixas[indice].get_nowait())
+                    except queue.Empty:
+                        break
+            for _, _, rotas, custos in sorted(chegaram, key=lambda pacote: pacote[1]):
+                populacao.substituir_piores(rotas, custos)
+
+    if perfilar:
+        resultados.put(('perfil', indice, perfil.coletar()))
+    resultados.put(('fim', indice, *populacao.melhor(), geracoes))
+
+
+def _validar_parametros(parametros):
+    # Erros de parâmetro aparecem aqui, e não como uma ilha que morreu sem enviar o resultado
+    desconhecidos = sorted(set(parametros) - set(PARAMETROS_EVOLUCAO))
+    if desconhecidos:
+        raise TypeError(f"ga_ilhas() recebeu parâmetros desconhecidos: {', '.join(desconhecidos)}")
+    if parametros.get('selecao', 'roleta') not in SELECOES:
+        raise ValueError(f"Seleção {parametros['selecao']} não suportada")
+    if parametros.get('cruzamento', 'ox') not in CRUZAMENTOS:
+        raise ValueError(f"Cruzamento {parametros['cruzamento']} não suportado")
+
+
+def ga_ilhas(matriz, num_ilhas=None, topologia='anel', intervalo_migracao=20, num_migrantes=2,
+             tamanho_populacao=100, max_geracoes=1000, tempo_limite=None, rng=None, custo_alvo=None,
+             controle=None, sincrono=True, rotas_iniciais=None, semear=0.0, metodo_semeadura='vizinho',
+             candidatos=None, **parametros):
+    """Executa `num_ilhas` populações em processos separados, cada uma com seu próprio gerador.
+
+    A cada `intervalo_migracao` gerações cada ilha envia seus `num_migrantes` melhores indivíduos
+    às vizinhas da topologia. A execução termina quando todas as ilhas atingem `max_geracoes` ou o
+    tempo global `tempo_limite` (segundos), ou quando alguma ilha atinge `custo_alvo`.
+    Com `controle` (flyfood.controle.Controle) o melhor de cada época de cada ilha é registrado no
+    processo principal, e os critérios do controle (contando épocas como iterações) encerram todas.
+    Cada ilha recebe um filho de `rng` (Generator ou semente). Com `sincrono` cada ilha espera os
+    migrantes da época antes de seguir, então a mesma semente repete o resultado de todas as ilhas
+    (exceto quando a execução é interrompida por tempo, alvo ou controle); sem ele as ilhas não se
+    esperam e a migração depende da ordem de chegada.
+    Partida a quente: `rotas_iniciais` (rotas abertas (m, n)) são divididas entre as ilhas e cada
+    uma semeia a fração `semear` da sua população (ver flyfood.genetico.populacao_inicial).
+    Com flyfood.perfil ligado, as fases medidas nas ilhas são somadas no processo principal.
+    Os demais parâmetros seguem flyfood.genetico.evoluir (PARAMETROS_EVOLUCAO) e são conferidos
+    antes de criar os processos.
+    Retorna [[custo, rota], ...] com o melhor de cada ilha, ordenado pelo custo.
+    """
+    _validar_parametros(parametros)
+    rng = gerador(rng)
+    num_ilhas = num_ilhas or os.cpu_count()
+    matriz = como_matriz(matriz)
+    destinos = vizinhos_topologia(topologia, num_ilhas)
+    num_origens = [sum(i in d for d in destinos) for i in range(num_ilhas)]
+    prazo = time.monotonic() + tempo_limite if tempo_limite is not None else None
+    if controle is not None and controle.prazo is not None:
+        prazo = controle.prazo if prazo is None else min(prazo, controle.prazo)
+
+    # Cada ilha recebe uma fatia das rotas iniciais (em rodízio, para todas ganharem as primeiras)
+    partidas = [
+        dict(rotas_iniciais=None if rotas_iniciais is None else np.asarray(rotas_iniciais)[i::num_ilhas],
+             semear=semear, metodo_semeadura=metodo_semeadura, candidatos=candidatos)
+        for i in range(num_ilhas)
+    ]
+
+    contexto = mp.get_context()
+    caixas = [contexto.Queue() for _ in range(num_ilhas)]
+    resultados = contexto.Queue()
+    parar = contexto.Event()
+    processos = [
+        contexto.Process(
+            target=_ilha,
+            args=(i, matriz, filho, caixas, destinos[i], num_origens[i], resultados, tamanho_populacao,
+                  intervalo_migracao, num_migrantes, max_geracoes, prazo, custo_alvo, parar, controle is not None,
+                  sincrono, perfil.ATIVO, partidas[i], parametros),
+            daemon=True,
+        )
+        for i, filho in enumerate(rng.spawn(num_ilhas))
+    ]
+    for p in processos:
+        p.start()
+    try:
+        # Lê os resultados antes do join, senão um processo com dados pendentes na fila nunca termina
+        melhores = []
+        espera = 1 if controle is None else 0.05
+        while len(melhores) < num_ilhas:
+            if controle is not None and controle.parar():
+                parar.set()
+            try:
+                tipo, _, *conteudo = resultados.get(timeout=espera)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processos) and resultados.empty():
+                    raise RuntimeError('Uma ilha terminou sem enviar o resultado')
+                continue
+            if tipo == 'perfil':
+                perfil.mesclar(conteudo[0])  # Fases somadas entre as ilhas
+            elif tipo == 'epoca':
+                controle.registrar(*conteudo[:2])
+            else:
+                melhores.append(conteudo[:2])
+    finally:
+        for p in processos:
+            p.join(timeout=1)
+            if p.is_alive():
+                p.terminate()
+    melhores.sort(key=lambda x: x[0])
+    return melhores
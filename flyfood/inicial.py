@@ -0,0 +1,163 @@
+"""Partidas a quente: rotas heurísticas para semear populações e rotas gravadas de execuções anteriores."""
+import json
+
+import numpy as np
+
+from .candidatos import lista_candidatos
+from .distancias import como_matriz
+from .tsplib import ler_tsp, rotulos
+from .vizinho import vizinho_lote, vizinho_mais_proximo
+
+METODOS = ('vizinho', 'guloso')
+
+
+def rota_aberta(rota):
+    """Rota como np.ndarray int32 sem repetir o nó inicial no fim."""
+    rota = np.asarray(rota, dtype=np.int32)
+    if len(rota) > 1 and rota[0] == rota[-1]:
+        rota = rota[:-1]
+    return rota
+
+
+def guloso_arestas(matriz, candidatos, rng=None, ruido=0.0):
+    """Heurística gulosa de arestas: da mais curta para a mais longa entre as arestas candidatas,
+    aceita as que não criam nó de grau 3 nem ciclo; os fragmentos são ligados pelo extremo mais próximo.
+
+    Com `rng` e `ruido` > 0 cada aresta tem o comprimento multiplicado por 1 + ruido·U(0, 1).
+    Retorna a rota aberta (np.ndarray int32).
+    """
+    n = matriz.shape[0]
+    if n < 3:
+        return np.arange(n, dtype=np.int32)
+    candidatos = np.asarray(candidatos)
+    a = np.repeat(np.arange(n), candidatos.shape[1])
+    b = candidatos.ravel()
+    pares = np.unique(np.minimum(a, b) * n + np.maximum(a, b))
+    a, b = np.divmod(pares, n)
+    d = np.asarray(matriz[a, b], dtype=np.float64)
+    if rng is not None and ruido > 0:
+        d = d * (1 + ruido * rng.random(len(d)))
+
+    pai = list(range(n))
+
+    def raiz(x):
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    ligados = [[] for _ in range(n)]
+    ordem = np.argsort(d, kind='stable')
+    for i, j in zip(a[ordem].tolist(), b[ordem].tolist()):
+        if len(ligados[i]) < 2 and len(ligados[j]) < 2:
+            ri, rj = raiz(i), raiz(j)
+            if ri != rj:
+                pai[ri] = rj
+                ligados[i].append(j)
+                ligados[j].append(i)
+
+    # Percorre cada fragmento (caminho) a partir de um extremo
+    fragmentos = []
+    visto = [False] * n
+    for inicio in range(n):
+        if visto[inicio] or len(ligados[inicio]) == 2:
+            continue
+        caminho = [inicio]
+        visto[inicio] = True
+        anterior, atual = -1, inicio
+        while True:
+            seguintes = [v for v in ligados[atual] if v != anterior]
+            if not seguintes:
+                break
+            anterior, atual = atual, seguintes[0]
+            caminho.append(atual)
+            visto[atual] = True
+        fragmentos.append(caminho)
+
+    # Liga os fragmentos: do fim do caminho atual ao extremo livre mais próximo
+    rota = fragmentos[0]
+    restantes = fragmentos[1:]
+    while restantes:
+        primeiros = np.array([f[0] for f in restantes])
+        ultimos = np.array([f[-1] for f in restantes])
+        atual = rota[-1]
+        d_primeiro = np.asarray(matriz[atual, primeiros], dtype=np.float64)
+        d_ultimo = np.asarray(matriz[atual, ultimos], dtype=np.float64)
+        k = int(np.argmin(np.minimum(d_primeiro, d_ultimo)))
+        fragmento = restantes.pop(k)
+        rota.extend(fragmento if d_primeiro[k] <= d_ultimo[k] else fragmento[::-1])
+    return np.array(rota, dtype=np.int32)
+
+
+def rotas_iniciais(matriz, quantidade, rng, candidatos=None, metodo='vizinho', aleatoriedade=0.1):
+    """`quantidade` rotas heurísticas diversificadas, (quantidade, n) int32, para semear uma população.
+
+    'vizinho': vizinho mais próximo a partir de nós sorteados, trocando o mais próximo por outro
+    candidato com probabilidade `aleatoriedade` a cada passo. 'guloso': heurística gulosa de
+    arestas; a primeira rota é a gulosa exata e as demais usam `aleatoriedade` como ruído.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f'Método {metodo} não suportado')
+    matriz = como_matriz(matriz)
+    n = matriz.shape[0]
+    if candidatos is None and n > 1:
+        candidatos = lista_candidatos(matriz)
+    if quantidade <= 0:
+        return np.empty((0, n), dtype=np.int32)
+    if metodo == 'vizinho':
+        inicios = rng.choice(n, size=quantidade, replace=quantidade > n)
+        return vizinho_lote(matriz, inicios, candidatos, rng, aleatoriedade)
+    return np.array([guloso_arestas(matriz, candidatos, rng, aleatoriedade if i else 0.0)
+                     for i in range(quantidade)], dtype=np.int32)
+
+
+def rota_de_partida(instancia, especificacao):
+    """Rota aberta para partida a quente: caminho de arquivo (ver ler_rota), 'vizinho' (vizinho mais
+    próximo), 'guloso' (guloso_arestas) ou a própria rota em índices.
+    """
+    if isinstance(especificacao, str):
+        if especificacao == 'vizinho':
+            return rota_aberta(vizinho_mais_proximo(instancia.matriz, 0, instancia.candidatos())[0])
+        if especificacao == 'guloso':
+            return guloso_arestas(instancia.matriz, instancia.candidatos())
+        return ler_rota(especificacao, instancia.nos)
+    return rota_aberta(especificacao)
+
+
+def ler_rota(caminho, nos):
+    """Lê uma rota gravada e a converte em índices (np.ndarray int32, aberta) pelos rótulos `nos`.
+
+    Aceita o formato .tour da TSPLIB (TOUR_SECTION terminada por -1), uma lista JSON de rótulos ou
+    rótulos separados por espaços/linhas; um nó inicial repetido no fim é ignorado.
+    """
+    with open(caminho, 'rb') as f:
+        conteudo = f.read()
+    _, secoes = ler_tsp(conteudo)
+    if 'TOUR_SECTION' in secoes:
+        valores = secoes['TOUR_SECTION']
+        fim = np.flatnonzero(valores == -1)
+        lidos = rotulos(valores[:fim[0]] if fim.size else valores)
+    else:
+        texto = conteudo.decode()
+        try:
+            lidos = [str(r) for r in json.loads(texto)]
+        except ValueError:
+            lidos = texto.split()
+    indice = {rotulo: i for i, rotulo in enumerate(nos)}
+    try:
+        rota = rota_aberta([indice[r] for r in lidos])
+    except KeyError as e:
+        raise ValueError(f'Nó {e.args[0]} da rota não existe na instância') from None
+    if len(rota) != len(nos) or len(np.unique(rota)) != len(nos):
+        raise ValueError('A rota não visita cada nó da instância exatamente uma vez')
+    return rota
+
+
+def gravar_rota(caminho, rota, nos, nome='rota', custo=None):
+    """Grava a rota (índices) no formato .tour da TSPLIB, com os rótulos `nos`."""
+    rota = rota_aberta(rota)
+    comentario = f'COMMENT : custo {custo}\n' if custo is not None else ''
+    with open(caminho, 'w') as f:
+        f.write(f'NAME : {nome}\nTYPE : TOUR\n{comentario}DIMENSION : {len(rota)}\nTOUR_SECTION\n')
+        f.write('\n'.join(nos[i] for i in rota.tolist()))
+        f.write('\n-1\nEOF\n')
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import mmap
+import os
+
+import numpy as np
+
+from . import perfil
+from .candidatos import lista_candidatos
+from .distancias import TIPOS, TIPOS_EUCLIDIANOS, OraculoDistancias, matriz_distancias
+from .limites import limite_held_karp
+from .tsplib import abrir_tsp, ler_tsp, matriz_explicita, tabela_nos
+
+# Versão do formato gravado no cache; incrementar invalida os arquivos antigos
+VERSAO_CACHE = 4
+
+# Diretório padrão do cache (pode ser trocado pela variável FLYFOOD_CACHE)
+DIR_CACHE = os.environ.get('FLYFOOD_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'flyfood'))
+
+TIPOS_COORDENADAS = tuple(TIPOS)
+
+# Acima desta dimensão as distâncias são calculadas sob demanda (OraculoDistancias), sem matriz n×n
+LIMITE_DENSO = 4000
+
+
+class Instancia:
+    """Instância TSP compilada: rótulos dos nós, coordenadas e matriz de distâncias."""
+
+    def __init__(self, nome, tipo_distancia, nos, matriz, coordenadas=None, formato=None):
+        self.nome = nome
+        self.tipo_distancia = tipo_distancia
+        self.formato = formato
+        self.nos = nos                  # Rótulos originais dos nós, na ordem do arquivo
+        self.matriz = matriz            # np.ndarray (n, n) float64/int32 ou OraculoDistancias
+        self.coordenadas = coordenadas  # np.ndarray (n, 2) float64 ou None
+        self._candidatos = {}
+        self._limite = None
+
+    @property
+    def dimensao(self):
+        return len(self.nos)
+
+    def candidatos(self, k=10):
+        """Lista de candidatos (k vizinhos mais próximos), calculada uma vez por instância e k."""
+        if k not in self._candidatos:
+            coordenadas = self.coordenadas if self.tipo_distancia in TIPOS_EUCLIDIANOS else None
+            with perfil.fase('candidatos'):
+                self._candidatos[k] = lista_candidatos(self.matriz, k, coordenadas)
+        return self._candidatos[k]
+
+    def limite_inferior(self):
+        """Limite inferior de Held-Karp (flyfood.limites), calculado uma vez por instância."""
+        if self._limite is None:
+            with perfil.fase('limite_inferior'):
+                self._limite = limite_held_karp(self.matriz)
+        return self._limite
+
+    def __repr__(self):
+        return f'Instancia({self.nome!r}, {self.tipo_distancia}, n={self.dimensao})'
+
+
+def instancia_de_coordenadas(coordenadas, tipo='EUC_2D', nome='instancia'):
+    """Instancia a partir de coordenadas (n, 2), com rótulos 1..n; matriz densa até LIMITE_DENSO nós."""
+    coordenadas = np.asarray(coordenadas, dtype=np.float64)
+    if len(coordenadas) <= LIMITE_DENSO:
+        matriz = matriz_distancias(coordenadas, tipo)
+    else:
+        matriz = OraculoDistancias(coordenadas, tipo)
+    return Instancia(nome, tipo, [str(i + 1) for i in range(len(coordenadas))], matriz, coordenadas)
+
+
+def compilar_instancia(conteudo, nome=None):
+    """Converte o conteúdo TSPLIB (bytes, mmap ou str) em uma Instancia com a matriz de distâncias pronta."""
+    with perfil.fase('leitura'):
+        cabecalho, secoes = ler_tsp(conteudo)
+    nome = cabecalho.get('NAME', nome)
+    tipo = cabecalho.get('EDGE_WEIGHT_TYPE', '').replace(' ', '').upper()
+    formato = cabecalho.get('EDGE_WEIGHT_FORMAT', '').replace(' ', '').upper() or None
+    if 'DIMENSION' not in cabecalho:
+        raise ValueError('DIMENSION não encontrado no arquivo TSP')
+    dimensao = int(cabecalho['DIMENSION'])
+
+    if tipo in TIPOS_COORDENADAS:
+        nos, coordenadas = tabela_nos(secoes.get('NODE_COORD_SECTION', np.empty(0)), dimensao)
+        with perfil.fase('matriz'):
+            if dimensao <= LIMITE_DENSO:
+                matriz = matriz_distancias(coordenadas, tipo)
+            else:
+                matriz = OraculoDistancias(coordenadas, tipo)
+    elif tipo == 'EXPLICIT':
+        nos = [str(i + 1) for i in range(dimensao)]
+        coordenadas = None
+        if 'DISPLAY_DATA_SECTION' in secoes:
+            # Coordenadas só para exibição; as distâncias vêm da matriz
+            _, coordenadas = tabela_nos(secoes['DISPLAY_DATA_SECTION'], dimensao, 'DISPLAY_DATA_SECTION')
+        with perfil.fase('matriz'):
+            matriz = matriz_explicita(secoes.get('EDGE_WEIGHT_SECTION', np.empty(0)), dimensao, formato)
+    else:
+        raise ValueError(f'Tipo de peso {tipo} não suportado')
+    return Instancia(nome, tipo, nos, matriz, coordenadas, formato)
+
+
+def _ler_cache(base, nome):
+    with open(base + '.json', 'r') as f:
+        meta = json.load(f)
+    coordenadas = None
+    if meta['coordenadas']:
+        coordenadas = np.load(base + '.coords.npy', mmap_mode='r')
+    if meta['matriz']:
+        matriz = np.load(base + '.npy', mmap_mode='r')
+    else:
+        matriz = OraculoDistancias(coordenadas, meta['tipo'])
+    nome = meta['nome'] if meta['nome'] is not None else nome
+    return Instancia(nome, meta['tipo'], meta['nos'], matriz, coordenadas, meta['formato'])
+
+
+def _gravar_cache(base, instancia):
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    meta = {
+        'nome': instancia.nome,
+        'tipo': instancia.tipo_distancia,
+        'formato': instancia.formato,
+        'nos': list(instancia.nos),
+        'coordenadas': instancia.coordenadas is not None,
+        'matriz': isinstance(instancia.matriz, np.ndarray),  # Oráculos são refeitos a partir das coordenadas
+    }
+    arquivos = [('.npy', instancia.matriz)] if meta['matriz'] else []
+    if instancia.coordenadas is not None:
+        arquivos.append(('.coords.npy', instancia.coordenadas))
+    # Grava em arquivos temporários e renomeia, para que leitores concorrentes nunca vejam um cache parcial
+    temporario = f'.{os.getpid()}.tmp'
+    for sufixo, dados in arquivos:
+        with open(base + sufixo + temporario, 'wb') as f:
+            np.save(f, dados)
+        os.replace(base + sufixo + temporario, base + sufixo)
+    with open(base + '.json' + temporario, 'w') as f:
+        json.dump(meta, f)
+    os.replace(base + '.json' + temporario, base + '.json')
+
+
+def _carregar(bruto, conteudo, nome, cache, dir_cache):
+    if not cache:
+        return compilar_instancia(conteudo, nome)
+
+    chave = hashlib.sha1(bruto).hexdigest()
+    base = os.path.join(dir_cache or DIR_CACHE, f'{chave}-v{VERSAO_CACHE}')
+    if os.path.exists(base + '.json'):
+        try:
+            with perfil.fase('cache'):
+                return _ler_cache(base, nome)
+        except (OSError, ValueError, KeyError):
+            pass  # Cache corrompido: recompila abaixo
+
+    # A chave é só o conteúdo: o nome do arquivo, usado quando falta NAME, não vai para o cache
+    instancia = compilar_instancia(conteudo)
+    try:
+        _gravar_cache(base, instancia)
+    except OSError:
+        pass  # Sem permissão de escrita: segue sem cache
+    if instancia.nome is None:
+        instancia.nome = nome
+    return instancia
+
+
+def carregar_instancia(caminho, cache=True, dir_cache=None):
+    """Lê um arquivo TSP (ou .tsp.gz), reaproveitando a matriz compilada do cache em disco quando possível.
+
+    O arquivo é mapeado em memória e as seções numéricas são decodificadas em bloco. A chave do
+    cache é o hash do conteúdo do arquivo; na releitura a matriz é mapeada em memória.
+    """
+    bruto, conteudo = abrir_tsp(caminho)
+    try:
+        return _carregar(bruto, conteudo, os.path.basename(caminho), cache, dir_cache)
+    finally:
+        if isinstance(bruto, mmap.mmap):
+            bruto.close()
@@ -0,0 +1,136 @@
+"""Limite inferior de Held-Karp (1-árvore com otimização por subgradiente) e solução exata por PD."""
+import math
+
+import numpy as np
+
+from .distancias import OraculoDistancias, como_matriz
+from .vizinho import vizinho_mais_proximo
+
+# Maior instância aceita pela programação dinâmica exata (memória O(2^n · n))
+LIMITE_EXATO = 20
+
+
+def um_arvore(matriz, pi):
+    """1-árvore mínima com custos d[i, j] + pi[i] + pi[j]: AGM (Prim vetorizado) sobre os nós 1..n-1
+    mais as duas arestas mais baratas do nó 0. Retorna o custo e o grau de cada nó.
+    """
+    n = len(pi)
+    graus = np.zeros(n, dtype=np.int64)
+    dentro = np.zeros(n, dtype=bool)
+    dentro[:2] = True  # O nó 0 fica fora da AGM; ela começa pelo nó 1
+    chave = np.full(n, np.inf)
+    pai = np.zeros(n, dtype=np.int64)
+    custo = 0.0
+    atual = 1
+    for _ in range(n - 2):
+        linha = matriz[atual] + (pi[atual] + pi)
+        melhora = ~dentro & (linha < chave)
+        chave[melhora] = linha[melhora]
+        pai[melhora] = atual
+        atual = int(np.argmin(np.where(dentro, np.inf, chave)))
+        custo += chave[atual]
+        graus[atual] += 1
+        graus[pai[atual]] += 1
+        dentro[atual] = True
+
+    linha = matriz[0] + (pi[0] + pi)
+    linha[0] = np.inf
+    a, b = np.argpartition(linha, 1)[:2]
+    custo += linha[a] + linha[b]
+    graus[[0, a, b]] += 1
+    graus[0] += 1
+    return float(custo), graus
+
+
+def _distancias_inteiras(matriz):
+    if isinstance(matriz, OraculoDistancias):
+        return True  # Todos os tipos do oráculo seguem o arredondamento da TSPLIB
+    return np.issubdtype(matriz.dtype, np.integer) or bool(np.all(matriz == np.round(matriz)))
+
+
+def limite_held_karp(matriz, limite_superior=None, max_iter=1000, passo=2.0, paciencia=30):
+    """Limite inferior de Held-Karp: maximiza L(π) = 1-árvore(π) - 2·Σπ por subgradiente.
+
+    O passo é `passo`·(limite_superior - L)/‖g‖², com g = grau - 2, e cai pela metade após
+    `paciencia` iterações sem melhora. Sem `limite_superior` usa o custo do vizinho mais próximo.
+    Cada iteração custa O(n²) em tempo e O(n) em memória extra (linhas lidas sob demanda).
+    """
+    matriz = como_matriz(matriz)
+    n = matriz.shape[0]
+    if n < 3:
+        return float(2 * matriz[0, 1]) if n == 2 else 0.0
+    if limite_superior is None:
+        _, limite_superior = vizinho_mais_proximo(matriz)
+    inteiro = _distancias_inteiras(matriz)
+    pi = np.zeros(n)
+    melhor = -np.inf
+    sem_melhora = 0
+    for _ in range(max_iter):
+        custo, graus = um_arvore(matriz, pi)
+        valor = custo - 2 * pi.sum()
+        if valor > melhor + 1e-9:
+            melhor = valor
+            sem_melhora = 0
+        else:
+            sem_melhora += 1
+            if sem_melhora >= paciencia:
+                passo /= 2
+                sem_melhora = 0
+        g = graus - 2
+        norma = int((g * g).sum())
+        # Para quando a 1-árvore é uma rota (ótimo), o limite encosta no superior ou o passo some
+        if norma == 0 or limite_superior - melhor < (1 - 1e-9 if inteiro else 1e-9) or passo < 1e-4:
+            break
+        pi += passo * (limite_superior - valor) / norma * g
+    return float(math.ceil(melhor - 1e-6)) if inteiro else melhor
+
+
+def held_karp_exato(matriz, max_nos=LIMITE_EXATO):
+    """Rota ótima por programação dinâmica sobre subconjuntos (Held-Karp), vetorizada por camadas.
+
+    Tempo O(2^n · n²) e memória O(2^n · n); limitado a `max_nos` nós.
+    Retorna a rota (índices, começando e terminando no nó 0) e o seu custo.
+    """
+    matriz = como_matriz(matriz)
+    n = matriz.shape[0]
+    if n > max_nos:
+        raise ValueError(f'A solução exata aceita no máximo {max_nos} nós (instância com {n})')
+    if n <= 3:
+        rota = list(range(n)) + [0]
+        return rota, float(sum(matriz[rota[k], rota[k + 1]] for k in range(n))) if n > 1 else 0.0
+    d = np.asarray(matriz[np.arange(n)[:, None], np.arange(n)], dtype=np.float64)
+    m = n - 1  # Nós 1..n-1 ficam nos bits 0..m-1; o nó 0 é a origem
+    mascaras = np.arange(1 << m)
+    contagem = np.zeros(1 << m, dtype=np.int64)
+    for b in range(m):
+        contagem += (mascaras >> b) & 1
+    custo = np.full((1 << m, m), np.inf)
+    anterior = np.full((1 << m, m), -1, dtype=np.int8)
+    custo[1 << np.arange(m), np.arange(m)] = d[0, 1:]
+
+    d_interno = d[1:, 1:]
+    for tamanho in range(2, m + 1):
+        camada = mascaras[contagem == tamanho]
+        for j in range(m):
+            alvo = camada[(camada >> j) & 1 == 1]
+            # custo[S, j] = min_k custo[S - {j}, k] + d[k, j]; k fora de S - {j} já vale infinito
+            parcial = custo[alvo ^ (1 << j)] + d_interno[:, j]
+            k = np.argmin(parcial, axis=1)
+            custo[alvo, j] = parcial[np.arange(len(alvo)), k]
+            anterior[alvo, j] = k
+
+    cheia = (1 << m) - 1
+    total = custo[cheia] + d[1:, 0]
+    j = int(np.argmin(total))
+    rota = []
+    mascara = cheia
+    while j >= 0:
+        rota.append(j + 1)
+        j, mascara = int(anterior[mascara, j]), mascara ^ (1 << j)
+    rota = [0] + rota[::-1] + [0]
+    return rota, float(total.min())
+
+
+def gap(custo, limite):
+    """Distância percentual do custo ao limite inferior."""
+    return 100 * (custo - limite) / limite if limite else float('inf')
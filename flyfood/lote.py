@@ -0,0 +1,329 @@
+"""Muitas instâncias pequenas numa chamada só: uma rota por drone ou entregador, de 10 a 60 pontos.
+
+As instâncias vão empacotadas em coordenadas com preenchimento, (B, N, 2) e os tamanhos (B,), ou
+num arquivo JSONL/NPZ (ver ler_lote). Ordenadas por tamanho, são divididas em blocos que cabem numa
+matriz (b, N, N) e distribuídas entre processos. Em cada bloco o vizinho mais próximo, o 2-opt e a
+colônia de formigas avançam todas as instâncias juntas, passo a passo em NumPy; os demais
+algoritmos de flyfood.solucionadores rodam instância a instância. Os resultados voltam na ordem da
+entrada.
+
+Exemplo:
+    python -m flyfood.lote rotas.jsonl -o resultados.jsonl -a vizinho
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import perfil
+from .aleatorio import gerador
+from .distancias import TIPOS
+
+# Algoritmos vetorizados entre as instâncias do bloco; os outros usam flyfood.solucionadores.resolver
+VETORIZADOS = ('vizinho', 'formigas')
+
+# Instâncias por bloco (cada bloco guarda b matrizes N×N)
+TAMANHO_BLOCO = 256
+
+# Tolerância para aceitar uma melhora do 2-opt
+EPS = 1e-9
+
+
+def empacotar(instancias):
+    """Lista de coordenadas (n_i, 2) -> coordenadas com preenchimento (B, N, 2) e tamanhos (B,)."""
+    tamanhos = np.array([len(c) for c in instancias], dtype=np.int64)
+    coordenadas = np.zeros((len(instancias), max(tamanhos, default=0), 2), dtype=np.float64)
+    for i, c in enumerate(instancias):
+        coordenadas[i, :len(c)] = c
+    return coordenadas, tamanhos
+
+
+def ler_lote(caminho):
+    """Lê um lote de instâncias; retorna coordenadas (B, N, 2), tamanhos (B,) e nomes.
+
+    JSONL: uma instância por linha, {"nome": ..., "coordenadas": [[x, y], ...]} ("nome" opcional).
+    NPZ: arrays 'coordenadas' (B, N, 2) e 'tamanhos' (B,), e opcionalmente 'nomes'.
+    """
+    if caminho.endswith('.npz'):
+        with np.load(caminho) as dados:
+            coordenadas = np.asarray(dados['coordenadas'], dtype=np.float64)
+            tamanhos = np.asarray(dados['tamanhos'], dtype=np.int64)
+            nomes = [str(n) for n in dados['nomes']] if 'nomes' in dados else None
+    else:
+        instancias, nomes = [], []
+        with open(caminho) as f:
+            for linha in f:
+                if linha.strip():
+                    registro = json.loads(linha)
+                    instancias.append(np.asarray(registro['coordenadas'], dtype=np.float64).reshape(-1, 2))
+                    nomes.append(str(registro.get('nome', len(nomes))))
+        coordenadas, tamanhos = empacotar(instancias)
+    if nomes is None:
+        nomes = [str(i) for i in range(len(tamanhos))]
+    return coordenadas, tamanhos, nomes
+
+
+def gravar_lote(caminho, rotas, custos, tamanhos, nomes=None):
+    """Grava um resultado por linha em JSONL: nome, custo e rota (índices, aberta)."""
+    with open(caminho, 'w') as f:
+        for i, (rota, custo, n) in enumerate(zip(rotas, custos, tamanhos)):
+            nome = nomes[i] if nomes is not None else str(i)
+            f.write(json.dumps({'nome': nome, 'custo': custo.item(), 'rota': rota[:n].tolist()}) + '\n')
+
+
+def matrizes_lote(coordenadas, tipo='EUC_2D'):
+    """Matrizes de distâncias (B, N, N) com o arredondamento da TSPLIB."""
+    if tipo not in TIPOS:
+        raise ValueError(f'Tipo de distância {tipo} não suportado')
+    preparo, vetorizada, _ = TIPOS[tipo]
+    pontos = preparo(coordenadas.reshape(-1, 2)).reshape(coordenadas.shape) if preparo else coordenadas
+    x, y = pontos[..., 0], pontos[..., 1]
+    d = vetorizada(x[:, :, None], y[:, :, None], x[:, None, :], y[:, None, :])
+    n = coordenadas.shape[1]
+    d[:, np.arange(n), np.arange(n)] = 0.0
+    return d
+
+
+def custos_lote(matrizes, rotas):
+    """Custo de cada rota do lote; as posições de preenchimento repetem o último nó (aresta nula)."""
+    linhas = np.arange(len(rotas))[:, None]
+    return matrizes[linhas, rotas, np.roll(rotas, -1, axis=1)].sum(axis=1)
+
+
+def vizinho_instancias(matrizes, tamanhos):
+    """Vizinho mais próximo a partir do nó 0 em todas as instâncias ao mesmo tempo; rotas (B, N).
+
+    Os nós de preenchimento começam visitados e, terminada a instância, a rota repete o último nó.
+    """
+    b, n, _ = matrizes.shape
+    linhas = np.arange(b)
+    visitado = np.arange(n)[None, :] >= tamanhos[:, None]
+    rotas = np.zeros((b, n), dtype=np.int64)
+    atual = np.zeros(b, dtype=np.int64)
+    visitado[:, 0] = True
+    for passo in range(1, n):
+        d = np.where(visitado, np.inf, matrizes[linhas, atual])
+        proximo = d.argmin(axis=1)
+        atual = np.where(passo < tamanhos, proximo, atual)
+        rotas[:, passo] = atual
+        visitado[linhas, atual] = True
+    return rotas
+
+
+def dois_opt_instancias(matrizes, rotas, tamanhos):
+    """2-opt de melhor melhora em todas as instâncias juntas; altera `rotas` no lugar.
+
+    A rota com preenchimento é tratada como um ciclo de N posições em que as cópias do último nó
+    formam arestas nulas, nunca removidas; assim a matriz na ordem da rota, P[p, q] = d(r_p, r_q),
+    e a mesma matriz deslocada de uma posição dão todos os movimentos de uma rodada. Cada rodada
+    aplica, do melhor para o pior, os movimentos de trechos disjuntos; a instância sai quando
+    nenhum movimento melhora.
+    """
+    n = rotas.shape[1]
+    posicao = np.arange(n)
+    ativos = np.flatnonzero(tamanhos >= 4)
+    base = (posicao[:, None] + 1 < posicao[None, :]) & ~((posicao[:, None] == 0) & (posicao[None, :] == n - 1))
+    while ativos.size:
+        r = rotas[ativos]
+        ordenada = matrizes[ativos[:, None, None], r[:, :, None], r[:, None, :]]
+        seguinte = np.roll(ordenada, -1, axis=2)
+        d_ab = np.diagonal(seguinte, axis1=1, axis2=2)
+        delta = ordenada + np.roll(seguinte, -1, axis=1)
+        delta -= d_ab[:, :, None]
+        delta -= d_ab[:, None, :]
+        nula = r == np.roll(r, -1, axis=1)
+        delta[~base | nula[:, :, None] | nula[:, None, :]] = 0.0
+        # Melhor par de cada aresta i; movimentos com trechos disjuntos não interferem entre si
+        destino = delta.argmin(axis=2)
+        ganho = np.take_along_axis(delta, destino[:, :, None], axis=2)[:, :, 0]
+        linhas = np.arange(len(ativos))
+        melhora = ganho.min(axis=1) < -EPS
+        while True:
+            i = ganho.argmin(axis=1)
+            aceito = ganho[linhas, i] < -EPS
+            if not aceito.any():
+                break
+            j = destino[linhas, i]
+            for k, a, b in zip(ativos[aceito].tolist(), i[aceito].tolist(), j[aceito].tolist()):
+                rotas[k, a + 1:b + 1] = rotas[k, a + 1:b + 1][::-1]
+            perfil.contar('movimentos_2opt', int(aceito.sum()))
+            # Descarta os movimentos que se sobrepõem ao aplicado
+            sobrepoe = ~((destino < i[:, None]) | (posicao[None, :] > j[:, None])) & aceito[:, None]
+            ganho[sobrepoe] = 0.0
+        ativos = ativos[melhora]
+
+    # As cópias do último nó podem ter ido para o meio: fica a primeira de cada bloco e o preenchimento
+    # volta para o fim, repetindo o novo último nó
+    copia = rotas == np.roll(rotas, 1, axis=1)
+    copia[:, 0] &= tamanhos > 1
+    ordem = np.argsort(copia, axis=1, kind='stable')
+    rotas[:] = np.take_along_axis(rotas, ordem, axis=1)
+    fim = np.maximum(tamanhos, 1)[:, None] - 1
+    rotas[:] = np.where(posicao[None, :] > fim, np.take_along_axis(rotas, fim, axis=1), rotas)
+    return rotas
+
+
+def formigas_instancias(matrizes, tamanhos, rng, num_formigas=10, max_iter=20, alfa=1, beta=2, rho=0.5, Q=100):
+    """Sistema de formigas (regra 'as' de flyfood.formigas) em todas as instâncias ao mesmo tempo.
+
+    Cada instância tem sua matriz de feromônios; as formigas de todas as instâncias são construídas
+    juntas, uma roleta por passo. Retorna a melhor rota de cada instância (B, N).
+    """
+    b, n, _ = matrizes.shape
+    real = np.arange(n)[None, :] < tamanhos[:, None]
+    par = real[:, :, None] & real[:, None, :]
+    media = (matrizes * par).sum(axis=(1, 2)) / np.maximum(tamanhos, 1) ** 2
+    feromonios = np.where(par, (1 / (np.maximum(tamanhos, 1) * np.maximum(media, EPS)))[:, None, None], 0.0)
+    with np.errstate(divide='ignore'):
+        heuristica = np.where(par & (matrizes > 0), (1 / matrizes) ** beta, 0.0)
+
+    instancia = np.repeat(np.arange(b), num_formigas)
+    tamanho = tamanhos[instancia]
+    linhas = np.arange(len(instancia))
+    melhor_rota = np.zeros((b, n), dtype=np.int64)
+    melhor_custo = np.full(b, np.inf)
+    for _ in range(max_iter):
+        with perfil.fase('atratividade'):
+            atratividade = feromonios ** alfa * heuristica
+        with perfil.fase('construcao'):
+            livres = real[instancia].copy()
+            rotas = np.zeros((len(instancia), n), dtype=np.int64)
+            atual = np.zeros(len(instancia), dtype=np.int64)
+            livres[:, 0] = False
+            for passo in range(1, n):
+                pesos = atratividade[instancia, atual]
+                pesos *= livres
+                acumulado = np.cumsum(pesos, axis=1)
+                sem_peso = acumulado[:, -1] <= 0
+                if sem_peso.any():
+                    acumulado[sem_peso] = np.cumsum(livres[sem_peso], axis=1)  # Sorteio uniforme entre os livres
+                # Limiar abaixo do total, que pode ser subnormal com α alto (ver flyfood.formigas._limiar)
+                r = np.minimum(rng.random(len(instancia)) * acumulado[:, -1], np.nextafter(acumulado[:, -1], 0))
+                proximo = (acumulado <= r[:, None]).argmin(axis=1)  # Primeira posição acima do sorteio
+                atual = np.where(passo < tamanho, proximo, atual)
+                rotas[:, passo] = atual
+                livres[linhas, atual] = False
+        with perfil.fase('avaliacao'):
+            custos = matrizes[instancia[:, None], rotas, np.roll(rotas, -1, axis=1)].sum(axis=1).reshape(b, num_formigas)
+        k = custos.argmin(axis=1)
+        melhorou = custos[np.arange(b), k] < melhor_custo
+        melhor_custo[melhorou] = custos[np.arange(b), k][melhorou]
+        melhor_rota[melhorou] = rotas.reshape(b, num_formigas, n)[np.arange(b), k][melhorou]
+        with perfil.fase('feromonio'):
+            feromonios *= 1 - rho
+            seguinte = np.roll(rotas, -1, axis=1)
+            # Instâncias de custo zero (um nó ou pontos repetidos) não depositam
+            deposito = np.divide(Q, custos.ravel(), out=np.zeros(custos.size), where=custos.ravel() > 0)
+            deposito = np.repeat(deposito, n)
+            np.add.at(feromonios, (np.repeat(instancia, n), rotas.ravel(), seguinte.ravel()), deposito)
+            np.add.at(feromonios, (np.repeat(instancia, n), seguinte.ravel(), rotas.ravel()), deposito)
+            feromonios[~par] = 0.0
+    return melhor_rota
+
+
+def _resolver_individual(coordenadas, tamanhos, tipo, algoritmo, rng, parametros):
+    from .instancia import instancia_de_coordenadas
+    from .solucionadores import resolver
+
+    rotas = np.zeros((len(tamanhos), coordenadas.shape[1]), dtype=np.int64)
+    for i, (n, semente) in enumerate(zip(tamanhos.tolist(), rng.spawn(len(tamanhos)))):
+        if n >= 4:
+            rota, _ = resolver(instancia_de_coordenadas(coordenadas[i, :n], tipo), algoritmo, semente=semente,
+                               **parametros)
+            rotas[i, :n] = rota[:-1]
+        else:
+            rotas[i, :n] = np.arange(n)
+        rotas[i, n:] = rotas[i, n - 1] if n else 0
+    return rotas
+
+
+def resolver_bloco(tarefa):
+    """Resolve um bloco (coordenadas, tamanhos, tipo, algoritmo, rng, busca_local, parâmetros).
+
+    Retorna as rotas (b, N) e os custos (b,).
+    """
+    coordenadas, tamanhos, tipo, algoritmo, rng, busca_local, parametros = tarefa
+    matrizes = matrizes_lote(coordenadas, tipo)
+    if algoritmo not in VETORIZADOS:
+        rotas = _resolver_individual(coordenadas, tamanhos, tipo, algoritmo, rng, parametros)
+    elif algoritmo == 'vizinho':
+        with perfil.fase('construcao'):
+            rotas = vizinho_instancias(matrizes, tamanhos)
+    else:
+        rotas = formigas_instancias(matrizes, tamanhos, rng, **parametros)
+    if busca_local:
+        with perfil.fase('busca_local'):
+            dois_opt_instancias(matrizes, rotas, tamanhos)
+    return rotas, custos_lote(matrizes, rotas)
+
+
+def resolver_lote(coordenadas, tamanhos=None, algoritmo='vizinho', tipo='EUC_2D', busca_local=True, processos=None,
+                  tamanho_bloco=TAMANHO_BLOCO, rng=None, **parametros):
+    """Resolve um lote de instâncias pequenas; retorna rotas (B, N) e custos (B,) na ordem da entrada.
+
+    `coordenadas` é (B, N, 2) com preenchimento e `tamanhos` o número de nós de cada instância, uma
+    lista de coordenadas (n_i, 2) ou o caminho de um arquivo JSONL/NPZ. As rotas são abertas, em
+    índices, e as posições além do tamanho ficam com -1. Com `busca_local` cada rota passa por 2-opt.
+    Os blocos são divididos entre `processos` (padrão: todos os núcleos); cada bloco recebe seu
+    fluxo aleatório de `rng`, então o resultado não depende do número de processos.
+    """
+    if isinstance(coordenadas, str):
+        coordenadas, tamanhos, _ = ler_lote(coordenadas)
+    elif tamanhos is None:
+        coordenadas, tamanhos = empacotar(coordenadas)
+    coordenadas = np.asarray(coordenadas, dtype=np.float64)
+    tamanhos = np.asarray(tamanhos, dtype=np.int64)
+    rng = gerador(rng)
+
+    # Instâncias de tamanho parecido no mesmo bloco, cada bloco com o preenchimento do seu maior
+    ordem = np.argsort(tamanhos, kind='stable')
+    blocos = [ordem[i:i + tamanho_bloco] for i in range(0, len(ordem), tamanho_bloco)]
+    tarefas = []
+    for bloco, fluxo in zip(blocos, rng.spawn(len(blocos))):
+        largura = max(int(tamanhos[bloco].max()), 1)
+        tarefas.append((coordenadas[bloco, :largura], tamanhos[bloco], tipo, algoritmo, fluxo, busca_local, parametros))
+
+    processos = min(processos or os.cpu_count() or 1, len(tarefas))
+    if processos > 1:
+        with ProcessPoolExecutor(processos) as executor:
+            resultados = list(executor.map(resolver_bloco, tarefas))
+    else:
+        resultados = [resolver_bloco(t) for t in tarefas]
+
+    rotas = np.full((len(tamanhos), coordenadas.shape[1]), -1, dtype=np.int64)
+    custos = np.zeros(len(tamanhos))
+    for bloco, (r, c) in zip(blocos, resultados):
+        rotas[bloco, :r.shape[1]] = r
+        custos[bloco] = c
+    rotas[np.arange(rotas.shape[1])[None, :] >= tamanhos[:, None]] = -1
+    return rotas, custos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resolve um lote de instâncias TSP pequenas.')
+    parser.add_argument('entrada', help='arquivo .jsonl ou .npz com as instâncias')
+    parser.add_argument('-o', '--saida', help='arquivo .jsonl de resultados (padrão: saída padrão)')
+    parser.add_argument('-a', '--algoritmo', default='vizinho')
+    parser.add_argument('-t', '--tipo', default='EUC_2D', choices=list(TIPOS), help='tipo de distância TSPLIB')
+    parser.add_argument('-p', '--parametros', default='{}', help='JSON com os parâmetros do algoritmo')
+    parser.add_argument('-s', '--semente', type=int)
+    parser.add_argument('-j', '--processos', type=int, help='número de processos (padrão: todos os núcleos)')
+    parser.add_argument('--sem-busca-local', action='store_true', help='não aplica 2-opt às rotas')
+    args = parser.parse_args(argv)
+
+    coordenadas, tamanhos, nomes = ler_lote(args.entrada)
+    inicio = time.perf_counter()
+    rotas, custos = resolver_lote(coordenadas, tamanhos, args.algoritmo, args.tipo, not args.sem_busca_local,
+                                  args.processos, rng=args.semente, **json.loads(args.parametros))
+    decorrido = time.perf_counter() - inicio
+    gravar_lote(args.saida or '/dev/stdout', rotas, custos, tamanhos, nomes)
+    print(f'{len(tamanhos)} instâncias em {decorrido:.2f} s ({len(tamanhos) / max(decorrido, 1e-9):.0f} por segundo)',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Instrumentação por fase: tempo (perf_counter_ns) e contadores de cada execução, exportados em JSON.
+
+Desligada por padrão: `fase()` devolve um contexto vazio compartilhado e `contar()` retorna de
+imediato, então o custo nos laços é o de uma chamada de função. Liga dentro de `execucao()`,
+automaticamente quando FLYFOOD_PERFIL aponta para um diretório (um rastro JSON por execução).
+"""
+import contextlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+ATIVO = False
+
+_fases = {}  # nome -> [nanossegundos, chamadas]
+_contadores = {}
+_NULO = contextlib.nullcontext()
+
+
+class _Fase:
+    __slots__ = ('nome', 'inicio')
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        decorrido = time.perf_counter_ns() - self.inicio
+        total = _fases.get(self.nome)
+        if total is None:
+            _fases[self.nome] = [decorrido, 1]
+        else:
+            total[0] += decorrido
+            total[1] += 1
+
+
+def fase(nome):
+    """Contexto que soma o tempo do bloco à fase `nome` (vazio quando a instrumentação está desligada)."""
+    return _Fase(nome) if ATIVO else _NULO
+
+
+def contar(nome, quantidade=1):
+    if ATIVO:
+        _contadores[nome] = _contadores.get(nome, 0) + quantidade
+
+
+def ativar(ativo=True):
+    global ATIVO
+    ATIVO = ativo
+
+
+def reiniciar():
+    _fases.clear()
+    _contadores.clear()
+
+
+def coletar():
+    """Fases ({nome: {'ns', 'chamadas'}}) e contadores acumulados desde o último reinício."""
+    return {
+        'fases': {nome: {'ns': ns, 'chamadas': chamadas} for nome, (ns, chamadas) in _fases.items()},
+        'contadores': dict(_contadores),
+    }
+
+
+def mesclar(dados):
+    """Soma ao registro atual o que `coletar()` devolveu em outro processo (ex.: uma ilha)."""
+    for nome, valores in dados['fases'].items():
+        total = _fases.setdefault(nome, [0, 0])
+        total[0] += valores['ns']
+        total[1] += valores['chamadas']
+    for nome, quantidade in dados['contadores'].items():
+        _contadores[nome] = _contadores.get(nome, 0) + quantidade
+
+
+def gravar(rastro, diretorio):
+    """Grava o rastro em `diretorio` como <rotulo>-<data>-<pid>.json e retorna o caminho."""
+    os.makedirs(diretorio, exist_ok=True)
+    data = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    caminho = os.path.join(diretorio, f"{rastro['rotulo']}-{data}-{os.getpid()}.json")
+    with open(caminho, 'w') as f:
+        json.dump(rastro, f, indent=1)
+    return caminho
+
+
+@contextlib.contextmanager
+def execucao(rotulo, ativo=None, diretorio=None, **meta):
+    """Instrumenta o bloco e produz o rastro da execução (um dict, ou None quando desligada).
+
+    `diretorio` (padrão: FLYFOOD_PERFIL) recebe o rastro em JSON, cujo caminho fica em
+    rastro['arquivo']; `ativo` força ligar ou desligar independentemente do diretório.
+    `meta` é copiado para o rastro (instância, algoritmo, parâmetros, semente...).
+    """
+    diretorio = diretorio or os.environ.get('FLYFOOD_PERFIL') or None
+    if not (ativo if ativo is not None else diretorio is not None):
+        yield None
+        return
+    anterior = ATIVO
+    rastro = {'rotulo': rotulo, 'inicio': datetime.now(timezone.utc).isoformat(), 'pid': os.getpid(), **meta}
+    reiniciar()
+    ativar()
+    inicio = time.perf_counter_ns()
+    try:
+        yield rastro
+    finally:
+        rastro['total_ns'] = time.perf_counter_ns() - inicio
+        rastro.update(coletar())
+        ativar(anterior)
+        reiniciar()
+        if diretorio is not None:
+            rastro['arquivo'] = gravar(rastro, diretorio)
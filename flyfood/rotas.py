@@ -0,0 +1,17 @@
+import numpy as np
+
+from . import acelerado
+
+
+def custo_rotas(matriz, rotas):
+    """Custo de cada rota (fechando o ciclo) numa única operação de gather e soma.
+
+    `rotas` pode ser uma rota (n,) ou um lote de rotas (P, n) de índices. A soma é sequencial
+    (cumsum), na mesma ordem do núcleo compilado de flyfood.acelerado.
+    """
+    rotas = np.asarray(rotas)
+    if acelerado.usar(matriz) and rotas.ndim == 2:
+        matriz = np.asarray(matriz)
+        tipo = np.int64 if np.issubdtype(matriz.dtype, np.integer) else np.float64
+        return acelerado.custo_rotas(matriz, rotas, np.empty(len(rotas), dtype=tipo))
+    return np.cumsum(matriz[rotas, np.roll(rotas, -1, axis=-1)], axis=-1)[..., -1]
@@ -0,0 +1,263 @@
+"""Serviço local assíncrono: recebe pedidos de rota e os resolve num pool de processos.
+
+Protocolo: uma linha JSON por pedido, por TCP (ou socket Unix), e uma linha JSON por resposta, na
+ordem em que ficam prontas (o campo "id" do pedido volta na resposta):
+
+    {"id": 1, "instancia": "tsp/berlin52.tsp", "algoritmo": "formigas", "semente": 0,
+     "parametros": {"max_iter": 50}}
+
+"instancia" é o caminho de um arquivo TSPLIB, {"tsplib": "<conteúdo>"} ou
+{"coordenadas": [[x, y], ...], "tipo": "EUC_2D"}. {"estatisticas": true} devolve os contadores.
+
+Cada processo do pool mantém um cache LRU das instâncias compiladas, identificadas pelo hash do
+conteúdo, e o serviço guarda o hash de cada arquivo (por caminho, tamanho e data de modificação).
+Pedidos iguais em andamento são atendidos por uma única execução, e os resultados de pedidos com
+semente e sem tempo limite (determinísticos) ficam memorizados num LRU.
+
+Exemplo:
+    python -m flyfood.servico --porta 8765 -j 4
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Instâncias compiladas mantidas por processo do pool
+TAMANHO_CACHE = 32
+
+# Resultados memorizados (pedidos com semente e sem tempo limite)
+TAMANHO_MEMO = 1024
+
+
+class LRU(OrderedDict):
+    """Dicionário limitado a `capacidade` itens; o menos usado recentemente sai primeiro."""
+
+    def __init__(self, capacidade):
+        super().__init__()
+        self.capacidade = capacidade
+
+    def obter(self, chave):
+        valor = self.get(chave)
+        if valor is not None:
+            self.move_to_end(chave)
+        return valor
+
+    def guardar(self, chave, valor):
+        self[chave] = valor
+        self.move_to_end(chave)
+        while len(self) > self.capacidade:
+            self.popitem(last=False)
+
+
+# Cache de instâncias do processo do pool, criado pelo inicializador
+_instancias = LRU(TAMANHO_CACHE)
+
+
+def _inicializar(tamanho_cache):
+    _instancias.capacidade = tamanho_cache
+
+
+def _instancia(chave, fonte):
+    instancia = _instancias.obter(chave)
+    if instancia is None:
+        tipo, dados = fonte
+        if tipo == 'arquivo':
+            from .instancia import carregar_instancia
+
+            instancia = carregar_instancia(dados)
+        elif tipo == 'tsplib':
+            from .instancia import compilar_instancia
+
+            instancia = compilar_instancia(dados.encode())
+        else:
+            from .instancia import instancia_de_coordenadas
+
+            instancia = instancia_de_coordenadas(*dados)
+        instancia.candidatos()
+        _instancias.guardar(chave, instancia)
+    return instancia
+
+
+def _hash_arquivo(caminho, bloco=1 << 20):
+    sha1 = hashlib.sha1()
+    with open(caminho, 'rb') as f:
+        while dados := f.read(bloco):
+            sha1.update(dados)
+    return sha1.hexdigest()
+
+
+def _hash_texto(texto):
+    return hashlib.sha1(texto.encode()).hexdigest()
+
+
+def _resolver(chave, fonte, algoritmo, semente, parametros):
+    from .controle import Controle
+    from .solucionadores import resolver
+
+    instancia = _instancia(chave, fonte)
+    parametros = dict(parametros)
+    controle = Controle(tempo_limite=parametros.pop('tempo_limite', None),
+                        sem_melhora=parametros.pop('sem_melhora', None))
+    inicio = time.perf_counter()
+    rota, custo = resolver(instancia, algoritmo, semente, controle=controle, **parametros)
+    return {
+        'nome': instancia.nome,
+        'custo': custo,
+        'rota': [int(c) for c in rota],
+        'semente': controle.semente,
+        'tempo_ms': round((time.perf_counter() - inicio) * 1000, 3),
+    }
+
+
+class Servico:
+    """Resolve pedidos num pool de `processos` processos, com cache de instâncias, coalescência e memória.
+
+    Use `await servico.resolver(...)` de dentro de um loop asyncio e `fechar()` (ou `async with`) ao fim.
+    """
+
+    def __init__(self, processos=None, tamanho_cache=TAMANHO_CACHE, tamanho_memo=TAMANHO_MEMO):
+        self.executor = ProcessPoolExecutor(processos, initializer=_inicializar, initargs=(tamanho_cache,))
+        self.chaves = LRU(tamanho_cache * 4)  # (caminho, tamanho, mtime) -> hash do conteúdo
+        self.memo = LRU(tamanho_memo)
+        self.andamento = {}
+        self.estatisticas = {'pedidos': 0, 'execucoes': 0, 'memorizados': 0, 'coalescidos': 0, 'erros': 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        # O shutdown espera os processos terminarem; numa thread, o loop segue atendendo
+        await asyncio.to_thread(self.fechar)
+
+    def fechar(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def _fonte(self, instancia):
+        """Chave (hash do conteúdo) e fonte da instância, como o processo do pool vai lê-la.
+
+        A leitura e o hash rodam numa thread, para não travar os outros clientes com arquivos grandes.
+        """
+        if isinstance(instancia, str):
+            caminho = os.path.abspath(instancia)
+            estado = await asyncio.to_thread(os.stat, caminho)
+            assinatura = (caminho, estado.st_size, estado.st_mtime_ns)
+            chave = self.chaves.obter(assinatura)
+            if chave is None:
+                chave = await asyncio.to_thread(_hash_arquivo, caminho)
+                self.chaves.guardar(assinatura, chave)
+            return chave, ('arquivo', caminho)
+        if 'tsplib' in instancia:
+            chave = await asyncio.to_thread(_hash_texto, instancia['tsplib'])
+            return chave, ('tsplib', instancia['tsplib'])
+        coordenadas, tipo = instancia['coordenadas'], instancia.get('tipo', 'EUC_2D')
+        chave = await asyncio.to_thread(_hash_texto, json.dumps([tipo, coordenadas]))
+        return chave, ('coordenadas', (coordenadas, tipo))
+
+    async def resolver(self, instancia, algoritmo='vizinho', semente=None, **parametros):
+        """Rota e custo da instância (ver o protocolo no topo do módulo); 'origem' diz se veio da memória,
+        de outro pedido igual em andamento ou de uma execução nova.
+        """
+        self.estatisticas['pedidos'] += 1
+        chave, fonte = await self._fonte(instancia)
+        pedido = (chave, algoritmo, semente, json.dumps(parametros, sort_keys=True))
+        # Com tempo limite o resultado depende da máquina e da carga, mesmo com semente
+        memorizavel = semente is not None and parametros.get('tempo_limite') is None
+        if memorizavel and (resultado := self.memo.obter(pedido)) is not None:
+            self.estatisticas['memorizados'] += 1
+            return dict(resultado, origem='memoria')
+        if pedido in self.andamento:
+            self.estatisticas['coalescidos'] += 1
+            return dict(await asyncio.shield(self.andamento[pedido]), origem='coalescido')
+
+        loop = asyncio.get_running_loop()
+        futuro = loop.run_in_executor(self.executor, _resolver, chave, fonte, algoritmo, semente, parametros)
+        self.andamento[pedido] = futuro
+        try:
+            resultado = await asyncio.shield(futuro)
+        finally:
+            del self.andamento[pedido]
+        self.estatisticas['execucoes'] += 1
+        if memorizavel:
+            self.memo.guardar(pedido, resultado)
+        return dict(resultado, origem='execucao')
+
+    async def atender(self, pedido):
+        """Resposta (dict) para um pedido do protocolo em JSON já decodificado."""
+        resposta = {'id': pedido.get('id')}
+        try:
+            if pedido.get('estatisticas'):
+                resposta.update(self.estatisticas, arquivos=len(self.chaves), memoria=len(self.memo))
+            else:
+                resposta.update(await self.resolver(pedido['instancia'], pedido.get('algoritmo', 'vizinho'),
+                                                    pedido.get('semente'), **pedido.get('parametros', {})))
+        except Exception as e:  # O erro vai na resposta; a conexão continua
+            self.estatisticas['erros'] += 1
+            resposta['erro'] = f'{type(e).__name__}: {e}'
+        return resposta
+
+    async def conexao(self, leitor, escritor):
+        """Atende uma conexão: cada linha vira uma tarefa, e as respostas saem conforme terminam."""
+        tarefas = set()
+
+        async def responder(linha):
+            try:
+                resposta = await self.atender(json.loads(linha))
+            except ValueError as e:
+                resposta = {'id': None, 'erro': f'JSON inválido: {e}'}
+            escritor.write(json.dumps(resposta).encode() + b'\n')
+            await escritor.drain()
+
+        try:
+            while linha := await leitor.readline():
+                if linha.strip():
+                    tarefa = asyncio.create_task(responder(linha))
+                    tarefas.add(tarefa)
+                    tarefa.add_done_callback(tarefas.discard)
+            if tarefas:
+                await asyncio.gather(*tarefas, return_exceptions=True)
+        finally:
+            escritor.close()
+
+
+async def servir(host='127.0.0.1', porta=8765, unix=None, processos=None, tamanho_cache=TAMANHO_CACHE,
+                 tamanho_memo=TAMANHO_MEMO):
+    """Sobe o serviço e atende até ser interrompido."""
+    async with Servico(processos, tamanho_cache, tamanho_memo) as servico:
+        if unix:
+            if os.path.exists(unix):
+                os.unlink(unix)  # Socket deixado por uma execução anterior
+            servidor = await asyncio.start_unix_server(servico.conexao, unix)
+        else:
+            servidor = await asyncio.start_server(servico.conexao, host, porta)
+        enderecos = unix or ', '.join(str(s.getsockname()) for s in servidor.sockets)
+        print(f'FlyFood atendendo em {enderecos}', file=sys.stderr, flush=True)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            if unix and os.path.exists(unix):
+                os.unlink(unix)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serviço local de rotas TSP (uma linha JSON por pedido).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--unix', metavar='CAMINHO', help='atende num socket Unix em vez de TCP')
+    parser.add_argument('-j', '--processos', type=int, help='processos do pool (padrão: todos os núcleos)')
+    parser.add_argument('--cache', type=int, default=TAMANHO_CACHE, help='instâncias em cache por processo')
+    parser.add_argument('--memo', type=int, default=TAMANHO_MEMO, help='resultados memorizados')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.porta, args.unix, args.processos, args.cache, args.memo))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
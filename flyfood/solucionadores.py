@@ -0,0 +1,156 @@
+from . import formigas, genetico, limites, perfil
+from .aleatorio import gerador, nova_semente
+from .busca_local import busca_local as aplicar_busca_local
+from .controle import Controle, acompanhar
+from .inicial import rota_de_partida
+from .vizinho import vizinho_mais_proximo, vizinho_multiplo
+
+
+def _registrar(controle, rota, custo):
+    if controle is not None:
+        controle.registrar(custo, rota[:-1])
+    return rota, custo
+
+
+def resolver_vizinho(instancia, rng, inicio=0, num_candidatos=10, busca_local=False, inicios=None, processos=None,
+                     controle=None):
+    """Vizinho mais próximo a partir de `inicio`, opcionalmente refinado por busca local.
+
+    Com `inicios` (número de inícios, lista de nós ou 'todos') fica a melhor rota entre vários
+    nós iniciais, divididos entre `processos` (flyfood.vizinho.vizinho_multiplo).
+    """
+    candidatos = instancia.candidatos(num_candidatos) if num_candidatos else None
+    with perfil.fase('construcao'):
+        if inicios is None:
+            rota, custo = vizinho_mais_proximo(instancia.matriz, inicio, candidatos)
+        else:
+            rota, custo = vizinho_multiplo(instancia.matriz, None if inicios == 'todos' else inicios, candidatos,
+                                           processos)
+    rota, custo = _registrar(controle, rota, custo)
+    if busca_local:
+        rota, custo = _registrar(controle, *aplicar_busca_local(rota, instancia.matriz, candidatos))
+    return rota, custo
+
+
+def _partida_ga(instancia, parametros):
+    # Rota inicial como primeira linha da população e candidatos da instância para a semeadura
+    rota_inicial = parametros.pop('rota_inicial', None)
+    if rota_inicial is not None:
+        parametros['rotas_iniciais'] = rota_de_partida(instancia, rota_inicial)[None]
+    if parametros.get('semear'):
+        parametros.setdefault('candidatos', instancia.candidatos())
+    return parametros
+
+
+def resolver_genetico(instancia, rng, busca_local=False, controle=None, **parametros):
+    """Algoritmo genético; com `busca_local` a melhor rota final passa por 2-opt/Or-opt.
+
+    `rota_inicial` (ver flyfood.inicial.rota_de_partida) e `semear` (fração da população com rotas heurísticas)
+    dão a partida a quente.
+    """
+    parametros = _partida_ga(instancia, parametros)
+    custo, rota = genetico.alg_genetico(instancia.matriz, rng=rng, controle=controle, **parametros)[0]
+    rota.append(rota[0])
+    if busca_local:
+        rota, custo = _registrar(controle, *aplicar_busca_local(rota, instancia.matriz, instancia.candidatos()))
+    return rota, custo
+
+
+def resolver_ilhas(instancia, rng, busca_local=False, controle=None, **parametros):
+    """Algoritmo genético em modelo de ilhas (um processo por ilha), com a partida a quente do genético.
+
+    O orçamento de gerações aceita o mesmo nome do genético, `criterio_de_parada`, ou `max_geracoes`.
+    """
+    from . import ilhas  # Só importa multiprocessing quando as ilhas são usadas
+
+    if 'criterio_de_parada' in parametros:
+        if 'max_geracoes' in parametros:
+            raise TypeError('Use criterio_de_parada ou max_geracoes, não os dois')
+        parametros['max_geracoes'] = parametros.pop('criterio_de_parada')
+    parametros = _partida_ga(instancia, parametros)
+    custo, rota = ilhas.ga_ilhas(instancia.matriz, rng=rng, controle=controle, **parametros)[0]
+    rota.append(rota[0])
+    if busca_local:
+        rota, custo = _registrar(controle, *aplicar_busca_local(rota, instancia.matriz, instancia.candidatos()))
+    return rota, custo
+
+
+def resolver_formigas(instancia, rng, num_candidatos=15, rota_inicial=None, **parametros):
+    """Colônia de formigas com lista de candidatos; `rota_inicial` (ver flyfood.inicial.rota_de_partida)
+    inicia os feromônios.
+    """
+    candidatos = instancia.candidatos(num_candidatos) if num_candidatos else None
+    if rota_inicial is not None:
+        rota_inicial = rota_de_partida(instancia, rota_inicial)
+    return formigas.colonia_de_formigas(instancia.matriz, rng=rng, candidatos=candidatos, rota_inicial=rota_inicial,
+                                        **parametros)
+
+
+def resolver_exato(instancia, rng, controle=None):
+    """Rota ótima por programação dinâmica (até flyfood.limites.LIMITE_EXATO nós)."""
+    return _registrar(controle, *limites.held_karp_exato(instancia.matriz))
+
+
+def resolver_decomposicao(instancia, rng, controle=None, **parametros):
+    """Partição em grupos resolvidos em paralelo por `subalgoritmo` e costura (flyfood.decomposicao),
+    para instâncias grandes demais para os outros algoritmos.
+    """
+    from . import decomposicao
+
+    return _registrar(controle, *decomposicao.decompor(instancia, rng=rng, **parametros))
+
+
+# Algoritmos disponíveis, todos com a assinatura (instancia, rng, controle=None, **parametros) -> (rota, custo)
+ALGORITMOS = {
+    'vizinho': resolver_vizinho,
+    'genetico': resolver_genetico,
+    'ilhas': resolver_ilhas,
+    'formigas': resolver_formigas,
+    'exato': resolver_exato,
+    'decomposicao': resolver_decomposicao,
+}
+
+# Algoritmos que consultam o controle a cada iteração (e aceitam `custo_alvo`) para parar antes do fim do orçamento
+ITERATIVOS = ('genetico', 'ilhas', 'formigas')
+
+
+def resolver(instancia, algoritmo, semente=None, gap_alvo=None, controle=None, tempo_limite=None, sem_melhora=None,
+             **parametros):
+    """Resolve a instância com o algoritmo escolhido; retorna a rota fechada (índices) e o custo.
+
+    Com `gap_alvo` (%) os algoritmos iterativos param assim que o custo fica no máximo esse
+    percentual acima do limite inferior de Held-Karp da instância (pelo controle, com motivo 'alvo'); nos
+    demais ele é recusado com ValueError. `controle`
+    (flyfood.controle.Controle) acrescenta tempo limite, estagnação e aviso de cada nova melhor rota;
+    `tempo_limite` (segundos) e `sem_melhora` (iterações) criam esse controle quando ele não é passado.
+    Sem `semente` uma nova é sorteada e guardada em `controle.semente`, para repetir a execução.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f'Algoritmo {algoritmo} não suportado')
+    if tempo_limite is not None or sem_melhora is not None:
+        if controle is not None:
+            raise ValueError('Use tempo_limite/sem_melhora do próprio controle')
+        controle = Controle(tempo_limite=tempo_limite, sem_melhora=sem_melhora)
+    if gap_alvo is not None and algoritmo not in ITERATIVOS:
+        raise ValueError(f"gap_alvo só vale para {', '.join(ITERATIVOS)}; {algoritmo} não é iterativo")
+    if gap_alvo is not None:
+        # O controle para com motivo 'alvo' e registra a melhora que atingiu o gap
+        controle = controle if controle is not None else Controle()
+        controle.gap_alvo = gap_alvo
+    if controle is not None and controle.gap_alvo is not None and controle.limite_inferior is None:
+        controle.limite_inferior = instancia.limite_inferior()
+    if semente is None:
+        semente = nova_semente()
+    if controle is not None:
+        controle.semente = semente
+    return ALGORITMOS[algoritmo](instancia, gerador(semente), controle=controle, **parametros)
+
+
+def melhorias(instancia, algoritmo, semente=None, controle=None, **parametros):
+    """Gera cada nova melhor rota (flyfood.controle.Melhoria) assim que o algoritmo a encontra.
+
+    Passe um `controle` para definir os critérios de parada e, ao fim, ler `controle.resultado`
+    ((rota, custo), como em resolver) e `controle.motivo` (None quando o orçamento de iterações acabou).
+    """
+    controle = controle if controle is not None else Controle()
+    yield from acompanhar(lambda: resolver(instancia, algoritmo, semente, controle=controle, **parametros), controle)
@@ -0,0 +1,129 @@
+"""Leitura de arquivos TSPLIB: cabeçalho linha a linha e seções numéricas decodificadas em bloco."""
+import gzip
+import mmap
+import re
+import warnings
+
+import numpy as np
+
+# Linha de palavra-chave (cabeçalho, início de seção ou EOF); linhas de dados começam com número
+_PALAVRA_CHAVE = re.compile(rb'^[ \t]*([A-Za-z][A-Za-z0-9_]*)[ \t]*(?::([^\r\n]*))?', re.M)
+
+# EDGE_WEIGHT_FORMAT -> (triângulo lido linha a linha, inclui a diagonal).
+# Numa matriz simétrica o triângulo superior por colunas é o inferior por linhas, e vice-versa.
+FORMATOS_EXPLICITOS = {
+    'UPPER_ROW': ('superior', False),
+    'LOWER_ROW': ('inferior', False),
+    'UPPER_DIAG_ROW': ('superior', True),
+    'LOWER_DIAG_ROW': ('inferior', True),
+    'UPPER_COL': ('inferior', False),
+    'LOWER_COL': ('superior', False),
+    'UPPER_DIAG_COL': ('inferior', True),
+    'LOWER_DIAG_COL': ('superior', True),
+}
+
+
+def _decodificar(trecho):
+    # Conversão de toda a seção em C; texto não numérico vira erro em vez de leitura parcial
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromstring(trecho, dtype=np.float64, sep=' ')
+        except (DeprecationWarning, ValueError):
+            raise ValueError('Valor não numérico em uma seção do arquivo TSP') from None
+
+
+def ler_tsp(dados):
+    """Interpreta um arquivo TSPLIB (bytes, mmap ou str) em uma única passagem.
+
+    Retorna o cabeçalho {chave: valor} e as seções {nome: np.ndarray float64 com todos os números}.
+    """
+    if isinstance(dados, str):
+        dados = dados.encode()
+    cabecalho = {}
+    secoes = {}
+    secao = None
+    inicio = 0
+    for m in _PALAVRA_CHAVE.finditer(dados):
+        if secao is not None:
+            secoes[secao] = _decodificar(dados[inicio:m.start()])
+            secao = None
+        chave = m.group(1).decode().upper()
+        if chave == 'EOF':
+            break
+        if chave.endswith('_SECTION'):
+            secao, inicio = chave, m.end()
+        else:
+            cabecalho[chave] = (m.group(2) or b'').decode().strip()
+    if secao is not None:
+        secoes[secao] = _decodificar(dados[inicio:])
+    return cabecalho, secoes
+
+
+def rotulos(ids):
+    """Rótulos dos nós como texto, preservando a numeração do arquivo."""
+    if np.all(ids == np.trunc(ids)):
+        return ids.astype(np.int64).astype(str).tolist()
+    return [repr(v) for v in ids.tolist()]
+
+
+def tabela_nos(valores, dimensao, secao='NODE_COORD_SECTION'):
+    """Separa uma seção "id x y" em rótulos e coordenadas (n, 2)."""
+    if valores.size // 3 != dimensao:
+        raise ValueError(f'Número inesperado de valores em {secao}')
+    tabela = valores[:3 * dimensao].reshape(dimensao, 3)
+    return rotulos(tabela[:, 0]), np.ascontiguousarray(tabela[:, 1:])
+
+
+def matriz_explicita(valores, dimensao, formato):
+    """Monta a matriz simétrica a partir de EDGE_WEIGHT_SECTION em qualquer EDGE_WEIGHT_FORMAT.
+
+    Pesos inteiros ficam em int32; a diagonal é sempre zerada.
+    """
+    n = dimensao
+    if formato == 'FULL_MATRIX':
+        tamanho = n * n
+    elif formato in FORMATOS_EXPLICITOS:
+        triangulo, diagonal = FORMATOS_EXPLICITOS[formato]
+        tamanho = n * (n + 1) // 2 if diagonal else n * (n - 1) // 2
+    else:
+        raise ValueError(f'Formato {formato} não suportado')
+    if len(valores) < tamanho:
+        raise ValueError('Número inesperado de valores na matriz de distâncias')
+    valores = valores[:tamanho]
+    inteiro = np.all(valores == np.trunc(valores)) and (valores.size == 0 or np.abs(valores).max() < 2**31)
+    tipo = np.int32 if inteiro else np.float64
+
+    if formato == 'FULL_MATRIX':
+        matriz = valores.reshape(n, n).astype(tipo)
+    else:
+        matriz = np.zeros((n, n), dtype=tipo)
+        pos = 0
+        for i in range(n):
+            if triangulo == 'superior':
+                a, b = (i if diagonal else i + 1), n
+            else:
+                a, b = 0, (i + 1 if diagonal else i)
+            matriz[i, a:b] = valores[pos:pos + b - a]
+            pos += b - a
+        # Espelha o triângulo lido (sem a diagonal) na outra metade
+        matriz += np.triu(matriz, 1).T if triangulo == 'superior' else np.tril(matriz, -1).T
+    np.fill_diagonal(matriz, 0)
+    return matriz
+
+
+def abrir_tsp(caminho):
+    """Conteúdo bruto do arquivo: mapeado em memória, ou lido inteiro se compactado (.gz).
+
+    Retorna (bruto, conteudo): `bruto` são os bytes do arquivo (usados na chave do cache) e
+    `conteudo` o texto TSPLIB, já descompactado.
+    """
+    with open(caminho, 'rb') as f:
+        if caminho.endswith('.gz'):
+            bruto = f.read()
+            return bruto, gzip.decompress(bruto)
+        try:
+            bruto = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            bruto = b''  # Arquivo vazio não pode ser mapeado
+    return bruto, bruto
@@ -0,0 +1,214 @@
+import numpy as np
+
+from . import acelerado
+from .candidatos import ELEMENTOS_BLOCO
+from .distancias import TIPOS_EUCLIDIANOS, OraculoDistancias, como_matriz
+from .rotas import custo_rotas
+
+
+def vizinho_mais_proximo(matriz, inicio=0, candidatos=None):
+    """Rota gulosa do vizinho mais próximo sobre índices, fechando no nó inicial.
+
+    Com `candidatos` (k vizinhos por nó, ordenados pela distância) o primeiro candidato não
+    visitado já é o mais próximo; a varredura completa só ocorre quando todos foram visitados.
+    Num OraculoDistancias euclidiano a busca usa as k-d trees de vizinho_espacial (se o scipy
+    estiver instalado) e os candidatos são ignorados.
+    """
+    matriz = como_matriz(matriz)
+    n = matriz.shape[0]
+    if _espacial(matriz):
+        try:
+            rota = vizinho_espacial(matriz.coordenadas, inicio)
+        except ImportError:
+            pass
+        else:
+            return rota.tolist(), custo_rotas(matriz, rota[:-1]).item()
+    if acelerado.usar(matriz):
+        if candidatos is not None:
+            candidatos = np.asarray(candidatos)
+        rota, distancia_total = acelerado.vizinho(np.asarray(matriz), inicio, candidatos)
+        inteira = np.issubdtype(matriz.dtype, np.integer)
+        return rota.tolist(), int(distancia_total) if inteira else float(distancia_total)
+    if candidatos is not None:
+        candidatos = np.asarray(candidatos).tolist()
+    visitado = np.zeros(n, dtype=bool)
+    visitado[inicio] = True
+    rota = [inicio]
+    distancia_total = 0
+    atual = inicio
+
+    for _ in range(n - 1):
+        proximo = -1
+        if candidatos is not None:
+            for candidato in candidatos[atual]:
+                if not visitado[candidato]:
+                    proximo = candidato
+                    break
+        if proximo < 0:
+            proximo = int(np.argmin(np.where(visitado, np.inf, matriz[atual])))
+        distancia_total += matriz[atual, proximo].item()
+        visitado[proximo] = True
+        rota.append(proximo)
+        atual = proximo
+
+    distancia_total += matriz[atual, inicio].item()
+    rota.append(inicio)
+    return rota, distancia_total
+
+
+def _espacial(matriz):
+    return isinstance(matriz, OraculoDistancias) and matriz.tipo in TIPOS_EUCLIDIANOS
+
+
+def vizinho_espacial(coordenadas, inicio=0, k=10):
+    """Vizinho mais próximo pela distância euclidiana das coordenadas, com k-d trees (scipy) e sem matriz.
+
+    Cada passo tenta os `k` vizinhos de uma consulta em lote feita no início; quando todos já foram
+    visitados, consulta uma k-d tree só dos nós restantes, refeita quando metade deles foi visitada.
+    Com isso o total fica perto de O(n log n) mesmo com pontos agrupados. Empates ficam com o menor
+    índice. Retorna a rota fechada como np.ndarray de índices.
+    """
+    from scipy.spatial import cKDTree
+
+    pontos = np.asarray(coordenadas, dtype=np.float64)
+    n = len(pontos)
+    k = max(0, min(k, n - 1))
+    distancias, vizinhos = cKDTree(pontos).query(pontos, k=[*range(1, k + 2)])
+    ordem = np.lexsort((vizinhos, distancias), axis=1)  # Distância e, no empate, índice
+    vizinhos = np.take_along_axis(vizinhos, ordem, axis=1).tolist()
+    # Posições da lista com distância menor que a da última: nenhum nó fora da lista empata com elas
+    seguros = (np.sort(distancias, axis=1) < distancias.max(axis=1, keepdims=True)).sum(axis=1)
+    seguros = (seguros if k < n - 1 else np.full(n, k + 1)).tolist()
+
+    visitado = bytearray(n)
+    marcas = np.frombuffer(visitado, dtype=np.bool_)
+    rota = np.empty(n + 1, dtype=np.int64)
+    rota[0] = rota[n] = atual = inicio
+    visitado[atual] = True
+    arvore = None
+    for passo in range(1, n):
+        proximo = -1
+        linha = vizinhos[atual]
+        for c in range(k + 1):
+            if not visitado[linha[c]]:
+                if c < seguros[atual]:
+                    proximo = linha[c]
+                break
+        if proximo < 0:
+            if arvore is None or 2 * removidos > len(restantes):
+                restantes = np.flatnonzero(~marcas)
+                arvore = cKDTree(pontos[restantes])
+                removidos = 0
+            m = len(restantes)
+            q = 16
+            while True:
+                q = min(q, m)
+                d, i = arvore.query(pontos[atual], k=[*range(1, q + 1)])
+                nos = restantes[i]
+                livres = ~marcas[nos]
+                if livres.any():
+                    menor = d[livres].min()
+                    if menor < d[-1] or q == m:
+                        proximo = int(nos[livres & (d == menor)].min())
+                        break
+                q *= 4
+        if arvore is not None:
+            removidos += 1
+        rota[passo] = atual = proximo
+        visitado[atual] = True
+    return rota
+
+
+def vizinho_lote(matriz, inicios, candidatos=None, rng=None, aleatoriedade=0.0):
+    """Vizinho mais próximo de vários inícios ao mesmo tempo; rotas abertas (S, n) int32.
+
+    Com `rng` e `aleatoriedade` > 0, em cada passo cada rota troca o mais próximo por um candidato
+    livre sorteado com essa probabilidade (rotas gulosas diversificadas para populações iniciais).
+    """
+    s = len(inicios)
+    n = matriz.shape[0]
+    linhas = np.arange(s)
+    visitado = np.zeros((s, n), dtype=bool)
+    rotas = np.empty((s, n), dtype=np.int32)
+    atual = np.asarray(inicios, dtype=np.int64)
+    rotas[:, 0] = atual
+    visitado[linhas, atual] = True
+    for passo in range(1, n):
+        proximo = np.full(s, -1, dtype=np.int64)
+        if candidatos is not None:
+            c = candidatos[atual]
+            livres = ~visitado[linhas[:, None], c]
+            achou = livres.any(axis=1)
+            proximo[achou] = c[achou, livres[achou].argmax(axis=1)]
+            if rng is not None and aleatoriedade > 0:
+                desvio = np.flatnonzero(achou & (rng.random(s) < aleatoriedade))
+                sorteio = rng.random((len(desvio), c.shape[1])) * livres[desvio]
+                proximo[desvio] = c[desvio, sorteio.argmax(axis=1)]
+        falta = np.flatnonzero(proximo < 0)
+        if falta.size:
+            d = np.array(matriz[atual[falta]], dtype=np.float64)
+            d[visitado[falta]] = np.inf
+            proximo[falta] = d.argmin(axis=1)
+        rotas[:, passo] = atual = proximo
+        visitado[linhas, atual] = True
+    return rotas
+
+
+def _melhor_do_lote(matriz, inicios, candidatos):
+    melhor = None
+    if _espacial(matriz):
+        for inicio in inicios:
+            rota, custo = vizinho_mais_proximo(matriz, int(inicio))
+            if melhor is None or custo < melhor[1]:
+                melhor = rota, custo
+        return melhor
+    bloco = max(1, ELEMENTOS_BLOCO // matriz.shape[0])
+    for i in range(0, len(inicios), bloco):
+        rotas = vizinho_lote(matriz, inicios[i:i + bloco], candidatos)
+        custos = custo_rotas(matriz, rotas)
+        k = int(np.argmin(custos))
+        if melhor is None or custos[k] < melhor[1]:
+            melhor = rotas[k].tolist() + [int(rotas[k, 0])], custos[k].item()
+    return melhor
+
+
+# Matriz e candidatos de cada processo da busca com vários inícios, preenchidos pelo inicializador
+_compartilhado = {}
+
+
+def _inicializar(matriz, candidatos):
+    _compartilhado['matriz'] = matriz
+    _compartilhado['candidatos'] = candidatos
+
+
+def _melhor_do_lote_global(inicios):
+    return _melhor_do_lote(_compartilhado['matriz'], inicios, _compartilhado['candidatos'])
+
+
+def vizinho_multiplo(matriz, inicios=None, candidatos=None, processos=None):
+    """Melhor rota do vizinho mais próximo entre vários nós iniciais.
+
+    `inicios` é a lista de nós iniciais, um número de inícios espaçados igualmente ou None (todos).
+    Sem oráculo as rotas de um bloco de inícios são construídas juntas, passo a passo em NumPy; com
+    `processos` > 1 os inícios são divididos entre processos. Empates ficam com o primeiro início.
+    Retorna a rota fechada e o custo, como vizinho_mais_proximo.
+    """
+    matriz = como_matriz(matriz)
+    n = matriz.shape[0]
+    if inicios is None:
+        inicios = np.arange(n)
+    elif np.ndim(inicios) == 0:
+        inicios = np.unique(np.linspace(0, n - 1, max(1, min(int(inicios), n))).astype(np.int64))
+    inicios = np.asarray(inicios, dtype=np.int64)
+    if candidatos is not None:
+        candidatos = np.asarray(candidatos)
+    processos = min(processos or 1, len(inicios))
+    if processos > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        lotes = np.array_split(inicios, processos)
+        with ProcessPoolExecutor(processos, initializer=_inicializar, initargs=(matriz, candidatos)) as executor:
+            resultados = list(executor.map(_melhor_do_lote_global, lotes))
+    else:
+        resultados = [_melhor_do_lote(matriz, inicios, candidatos)]
+    return min(resultados, key=lambda resultado: resultado[1])
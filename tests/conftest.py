@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+DIR_TSP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tsp')
+
+_cache_temporario = None
+
+
+def pytest_configure(config):
+    # Cache de instâncias (e do Numba) dos testes e dos processos que eles criam, fora do cache do usuário
+    global _cache_temporario
+    if 'FLYFOOD_CACHE' not in os.environ:
+        _cache_temporario = os.environ['FLYFOOD_CACHE'] = tempfile.mkdtemp(prefix='flyfood-testes-')
+
+
+def pytest_unconfigure(config):
+    if _cache_temporario is not None:
+        shutil.rmtree(_cache_temporario, ignore_errors=True)
+        del os.environ['FLYFOOD_CACHE']
+
+
+@pytest.fixture(scope='session')
+def carregar():
+    """Carrega uma instância de tsp/ pelo nome."""
+    from flyfood.instancia import carregar_instancia
+
+    def carregar_tsp(nome):
+        return carregar_instancia(os.path.join(DIR_TSP, f'{nome}.tsp'))
+
+    return carregar_tsp
+
+
+@pytest.fixture(scope='session')
+def berlin52(carregar):
+    return carregar('berlin52')
+
+
+def assert_rota_valida(rota, n):
+    """A rota fecha no nó inicial e visita cada um dos n nós exatamente uma vez."""
+    assert len(rota) == n + 1
+    assert rota[0] == rota[-1]
+    assert sorted(int(c) for c in rota[:-1]) == list(range(n))
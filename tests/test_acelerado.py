@@ -0,0 +1,83 @@
+"""Os núcleos de flyfood.acelerado (em Python puro e compilados pelo Numba) contra o caminho em NumPy."""
+import numpy as np
+import pytest
+
+from flyfood import acelerado
+from flyfood.formigas import calcular_heuristica, colonia_de_formigas, construir_rotas
+from flyfood.rotas import custo_rotas
+from flyfood.vizinho import vizinho_mais_proximo
+
+
+def _numpy(monkeypatch):
+    monkeypatch.setattr(acelerado, 'DISPONIVEL', False)
+
+
+@pytest.fixture(params=['python', 'numba'])
+def nucleos(request, monkeypatch):
+    """Liga os núcleos: as funções originais interpretadas, ou compiladas quando o Numba está instalado."""
+    if request.param == 'numba':
+        pytest.importorskip('numba')
+        monkeypatch.delenv('FLYFOOD_NUMBA', raising=False)
+        monkeypatch.setattr(acelerado, 'DISPONIVEL', None)
+        assert acelerado.usar(np.zeros((1, 1)))
+    else:
+        monkeypatch.setattr(acelerado, 'DISPONIVEL', True)
+        monkeypatch.setattr(acelerado, 'vizinho', acelerado._vizinho)
+        monkeypatch.setattr(acelerado, 'construir_rotas', acelerado._construir_rotas)
+        monkeypatch.setattr(acelerado, 'custo_rotas', acelerado._custo_rotas)
+    return request.param
+
+
+@pytest.fixture(params=['berlin52', 'aleatoria'])
+def matriz(request, berlin52):
+    if request.param == 'berlin52':
+        return berlin52.matriz
+    pontos = np.random.default_rng(1).random((40, 2))
+    return np.hypot(*(pontos[:, None] - pontos[None]).transpose(2, 0, 1))
+
+
+def _nos_dois_caminhos(monkeypatch, nucleos, executar):
+    compilado = executar()
+    with monkeypatch.context() as m:
+        _numpy(m)
+        referencia = executar()
+    return compilado, referencia
+
+
+@pytest.mark.parametrize('com_candidatos', [False, True])
+def test_vizinho_identico(monkeypatch, nucleos, matriz, com_candidatos):
+    candidatos = np.argsort(matriz, axis=1, kind='stable')[:, 1:6] if com_candidatos else None
+    for inicio in (0, 7, len(matriz) - 1):
+        (rota, custo), (rota_ref, custo_ref) = _nos_dois_caminhos(
+            monkeypatch, nucleos, lambda: vizinho_mais_proximo(matriz, inicio, candidatos))
+        assert rota == rota_ref
+        assert custo == custo_ref and type(custo) is type(custo_ref)
+
+
+def test_custo_rotas_identico(monkeypatch, nucleos, matriz):
+    rng = np.random.default_rng(2)
+    rotas = np.array([rng.permutation(len(matriz)) for _ in range(20)], dtype=np.int32)
+    custos, referencia = _nos_dois_caminhos(monkeypatch, nucleos, lambda: custo_rotas(matriz, rotas))
+    assert custos.dtype == referencia.dtype
+    np.testing.assert_array_equal(custos, referencia)
+
+
+@pytest.mark.parametrize('alfa', [1, 6])
+@pytest.mark.parametrize('com_candidatos', [False, True])
+def test_construcao_identica(monkeypatch, nucleos, matriz, alfa, com_candidatos):
+    candidatos = np.argsort(matriz, axis=1, kind='stable')[:, 1:6] if com_candidatos else None
+    # Feromônios desiguais e, com α alto, pesos que chegam a ser subnormais
+    tau = np.random.default_rng(3).random(matriz.shape) * 1e-40
+    atratividade = tau ** alfa * calcular_heuristica(matriz, 2)
+    rotas, referencia = _nos_dois_caminhos(
+        monkeypatch, nucleos, lambda: construir_rotas(atratividade, 8, np.random.default_rng(4), candidatos))
+    np.testing.assert_array_equal(rotas, referencia)
+    assert (np.sort(rotas, axis=1) == np.arange(len(matriz))).all()
+
+
+def test_colonia_identica(monkeypatch, nucleos, berlin52):
+    def executar():
+        return colonia_de_formigas(berlin52.matriz, num_formigas=8, max_iter=5, rng=5, candidatos=berlin52.candidatos())
+
+    resultado, referencia = _nos_dois_caminhos(monkeypatch, nucleos, executar)
+    assert resultado == referencia
@@ -0,0 +1,41 @@
+"""A mesma semente repete exatamente a mesma execução."""
+import numpy as np
+import pytest
+
+from flyfood.aleatorio import fluxos
+from flyfood.solucionadores import resolver
+
+CASOS = [
+    ('genetico', {'tamanho_populacao': 30, 'criterio_de_parada': 50, 'semear': 0.2}),
+    ('genetico', {'tamanho_populacao': 30, 'criterio_de_parada': 50, 'selecao': 'torneio', 'cruzamento': 'erx'}),
+    ('formigas', {'num_formigas': 10, 'max_iter': 10}),
+    ('formigas', {'num_formigas': 10, 'max_iter': 10, 'esparso': True, 'variante': 'mmas'}),
+    ('formigas', {'num_formigas': 10, 'max_iter': 10, 'processos': 2}),
+    ('ilhas', {'num_ilhas': 2, 'tamanho_populacao': 20, 'max_geracoes': 40, 'intervalo_migracao': 10}),
+    ('vizinho', {'inicios': 8, 'busca_local': True}),
+    ('vizinho', {'inicios': 8, 'processos': 2}),
+]
+
+
+@pytest.mark.parametrize('algoritmo, parametros', CASOS, ids=[f'{a}-{i}' for i, (a, _) in enumerate(CASOS)])
+def test_mesma_semente_mesma_execucao(berlin52, algoritmo, parametros):
+    primeira = resolver(berlin52, algoritmo, 123, **parametros)
+    segunda = resolver(berlin52, algoritmo, 123, **parametros)
+    assert primeira == segunda
+
+
+def test_sementes_diferentes_mudam_a_execucao(berlin52):
+    parametros = {'num_formigas': 10, 'max_iter': 10}
+    assert resolver(berlin52, 'formigas', 1, **parametros) != resolver(berlin52, 'formigas', 2, **parametros)
+
+
+def test_vizinho_multiplo_independe_dos_processos(berlin52):
+    assert resolver(berlin52, 'vizinho', 0, inicios=8) == resolver(berlin52, 'vizinho', 0, inicios=8, processos=2)
+
+
+def test_fluxos_nao_dependem_da_quantidade():
+    poucos = [g.random(4) for g in fluxos(7, 2)]
+    muitos = [g.random(4) for g in fluxos(7, 5)]
+    for a, b in zip(poucos, muitos):
+        np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(muitos[0], muitos[1])
@@ -0,0 +1,20 @@
+import os
+
+from flyfood import bateria
+
+from conftest import DIR_TSP
+
+
+def test_padrao_so_roda_heuristicas(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(bateria, 'executar_bateria', lambda *args: chamadas.append(args) or [])
+    bateria.main([os.path.join(DIR_TSP, 'brazil58.tsp')])
+    assert chamadas[0][1] == ['vizinho', 'genetico', 'formigas']
+
+
+def test_bateria_padrao_sem_erros(capsys):
+    bateria.main([os.path.join(DIR_TSP, 'brazil58.tsp'), '-j', '1',
+                  '-p', '{"genetico": [{"criterio_de_parada": 5}], "formigas": [{"max_iter": 2}]}'])
+    saida = capsys.readouterr()
+    assert 'ERRO' not in saida.err
+    assert len(saida.out.splitlines()) == 3
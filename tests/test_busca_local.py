@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from flyfood.busca_local import EPS, _mover_segmento, busca_local, custo_rota
+
+
+def _melhor_dois_opt(rota, d):
+    """Menor delta entre todos os movimentos 2-opt da rota (busca exaustiva)."""
+    n = len(rota)
+    melhor = 0.0
+    for i in range(n - 1):
+        for j in range(i + 2, n if i else n - 1):
+            a, b, c, e = rota[i], rota[i + 1], rota[j], rota[(j + 1) % n]
+            melhor = min(melhor, d[a][c] + d[b][e] - d[a][b] - d[c][e])
+    return melhor
+
+
+@pytest.mark.parametrize('usar_or_opt', [False, True])
+def test_chega_a_otimo_local_2opt_com_custo_correto(berlin52, usar_or_opt):
+    d = np.asarray(berlin52.matriz, dtype=np.float64)
+    n = len(d)
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        rota, custo = busca_local(rng.permutation(n).tolist(), d, k=n - 1, usar_or_opt=usar_or_opt)
+        assert sorted(rota) == list(range(n))
+        assert custo == pytest.approx(custo_rota(rota, d))
+        assert _melhor_dois_opt(rota, d) >= -EPS
+
+
+def test_rota_fechada_volta_fechada(berlin52):
+    rota = list(range(52)) + [0]
+    melhorada, custo = busca_local(rota, berlin52.matriz)
+    assert melhorada[0] == melhorada[-1] and sorted(melhorada[:-1]) == list(range(52))
+    assert custo == pytest.approx(custo_rota(melhorada[:-1], np.asarray(berlin52.matriz)))
+
+
+@pytest.mark.parametrize('invertido', [False, True])
+def test_mover_segmento_igual_a_reconstrucao(invertido):
+    n = 11
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        rota = rng.permutation(n).tolist()
+        pos = [0] * n
+        for p, x in enumerate(rota):
+            pos[x] = p
+        i, tamanho = int(rng.integers(n)), int(rng.integers(1, 4))
+        segmento = [rota[(i + t) % n] for t in range(tamanho)]
+        resto = [rota[(i + tamanho + t) % n] for t in range(n - tamanho)]
+        c = resto[int(rng.integers(len(resto)))]
+        esperado = resto[:resto.index(c) + 1] + (segmento[::-1] if invertido else segmento) + \
+            resto[resto.index(c) + 1:]
+
+        _mover_segmento(rota, pos, i, tamanho, c, invertido)
+        inicio = rota.index(esperado[0])
+        assert rota[inicio:] + rota[:inicio] == esperado
+        assert all(rota[pos[x]] == x for x in range(n))
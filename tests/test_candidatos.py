@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from flyfood import candidatos
+from flyfood.candidatos import lista_candidatos
+from flyfood.distancias import OraculoDistancias
+
+
+def _matriz(coordenadas):
+    return np.sqrt(((coordenadas[:, None, :] - coordenadas[None, :, :]) ** 2).sum(axis=2))
+
+
+@pytest.mark.parametrize('n, k', [(50, 5), (300, 10), (2500, 8)])
+def test_kdtree_e_argpartition_dao_os_mesmos_vizinhos(n, k):
+    pytest.importorskip('scipy')
+    coordenadas = np.random.default_rng(n).random((n, 2)) * 1000
+    matriz = _matriz(coordenadas)
+    pela_arvore = lista_candidatos(coordenadas=coordenadas, k=k)
+    pela_matriz = lista_candidatos(matriz, k)
+    assert pela_arvore.shape == pela_matriz.shape == (n, k)
+    assert [set(linha) for linha in pela_arvore.tolist()] == [set(linha) for linha in pela_matriz.tolist()]
+    # Ordenados pela distância, sem o próprio nó
+    np.testing.assert_array_equal(pela_arvore, pela_matriz)
+    assert not (pela_arvore == np.arange(n)[:, None]).any()
+
+
+def test_limite_escolhe_o_caminho(monkeypatch):
+    pytest.importorskip('scipy')
+    coordenadas = np.random.default_rng(0).random((100, 2))
+    matriz = _matriz(coordenadas)
+    chamadas = []
+    original = candidatos._candidatos_kdtree
+    monkeypatch.setattr(candidatos, '_candidatos_kdtree', lambda *a: chamadas.append(a) or original(*a))
+    esperado = lista_candidatos(matriz, 6, coordenadas)
+    assert not chamadas  # Até LIMITE_KDTREE, com a matriz, usa argpartition
+    monkeypatch.setattr(candidatos, 'LIMITE_KDTREE', 50)
+    np.testing.assert_array_equal(lista_candidatos(matriz, 6, coordenadas), esperado)
+    assert len(chamadas) == 1
+
+
+def test_pontos_repetidos_nao_incluem_o_proprio_no():
+    pytest.importorskip('scipy')
+    coordenadas = np.array([[0, 0], [0, 0], [0, 0], [1, 0], [5, 5], [5, 5]], dtype=np.float64)
+    lista = lista_candidatos(coordenadas=coordenadas, k=3)
+    assert not (lista == np.arange(6)[:, None]).any()
+    assert set(lista[0].tolist()) == {1, 2, 3}
+
+
+def test_oraculo_euclidiano_usa_as_coordenadas():
+    pytest.importorskip('scipy')
+    coordenadas = np.random.default_rng(1).random((200, 2)) * 100
+    oraculo = OraculoDistancias(coordenadas, 'EUC_2D')
+    lista = lista_candidatos(oraculo, 7)
+    d = np.rint(_matriz(coordenadas))
+    for i, linha in enumerate(lista.tolist()):
+        assert max(d[i, linha]) <= min(np.delete(d[i], linha + [i]))
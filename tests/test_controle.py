@@ -0,0 +1,38 @@
+import pytest
+
+from flyfood.controle import Controle
+from flyfood.solucionadores import melhorias, resolver
+
+
+@pytest.mark.parametrize('algoritmo, gap, parametros', [
+    ('formigas', 10, {}),
+    ('genetico', 20, {'semear': 0.5, 'criterio_de_parada': 200}),
+])
+def test_gap_alvo_registra_a_melhora_final(berlin52, algoritmo, gap, parametros):
+    controle = Controle()
+    avisos = list(melhorias(berlin52, algoritmo, semente=0, controle=controle, gap_alvo=gap, **parametros))
+    rota, custo = controle.resultado
+    assert controle.motivo == 'alvo'
+    assert custo <= berlin52.limite_inferior() * (1 + gap / 100)
+    assert avisos[-1].custo == controle.melhor_custo == custo
+    assert avisos[-1].rota == controle.melhor_rota == rota
+
+
+def test_custo_alvo_registra_antes_de_parar(berlin52):
+    controle = Controle()
+    rota, custo = resolver(berlin52, 'formigas', 0, controle=controle, custo_alvo=9000)
+    assert custo <= 9000
+    assert controle.melhor_custo == custo
+
+
+def test_rota_inicial_das_formigas_e_registrada(berlin52):
+    controle = Controle()
+    rota, custo = resolver(berlin52, 'formigas', 0, controle=controle, rota_inicial='vizinho', max_iter=1)
+    assert controle.melhor_custo == custo
+    assert controle.melhor_rota == [int(c) for c in rota]
+
+
+@pytest.mark.parametrize('algoritmo', ['vizinho', 'exato', 'decomposicao'])
+def test_gap_alvo_recusado_fora_dos_iterativos(berlin52, algoritmo):
+    with pytest.raises(ValueError, match='gap_alvo'):
+        resolver(berlin52, algoritmo, 0, gap_alvo=5)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from flyfood.cruzamento import CRUZAMENTOS, _ox, _pmx
+
+
+def _pais(m, n, semente):
+    rng = np.random.default_rng(semente)
+    return (np.array([rng.permutation(n) for _ in range(m)], dtype=np.int32),
+            np.array([rng.permutation(n) for _ in range(m)], dtype=np.int32))
+
+
+@pytest.mark.parametrize('nome', sorted(CRUZAMENTOS))
+@pytest.mark.parametrize('n', [1, 2, 3, 8, 52])
+def test_filhos_sao_permutacoes(nome, n):
+    rng = np.random.default_rng(n)
+    for semente in range(10):
+        pais_1, pais_2 = _pais(16, n, semente)
+        filhos = CRUZAMENTOS[nome](pais_1, pais_2, rng)
+        assert filhos.shape == (32, n)
+        assert (np.sort(filhos, axis=1) == np.arange(n)).all()
+
+
+def test_ox_mantem_o_segmento_e_a_ordem_do_receptor():
+    n = 20
+    pais_1, pais_2 = _pais(200, n, 0)
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, n, size=200)
+    b = np.minimum(a + rng.integers(1, n, size=200), n)
+    filhos = _ox(pais_1, pais_2, a, b)
+    for filho, doador, receptor, ai, bi in zip(filhos.tolist(), pais_1.tolist(), pais_2.tolist(), a, b):
+        assert filho[ai:bi] == doador[ai:bi]
+        # O resto, lido a partir de b, segue a ordem do receptor a partir de b
+        segmento = set(doador[ai:bi])
+        girado = receptor[bi:] + receptor[:bi]
+        assert filho[bi:] + filho[:ai] == [c for c in girado if c not in segmento]
+
+
+def test_pmx_mantem_o_segmento():
+    n = 20
+    pais_1, pais_2 = _pais(50, n, 1)
+    for r, (doador, receptor) in enumerate(zip(pais_1.tolist(), pais_2.tolist())):
+        a, b = r % n, min(n, r % n + 1 + r % 7)
+        filho = _pmx(doador, receptor, a, b)
+        assert filho[a:b] == doador[a:b]
+        assert sorted(filho) == list(range(n))
+
+
+def test_erx_com_pais_iguais_reproduz_o_ciclo():
+    pais, _ = _pais(10, 30, 2)
+    filhos = CRUZAMENTOS['erx'](pais, pais.copy(), np.random.default_rng(0))
+    arestas = [{frozenset(a) for a in zip(p, np.roll(p, -1))} for p in pais.tolist()]
+    for r, filho in enumerate(filhos.tolist()):
+        assert {frozenset(a) for a in zip(filho, np.roll(filho, -1))} == arestas[r % 10]
@@ -0,0 +1,58 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from flyfood.distancias import OraculoDistancias, TIPOS, distancia_media
+
+from test_tsplib import _referencia
+
+
+def _coordenadas(tipo, n, semente):
+    rng = np.random.default_rng(semente)
+    if tipo == 'GEO':
+        return np.round(np.column_stack([rng.uniform(-60, 60, n), rng.uniform(-170, 170, n)]), 2)
+    return rng.uniform(0, 1000, (n, 2))
+
+
+@pytest.mark.parametrize('tipo', list(TIPOS))
+def test_oraculo_igual_a_matriz_densa(tipo):
+    n = 40
+    coordenadas = _coordenadas(tipo, n, 3)
+    densa = np.array([[_referencia(tipo, coordenadas[i], coordenadas[j]) if i != j else 0 for j in range(n)]
+                      for i in range(n)], dtype=np.float64)
+    oraculo = OraculoDistancias(coordenadas, tipo, tamanho_cache=4)
+    np.testing.assert_array_equal(oraculo.densa(), densa)
+    np.testing.assert_array_equal(np.asarray(oraculo), densa)
+    for i in (0, 7, n - 1, 7):
+        np.testing.assert_array_equal(oraculo[i], densa[i])
+    linhas = np.array([[1, 5], [9, 2]])
+    np.testing.assert_array_equal(oraculo[linhas], densa[linhas])
+    np.testing.assert_array_equal(oraculo[3:30:4], densa[3:30:4])
+    np.testing.assert_array_equal(oraculo[2, 5:9], densa[2, 5:9])
+    np.testing.assert_array_equal(oraculo[5:9, 2], densa[5:9, 2])
+    a, b = np.random.default_rng(0).integers(0, n, (2, 200))
+    np.testing.assert_array_equal(oraculo[a, b], densa[a, b])
+    assert all(oraculo[int(i), int(j)] == oraculo.escalar[i][j] == densa[i, j] for i, j in zip(a, b))
+    assert distancia_media(oraculo) == pytest.approx(densa.mean())
+
+
+def test_cache_lru_descarta_a_linha_menos_usada():
+    oraculo = OraculoDistancias(_coordenadas('EUC_2D', 10, 0), tamanho_cache=3)
+    for i in (0, 1, 2):
+        oraculo.linha(i)
+    primeira = oraculo.linha(0)  # Volta a ser a mais recente
+    oraculo.linha(3)
+    assert list(oraculo._cache) == [2, 0, 3]
+    assert oraculo.linha(0) is primeira
+    assert not primeira.flags.writeable
+    oraculo.linha(1)
+    assert list(oraculo._cache) == [3, 0, 1]
+
+
+def test_cache_nao_vai_para_outro_processo():
+    oraculo = OraculoDistancias(_coordenadas('ATT', 10, 1), 'ATT', tamanho_cache=5)
+    oraculo.linha(4)
+    copia = pickle.loads(pickle.dumps(oraculo))
+    assert not copia._cache and oraculo._cache
+    np.testing.assert_array_equal(copia.densa(), oraculo.densa())
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from flyfood.formigas import Feromonios, colonia_de_formigas
+from flyfood.rotas import custo_rotas
+
+from conftest import assert_rota_valida
+
+
+@pytest.mark.parametrize('modo', ['completo', 'candidatos', 'esparso'])
+def test_alfa_alto_em_execucao_longa_gera_permutacao(berlin52, modo):
+    candidatos = None if modo == 'completo' else berlin52.candidatos()
+    with np.errstate(over='raise', invalid='raise'):
+        rota, custo = colonia_de_formigas(berlin52.matriz, num_formigas=10, max_iter=300, alfa=4, rho=0.5, rng=0,
+                                          candidatos=candidatos, esparso=modo == 'esparso')
+    assert_rota_valida(rota, berlin52.dimensao)
+    assert custo == custo_rotas(berlin52.matriz, np.array(rota[:-1])).item()
+
+
+def test_atratividade_com_escala_pequena_e_finita():
+    feromonios = Feromonios(3, 1.0)
+    for _ in range(300):
+        feromonios.evaporar(0.5)
+        feromonios.depositar(np.array([0, 1, 2]), 1.0)
+    heuristica = np.ones((3, 3))
+    atratividade = feromonios.atratividade(heuristica, 6)
+    assert np.isfinite(atratividade).all()
+    np.testing.assert_allclose(atratividade, feromonios.matriz() ** 6)
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from flyfood.genetico import mutacao
+from flyfood.rotas import custo_rotas
+
+
+@pytest.mark.parametrize('n', [3, 4, 5, 52])
+def test_delta_da_mutacao_igual_ao_custo_recalculado(berlin52, n):
+    matriz = np.asarray(berlin52.matriz)[:n, :n].astype(np.float64)
+    rng = np.random.default_rng(n)
+    rotas = np.array([rng.permutation(n) for _ in range(200)], dtype=np.int32)
+    custos = custo_rotas(matriz, rotas).astype(np.float64)
+    for _ in range(20):
+        mutacao(matriz, rotas, custos, 0.7, rng)
+        np.testing.assert_allclose(custos, custo_rotas(matriz, rotas))
+    assert (np.sort(rotas, axis=1) == np.arange(n)).all()
@@ -0,0 +1,33 @@
+import pytest
+
+from flyfood.ilhas import ga_ilhas, vizinhos_topologia
+from flyfood.solucionadores import resolver
+
+from conftest import assert_rota_valida
+
+
+def test_criterio_de_parada_e_o_orcamento_das_ilhas(berlin52):
+    rota, custo = resolver(berlin52, 'ilhas', 0, num_ilhas=2, tamanho_populacao=10, criterio_de_parada=5)
+    assert_rota_valida(rota, 52)
+    assert resolver(berlin52, 'ilhas', 0, num_ilhas=2, tamanho_populacao=10, max_geracoes=5) == (rota, custo)
+    with pytest.raises(TypeError, match='não os dois'):
+        resolver(berlin52, 'ilhas', 0, criterio_de_parada=5, max_geracoes=5)
+
+
+@pytest.mark.parametrize('parametros, erro', [
+    ({'inexistente': 1}, TypeError),
+    ({'selecao': 'sorteio'}, ValueError),
+    ({'cruzamento': 'cx'}, ValueError),
+])
+def test_parametros_invalidos_falham_antes_das_ilhas(berlin52, monkeypatch, parametros, erro):
+    monkeypatch.setattr('multiprocessing.context.BaseContext.Queue', lambda *a: pytest.fail('criou processos'))
+    with pytest.raises(erro):
+        ga_ilhas(berlin52.matriz, num_ilhas=2, rng=0, **parametros)
+
+
+def test_topologias():
+    assert vizinhos_topologia('anel', 3) == [[1], [2], [0]]
+    assert vizinhos_topologia('completa', 3) == [[1, 2], [0, 2], [0, 1]]
+    assert vizinhos_topologia('anel', 1) == [[]]
+    with pytest.raises(ValueError):
+        vizinhos_topologia('estrela', 3)
@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from flyfood.instancia import instancia_de_coordenadas
+from flyfood.limites import LIMITE_EXATO, held_karp_exato, limite_held_karp
+from flyfood.rotas import custo_rotas
+from flyfood.solucionadores import resolver
+
+from conftest import assert_rota_valida
+
+
+def _forca_bruta(matriz):
+    n = len(matriz)
+    return min(custo_rotas(matriz, np.array((0, *p))).item() for p in itertools.permutations(range(1, n)))
+
+
+def _aleatoria(n, semente):
+    pontos = np.random.default_rng(semente).integers(0, 100, (n, 2))
+    return instancia_de_coordenadas(pontos).matriz
+
+
+@pytest.mark.parametrize('n', range(1, 9))
+@pytest.mark.parametrize('semente', range(3))
+def test_exato_igual_a_forca_bruta(n, semente):
+    matriz = _aleatoria(n, semente)
+    rota, custo = held_karp_exato(matriz)
+    assert_rota_valida(rota, n)
+    assert rota[0] == 0
+    assert custo == custo_rotas(matriz, np.array(rota[:-1])).item()
+    assert custo == _forca_bruta(matriz)
+
+
+def test_exato_com_matriz_explicita_fracionaria():
+    rng = np.random.default_rng(4)
+    matriz = np.triu(rng.random((7, 7)) * 10, 1)
+    matriz += matriz.T
+    _, custo = held_karp_exato(matriz)
+    assert custo == pytest.approx(_forca_bruta(matriz))
+
+
+def test_exato_recusa_instancias_grandes(berlin52):
+    with pytest.raises(ValueError, match='no máximo'):
+        held_karp_exato(berlin52.matriz)
+    with pytest.raises(ValueError):
+        resolver(berlin52, 'exato', 0)
+    assert LIMITE_EXATO == 20
+
+
+@pytest.mark.parametrize('n', [5, 8])
+def test_limite_inferior_nao_passa_do_otimo(n):
+    for semente in range(3):
+        matriz = _aleatoria(n, semente)
+        assert limite_held_karp(matriz) <= _forca_bruta(matriz) + 1e-6
+
+
+def test_limite_inferior_de_berlin52(berlin52):
+    limite = berlin52.limite_inferior()
+    assert 0.95 * 7542 <= limite <= 7542
@@ -0,0 +1,65 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from flyfood.instancia import instancia_de_coordenadas
+from flyfood.lote import dois_opt_instancias, empacotar, matrizes_lote, resolver_lote, vizinho_instancias
+from flyfood.rotas import custo_rotas
+
+
+def _instancias(tamanhos, semente=0):
+    rng = np.random.default_rng(semente)
+    return [rng.integers(0, 1000, (n, 2)).astype(np.float64) for n in tamanhos]
+
+
+def _conferir(instancias, rotas, custos):
+    for coordenadas, rota, custo in zip(instancias, rotas, custos):
+        n = len(coordenadas)
+        assert sorted(rota[:n].tolist()) == list(range(n))
+        assert (rota[n:] == -1).all()
+        matriz = instancia_de_coordenadas(coordenadas).matriz
+        assert custo == (custo_rotas(matriz, rota[:n]).item() if n else 0.0)
+
+
+@pytest.mark.parametrize('algoritmo, parametros', [
+    ('vizinho', {}),
+    ('formigas', {'max_iter': 3}),
+    ('genetico', {'criterio_de_parada': 3}),
+])
+@pytest.mark.parametrize('busca_local', [False, True])
+def test_rotas_validas_com_preenchimento(algoritmo, parametros, busca_local):
+    instancias = _instancias([12, 5, 1, 30, 2, 17, 4, 0, 3, 30, 9])
+    rotas, custos = resolver_lote(instancias, algoritmo=algoritmo, busca_local=busca_local, processos=1,
+                                  tamanho_bloco=4, rng=0, **parametros)
+    assert rotas.shape == (len(instancias), 30)
+    _conferir(instancias, rotas, custos)
+
+
+def test_resultado_nao_depende_dos_blocos_nem_dos_processos():
+    instancias = _instancias([8, 20, 13, 20, 6, 11], semente=1)
+    a = resolver_lote(instancias, algoritmo='formigas', processos=1, tamanho_bloco=2, rng=3, max_iter=3)
+    b = resolver_lote(instancias, algoritmo='formigas', processos=2, tamanho_bloco=2, rng=3, max_iter=3)
+    np.testing.assert_array_equal(a[0], b[0])
+    np.testing.assert_array_equal(a[1], b[1])
+
+
+def test_preenchimento_nao_altera_o_2opt():
+    instancias = _instancias([15, 40], semente=2)
+    coordenadas, tamanhos = empacotar(instancias)
+    matrizes = matrizes_lote(coordenadas)
+    rotas = dois_opt_instancias(matrizes, vizinho_instancias(matrizes, tamanhos), tamanhos)
+    # A instância pequena, sozinha e sem preenchimento, chega à mesma rota
+    sozinha = matrizes_lote(coordenadas[:1, :15])
+    rota_sozinha = dois_opt_instancias(sozinha, vizinho_instancias(sozinha, tamanhos[:1]), tamanhos[:1])
+    np.testing.assert_array_equal(rotas[0, :15], rota_sozinha[0])
+    assert (rotas[0, 15:] == rotas[0, 14]).all()
+
+
+def test_formigas_com_custo_zero_sem_avisos():
+    instancias = [np.zeros((1, 2)), np.full((6, 2), 5.0), np.array([[0, 0], [0, 0], [3, 4]], dtype=np.float64)]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        rotas, custos = resolver_lote(instancias, algoritmo='formigas', processos=1, rng=0, max_iter=3)
+    _conferir(instancias, rotas, custos)
+    np.testing.assert_array_equal(custos, [0, 0, 10])
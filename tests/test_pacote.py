@@ -0,0 +1,35 @@
+import json
+import os
+
+import numpy as np
+
+import flyfood
+from flyfood.__main__ import main
+from flyfood.distancias import OraculoDistancias
+from flyfood.instancia import LIMITE_DENSO, instancia_de_coordenadas
+
+from conftest import DIR_TSP, assert_rota_valida
+
+
+def test_solve_com_caminho_e_coordenadas():
+    rota, custo = flyfood.solve(os.path.join(DIR_TSP, 'berlin52.tsp'), 'vizinho', semente=0)
+    assert_rota_valida(rota, 52)
+    pontos = np.random.default_rng(0).random((30, 2)) * 100
+    rota, custo = flyfood.solve(pontos, 'formigas', semente=0, max_iter=3)
+    assert_rota_valida(rota, 30)
+
+
+def test_coordenadas_grandes_usam_o_oraculo():
+    pontos = np.random.default_rng(1).random((LIMITE_DENSO + 1, 2)) * 1000
+    assert isinstance(instancia_de_coordenadas(pontos).matriz, OraculoDistancias)
+    assert isinstance(instancia_de_coordenadas(pontos[:LIMITE_DENSO]).matriz, np.ndarray)
+    rota, _ = flyfood.solve(pontos, 'vizinho', semente=0)
+    assert_rota_valida(rota, len(pontos))
+
+
+def test_linha_de_comando(capsys):
+    codigo = main([os.path.join(DIR_TSP, 'st70.tsp'), os.path.join(DIR_TSP, 'inexistente.tsp'), '-s', '0'])
+    linhas = [json.loads(linha) for linha in capsys.readouterr().out.splitlines()]
+    assert codigo == 1
+    assert linhas[0]['nome'] == 'st70' and linhas[0]['semente'] == 0 and len(linhas[0]['rota']) == 71
+    assert 'erro' in linhas[1]
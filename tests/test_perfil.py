@@ -0,0 +1,21 @@
+import pytest
+
+from flyfood import perfil
+from flyfood.genetico import alg_genetico
+
+
+@pytest.fixture
+def instrumentado():
+    perfil.ativar()
+    perfil.reiniciar()
+    yield
+    perfil.ativar(False)
+    perfil.reiniciar()
+
+
+def test_avaliacoes_do_genetico_contam_cada_filho(berlin52, instrumentado):
+    alg_genetico(berlin52.matriz, tamanho_populacao=20, tx_de_reproducao=60, criterio_de_parada=7, rng=0)
+    contadores = perfil.coletar()['contadores']
+    # População inicial mais 2 filhos por par (6 pares) em cada uma das 7 gerações
+    assert contadores['geracoes'] == 7
+    assert contadores['avaliacoes'] == 20 + 7 * 2 * 6
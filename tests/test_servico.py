@@ -0,0 +1,112 @@
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from flyfood.servico import Servico
+
+from conftest import DIR_TSP, assert_rota_valida
+
+
+@pytest.fixture(scope='module')
+def servico():
+    servico = Servico(processos=1)
+    yield servico
+    servico.fechar()
+
+
+@pytest.fixture(autouse=True)
+def limpo(servico):
+    servico.memo.clear()
+    servico.chaves.clear()
+    servico.estatisticas.update(dict.fromkeys(servico.estatisticas, 0))
+
+
+def executar(*pedidos):
+    async def todos():
+        return await asyncio.gather(*pedidos)
+
+    return asyncio.run(todos())
+
+
+def test_resolve_arquivo(servico):
+    [resultado] = executar(servico.resolver(os.path.join(DIR_TSP, 'berlin52.tsp'), 'vizinho', 0))
+    assert resultado['nome'] == 'berlin52'
+    assert resultado['origem'] == 'execucao'
+    assert_rota_valida(resultado['rota'], 52)
+
+
+def test_pedidos_iguais_em_andamento_sao_coalescidos(servico):
+    caminho = os.path.join(DIR_TSP, 'st70.tsp')
+    resultados = executar(*(servico.resolver(caminho, 'formigas', 0, max_iter=20) for _ in range(3)))
+    assert sorted(r['origem'] for r in resultados) == ['coalescido', 'coalescido', 'execucao']
+    assert len({(r['custo'], tuple(r['rota'])) for r in resultados}) == 1
+    assert servico.estatisticas['execucoes'] == 1
+    assert servico.estatisticas['coalescidos'] == 2
+
+
+def test_pedidos_com_semente_sao_memorizados(servico):
+    coordenadas = {'coordenadas': [[0, 0], [3, 0], [3, 4], [0, 4], [1, 2]]}
+    [primeiro] = executar(servico.resolver(coordenadas, 'formigas', 1, max_iter=5))
+    [segundo] = executar(servico.resolver(coordenadas, 'formigas', 1, max_iter=5))
+    [outra_semente] = executar(servico.resolver(coordenadas, 'formigas', 2, max_iter=5))
+    assert (primeiro['origem'], segundo['origem'], outra_semente['origem']) == ('execucao', 'memoria', 'execucao')
+    assert segundo['rota'] == primeiro['rota']
+    assert servico.estatisticas['memorizados'] == 1
+
+
+def test_sem_semente_ou_com_tempo_limite_nao_memoriza(servico):
+    coordenadas = {'coordenadas': [[0, 0], [3, 0], [3, 4], [0, 4], [1, 2]]}
+    for semente, parametros in ((None, {}), (0, {'tempo_limite': 5})):
+        origens = [executar(servico.resolver(coordenadas, 'formigas', semente, max_iter=5, **parametros))[0]['origem']
+                   for _ in range(2)]
+        assert origens == ['execucao', 'execucao']
+    assert not servico.memo
+
+
+def test_erros_nao_contam_como_execucoes(servico):
+    resposta = asyncio.run(servico.atender({'id': 7, 'instancia': {'coordenadas': [[0, 0], [1, 1]]},
+                                            'algoritmo': 'vizinho', 'parametros': {'inexistente': 1}}))
+    assert resposta['id'] == 7 and 'erro' in resposta
+    assert servico.estatisticas['erros'] == 1
+    assert servico.estatisticas['execucoes'] == 0
+
+
+def test_hash_do_arquivo_acompanha_alteracoes(servico, tmp_path):
+    caminho = str(tmp_path / 'instancia.tsp')
+    shutil.copy(os.path.join(DIR_TSP, 'berlin52.tsp'), caminho)
+    chave, fonte = asyncio.run(servico._fonte(caminho))
+    assert fonte == ('arquivo', caminho)
+    assert asyncio.run(servico._fonte(caminho))[0] == chave
+    with open(caminho, 'a') as f:
+        f.write('\n')
+    os.utime(caminho, ns=(0, 0))
+    assert asyncio.run(servico._fonte(caminho))[0] != chave
+    assert len(servico.chaves) == 2
+
+
+def test_sair_do_contexto_nao_trava_o_loop():
+    async def cenario():
+        ticks = 0
+
+        async def relogio():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async with Servico(processos=1) as servico:
+            pedido = asyncio.create_task(servico.resolver(os.path.join(DIR_TSP, 'kroA100.tsp'), 'formigas', 0,
+                                                          max_iter=300))
+            await asyncio.sleep(0.2)  # O pedido já está rodando no processo
+            contador = asyncio.create_task(relogio())
+            await asyncio.sleep(0)
+        antes = ticks
+        resultado = await pedido
+        contador.cancel()
+        return antes, resultado
+
+    ticks, resultado = asyncio.run(cenario())
+    assert ticks > 0
+    assert_rota_valida(resultado['rota'], 100)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from flyfood.instancia import instancia_de_coordenadas
+from flyfood.rotas import custo_rotas
+from flyfood.solucionadores import ALGORITMOS, resolver
+
+from conftest import assert_rota_valida
+
+# Parâmetros curtos de cada algoritmo; cada um roda nas instâncias que aceita
+CASOS = {
+    'vizinho': [{}, {'busca_local': True}, {'inicios': 5}, {'num_candidatos': 0}],
+    'genetico': [{'criterio_de_parada': 20}, {'criterio_de_parada': 10, 'cruzamento': 'pmx', 'busca_local': True},
+                 {'criterio_de_parada': 10, 'semear': 0.5, 'rota_inicial': 'guloso'}],
+    'ilhas': [{'num_ilhas': 2, 'tamanho_populacao': 20, 'max_geracoes': 20}],
+    'formigas': [{'max_iter': 5}, {'max_iter': 5, 'variante': 'mmas', 'busca_local': True},
+                 {'max_iter': 5, 'esparso': True, 'rota_inicial': 'vizinho'}],
+    'exato': [{}],
+    'decomposicao': [{'tamanho_grupo': 20}, {'tamanho_grupo': 15, 'metodo': 'hilbert', 'subalgoritmo': 'formigas',
+                                             'max_iter': 3}],
+}
+
+
+def _instancias(carregar):
+    pontos = np.random.default_rng(0).integers(0, 1000, (12, 2))
+    return {
+        'pequena': instancia_de_coordenadas(pontos, nome='pequena'),
+        'berlin52': carregar('berlin52'),
+        'brazil58': carregar('brazil58'),  # EXPLICIT
+    }
+
+
+def _aceita(algoritmo, instancia):
+    if algoritmo == 'exato':
+        return instancia.dimensao <= 20
+    if algoritmo == 'decomposicao':
+        return instancia.coordenadas is not None and instancia.tipo_distancia != 'EXPLICIT'
+    return True
+
+
+def test_todos_os_algoritmos_tem_casos():
+    assert set(CASOS) == set(ALGORITMOS)
+
+
+@pytest.mark.parametrize('algoritmo, parametros',
+                         [(a, p) for a, lista in CASOS.items() for p in lista],
+                         ids=[f'{a}-{i}' for a, lista in CASOS.items() for i in range(len(lista))])
+@pytest.mark.parametrize('nome', ['pequena', 'berlin52', 'brazil58'])
+def test_rota_valida_e_custo_consistente(carregar, algoritmo, parametros, nome):
+    instancia = _instancias(carregar)[nome]
+    if not _aceita(algoritmo, instancia):
+        pytest.skip(f'{algoritmo} não se aplica a {nome}')
+    rota, custo = resolver(instancia, algoritmo, 0, **dict(parametros))
+    assert_rota_valida(rota, instancia.dimensao)
+    assert custo == custo_rotas(instancia.matriz, np.array(rota[:-1])).item()
+
+
+def test_exato_e_o_menor_custo(carregar):
+    instancia = _instancias(carregar)['pequena']
+    _, otimo = resolver(instancia, 'exato', 0)
+    for algoritmo in ('vizinho', 'genetico', 'formigas'):
+        assert resolver(instancia, algoritmo, 0)[1] >= otimo
+
+
+def test_algoritmo_desconhecido(berlin52):
+    with pytest.raises(ValueError, match='não suportado'):
+        resolver(berlin52, 'inexistente')
@@ -0,0 +1,177 @@
+import gzip
+import math
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from flyfood.distancias import OraculoDistancias, TIPOS, matriz_distancias
+from flyfood.instancia import carregar_instancia, compilar_instancia
+from flyfood.rotas import custo_rotas
+from flyfood.tsplib import FORMATOS_EXPLICITOS
+
+from conftest import DIR_TSP
+
+# Rota ótima de berlin52 (berlin52.opt.tour da TSPLIB), custo 7542
+OTIMA_BERLIN52 = [1, 49, 32, 45, 19, 41, 8, 9, 10, 43, 33, 51, 11, 52, 14, 13, 47, 26, 27, 28, 12, 25, 4, 6, 15, 5,
+                  24, 48, 38, 37, 40, 39, 36, 35, 34, 44, 46, 16, 29, 50, 20, 23, 30, 2, 7, 42, 21, 17, 3, 18, 31, 22]
+
+
+def _simetrica(n, semente=0, inteira=True):
+    rng = np.random.default_rng(semente)
+    valores = rng.integers(1, 1000, (n, n)) if inteira else rng.random((n, n)) * 100
+    matriz = np.triu(valores, 1)
+    return matriz + matriz.T
+
+
+def _pesos(matriz, formato):
+    """EDGE_WEIGHT_SECTION escrita direto da definição de cada formato na documentação da TSPLIB."""
+    n = len(matriz)
+    if formato == 'FULL_MATRIX':
+        return [matriz[i, j] for i in range(n) for j in range(n)]
+    diagonal = 'DIAG' in formato
+    por_linha = formato.endswith('ROW')
+    superior = formato.startswith('UPPER')
+    pesos = []
+    for a in range(n):
+        for b in range(n):
+            i, j = (a, b) if por_linha else (b, a)
+            if (j > i if superior else j < i) or (diagonal and i == j):
+                pesos.append(matriz[i, j])
+    return pesos
+
+
+def _explicita(matriz, formato, por_linha=7):
+    pesos = [str(p) for p in _pesos(matriz, formato)]
+    linhas = [' '.join(pesos[i:i + por_linha]) for i in range(0, len(pesos), por_linha)]
+    return '\n'.join(['NAME: teste', 'TYPE: TSP', f'DIMENSION: {len(matriz)}', 'EDGE_WEIGHT_TYPE: EXPLICIT',
+                      f'EDGE_WEIGHT_FORMAT: {formato}', 'EDGE_WEIGHT_SECTION', *linhas, 'EOF', ''])
+
+
+def _coordenadas(coordenadas, tipo):
+    nos = [f'{i + 1} {x} {y}' for i, (x, y) in enumerate(coordenadas)]
+    return '\n'.join(['NAME: teste', 'TYPE: TSP', f'DIMENSION: {len(coordenadas)}', f'EDGE_WEIGHT_TYPE: {tipo}',
+                      'NODE_COORD_SECTION', *nos, 'EOF', ''])
+
+
+@pytest.mark.parametrize('formato', ['FULL_MATRIX', *FORMATOS_EXPLICITOS])
+def test_formatos_explicitos(formato):
+    matriz = _simetrica(7)
+    instancia = compilar_instancia(_explicita(matriz, formato))
+    assert instancia.tipo_distancia == 'EXPLICIT' and instancia.formato == formato
+    assert instancia.matriz.dtype == np.int32
+    np.testing.assert_array_equal(instancia.matriz, matriz)
+
+
+def test_pesos_fracionarios_ficam_em_float():
+    matriz = np.round(_simetrica(5, inteira=False), 3)
+    instancia = compilar_instancia(_explicita(matriz, 'LOWER_DIAG_ROW'))
+    assert instancia.matriz.dtype == np.float64
+    np.testing.assert_allclose(instancia.matriz, matriz)
+
+
+def test_brazil58(carregar):
+    instancia = carregar('brazil58')
+    m = instancia.matriz
+    assert m.shape == (58, 58) and instancia.formato == 'UPPER_ROW'
+    np.testing.assert_array_equal(m, m.T)
+    assert (np.diag(m) == 0).all()
+    assert m[0, 1:4].tolist() == [2635, 2713, 2437]
+    assert m[1, 2:4].tolist() == [314, 2636]
+
+
+def test_rota_otima_de_berlin52(berlin52):
+    assert custo_rotas(berlin52.matriz, np.array(OTIMA_BERLIN52) - 1) == 7542
+
+
+# Distâncias da documentação da TSPLIB, escritas com math, para conferir o arredondamento
+def _nint(x):
+    return int(x + 0.5)
+
+
+def _referencia(tipo, a, b):
+    (xa, ya), (xb, yb) = a, b
+    if tipo == 'EUC_2D':
+        return _nint(math.sqrt((xa - xb) ** 2 + (ya - yb) ** 2))
+    if tipo == 'CEIL_2D':
+        return math.ceil(math.sqrt((xa - xb) ** 2 + (ya - yb) ** 2))
+    if tipo == 'ATT':
+        r = math.sqrt(((xa - xb) ** 2 + (ya - yb) ** 2) / 10.0)
+        t = _nint(r)
+        return t + 1 if t < r else t
+
+    def radianos(v):
+        graus = int(v)
+        return 3.141592 * (graus + 5.0 * (v - graus) / 3.0) / 180.0
+
+    lat_a, lon_a, lat_b, lon_b = radianos(xa), radianos(ya), radianos(xb), radianos(yb)
+    q1 = math.cos(lon_a - lon_b)
+    q2 = math.cos(lat_a - lat_b)
+    q3 = math.cos(lat_a + lat_b)
+    return int(6378.388 * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+
+@pytest.mark.parametrize('tipo', list(TIPOS))
+def test_arredondamento_tsplib(tipo):
+    rng = np.random.default_rng(5)
+    if tipo == 'GEO':
+        coordenadas = np.round(np.column_stack([rng.uniform(-60, 60, 12), rng.uniform(-170, 170, 12)]), 2)
+    else:
+        coordenadas = rng.integers(0, 50, (12, 2)).astype(np.float64)
+        coordenadas[1] = coordenadas[0] + [3, 4]  # Distância exata
+        coordenadas[2] = coordenadas[0] + [1, 1]  # √2: arredonda para baixo no EUC_2D, para cima no CEIL_2D
+    n = len(coordenadas)
+    esperada = np.array([[_referencia(tipo, coordenadas[i], coordenadas[j]) if i != j else 0 for j in range(n)]
+                         for i in range(n)])
+    np.testing.assert_array_equal(compilar_instancia(_coordenadas(coordenadas, tipo)).matriz, esperada)
+    oraculo = OraculoDistancias(coordenadas, tipo)
+    np.testing.assert_array_equal(oraculo[np.arange(n)], esperada)
+    assert [oraculo.distancia(0, j) for j in range(n)] == esperada[0].tolist()
+
+
+def test_meio_arredonda_para_cima():
+    coordenadas = np.array([[0.0, 0.0], [2.5, 0.0], [0.0, 1.5]])
+    assert matriz_distancias(coordenadas, 'EUC_2D')[0].tolist() == [0, 3, 2]
+    assert matriz_distancias(coordenadas, 'CEIL_2D')[0].tolist() == [0, 3, 2]
+
+
+@pytest.mark.parametrize('conteudo, mensagem', [
+    ('NAME: x\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n1 0 0\nEOF\n', 'DIMENSION'),
+    ('DIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n1 0 0\n2 1 1\nEOF\n', 'Número inesperado'),
+    ('DIMENSION: 2\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n1 0 0\n2 1 x\nEOF\n', 'não numérico'),
+    ('DIMENSION: 3\nEDGE_WEIGHT_TYPE: EXPLICIT\nEDGE_WEIGHT_FORMAT: UPPER_ROW\nEDGE_WEIGHT_SECTION\n1 2\nEOF\n',
+     'Número inesperado'),
+    ('DIMENSION: 2\nEDGE_WEIGHT_TYPE: EXPLICIT\nEDGE_WEIGHT_FORMAT: FUNCTION\nEDGE_WEIGHT_SECTION\n1\nEOF\n',
+     'não suportado'),
+    ('DIMENSION: 2\nEDGE_WEIGHT_TYPE: MAN_2D\nNODE_COORD_SECTION\n1 0 0\n2 1 1\nEOF\n', 'não suportado'),
+])
+def test_arquivos_invalidos(conteudo, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        compilar_instancia(conteudo)
+
+
+def test_gz_e_cache_reproduzem_o_arquivo(tmp_path):
+    original = os.path.join(DIR_TSP, 'st70.tsp')
+    compactado = str(tmp_path / 'st70.tsp.gz')
+    with open(original, 'rb') as f, gzip.open(compactado, 'wb') as g:
+        shutil.copyfileobj(f, g)
+    sem_cache = carregar_instancia(original, cache=False)
+    for caminho in (original, compactado):
+        for _ in range(2):  # Compila e grava o cache; depois lê do cache
+            instancia = carregar_instancia(caminho, dir_cache=str(tmp_path / 'cache'))
+            np.testing.assert_array_equal(instancia.matriz, sem_cache.matriz)
+            assert instancia.nos == sem_cache.nos
+
+
+def test_cache_nao_guarda_o_nome_do_arquivo(tmp_path):
+    conteudo = 'TYPE: TSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n1 0 0\n2 3 0\n3 0 4\nEOF\n'
+    cache = str(tmp_path / 'cache')
+    for nome in ('a.tsp', 'b.tsp', 'a.tsp'):
+        caminho = tmp_path / nome
+        caminho.write_text(conteudo)
+        assert carregar_instancia(str(caminho), dir_cache=cache).nome == nome
+    assert len({arquivo.split('.')[0] for arquivo in os.listdir(cache)}) == 1  # Uma entrada só
+    (tmp_path / 'c.tsp').write_text('NAME: c\n' + conteudo)
+    for _ in range(2):
+        assert carregar_instancia(str(tmp_path / 'c.tsp'), dir_cache=cache).nome == 'c'